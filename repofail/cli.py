@@ -14,7 +14,11 @@ def _err(msg: str) -> None:
     raise click.BadParameter(msg)
 
 # Subcommands (short names so "repofail gen" works)
-_SUBCOMMANDS = {"gen", "s", "a", "sim", "check", "lock", "verify", "fleet", "init"}
+_SUBCOMMANDS = {"gen", "s", "a", "sim", "check", "lock", "verify", "fleet", "fleet-merge", "fleet-query", "init", "db-update", "image"}
+# Two-word fleet subcommands: "repofail fleet query" -> "repofail fleet-query"
+_FLEET_ACTIONS = {"query": "fleet-query", "merge": "fleet-merge"}
+# Two-word db subcommands: "repofail db update" -> "repofail db-update"
+_DB_ACTIONS = {"update": "db-update"}
 
 
 def _preprocess_argv():
@@ -22,6 +26,12 @@ def _preprocess_argv():
     argv = sys.argv[1:]
     if not argv:
         return
+    if argv[0] == "fleet" and len(argv) > 1 and argv[1] in _FLEET_ACTIONS:
+        sys.argv[1:] = [_FLEET_ACTIONS[argv[1]], *argv[2:]]
+        return
+    if argv[0] == "db" and len(argv) > 1 and argv[1] in _DB_ACTIONS:
+        sys.argv[1:] = [_DB_ACTIONS[argv[1]], *argv[2:]]
+        return
     first = argv[0]
     if first in _SUBCOMMANDS or first.startswith("-"):
         return
@@ -48,7 +58,7 @@ from .engine import run_rules
 from .contract import generate_contract, validate_contract, EnvironmentContract
 from .lock import generate_lock, verify_lock, LOCK_FILENAME
 from .telemetry import save_report, get_stats
-from .fleet import audit, fleet_scan
+from .fleet import audit, fleet_scan, merge_fleet_results, parse_shard
 from .rules.base import Severity
 from .rules.registry import RULE_INFO
 from .risk import estimate_success_probability
@@ -60,12 +70,198 @@ app = typer.Typer(help="Predict why a repository will fail on your machine.")
 def fleet_cmd(
     path: Path = typer.Argument(Path("."), exists=True, file_okay=False, dir_okay=True, resolve_path=True, help="Root dir to scan (e.g. ~/org)"),
     policy: Optional[Path] = typer.Option(None, "--policy", "-P", path_type=Path, help="Policy YAML (fail_on, max_repos, max_depth)"),
+    shard: Optional[str] = typer.Option(None, "--shard", help="Only scan shard K of N (e.g. 2/8), by stable path hash"),
+    queue: Optional[Path] = typer.Option(None, "--queue", "-q", path_type=Path, help="Shared SQLite work queue (work stealing across machines)"),
+    workers: int = typer.Option(1, "--workers", "-w", min=1, help="Local worker processes scanning in parallel"),
+    index: Optional[Path] = typer.Option(None, "--index", path_type=Path, help="Also store results in a queryable index (see fleet query)"),
+    ref: Optional[str] = typer.Option(None, "--ref", help="Git ref to read from each repo's object store (bare mirrors default to HEAD)"),
+    hosts: Optional[Path] = typer.Option(None, "--hosts", help="Host library (JSON file or dir): evaluate every repo against every host"),
     json_out: bool = typer.Option(False, "--json", "-j", help="Output JSON"),
 ) -> None:
     """Fleet-wide compliance scan - violations, drift, risk clusters."""
     if not path.exists() or not path.is_dir():
         _err(f"Directory not found: {path}")
-    summary = fleet_scan(path, policy_path=policy)
+    if hosts is not None:
+        _fleet_matrix_main(path, hosts, policy, shard, queue, ref, workers, json_out)
+        return
+    if queue:
+        if shard:
+            _err("--queue and --shard are mutually exclusive")
+        from .fleet_queue import fleet_queue_scan
+        summary = fleet_queue_scan(path, queue, policy_path=policy, workers=workers, ref=ref)
+    else:
+        shard_spec = None
+        if shard:
+            try:
+                shard_spec = parse_shard(shard)
+            except ValueError as e:
+                _err(str(e))
+        summary = fleet_scan(path, policy_path=policy, shard=shard_spec, ref=ref, workers=workers)
+    if index:
+        _index_fleet_summary(summary, index)
+    _print_fleet_summary(summary, json_out)
+
+
+@app.command("fleet-merge")
+def fleet_merge_cmd(
+    files: list[Path] = typer.Argument(..., exists=True, dir_okay=False, help="Shard JSON outputs (repofail fleet --shard K/N -j)"),
+    index: Optional[Path] = typer.Option(None, "--index", path_type=Path, help="Also store merged results in a queryable index"),
+    json_out: bool = typer.Option(False, "--json", "-j", help="Output JSON"),
+) -> None:
+    """Merge sharded fleet results into one report."""
+    summaries = []
+    for f in files:
+        try:
+            summaries.append(json.loads(f.read_text()))
+        except (json.JSONDecodeError, OSError) as e:
+            _err(f"Cannot read fleet result {f}: {e}")
+    summary = merge_fleet_results(summaries)
+    if index:
+        _index_fleet_summary(summary, index)
+    _print_fleet_summary(summary, json_out)
+
+
+@app.command("fleet-query")
+def fleet_query_cmd(
+    db: Path = typer.Argument(..., dir_okay=False, help="Fleet index (from fleet --index DB)"),
+    ingest: Optional[list[Path]] = typer.Option(None, "--ingest", exists=True, dir_okay=False, help="Index fleet JSON results first (repeatable)"),
+    rule: Optional[str] = typer.Option(None, "--rule", help="Repos where this rule fires"),
+    category: Optional[str] = typer.Option(None, "--category", help="Repos with a finding in this category (e.g. ML/CUDA)"),
+    severity: Optional[str] = typer.Option(None, "--severity", help="Repos with a finding of this severity"),
+    host: Optional[str] = typer.Option(None, "--host", help="Results from this host label"),
+    min_score: Optional[int] = typer.Option(None, "--min-score"),
+    max_score: Optional[int] = typer.Option(None, "--max-score"),
+    group_by: Optional[str] = typer.Option(None, "--group-by", "-g", help="rule, category, severity, host, or score_bucket"),
+    percentiles: Optional[str] = typer.Option(None, "--percentiles", help="Score percentiles, e.g. 50,90,99"),
+    limit: int = typer.Option(50, "--limit", "-n", help="Max repos listed"),
+    json_out: bool = typer.Option(False, "--json", "-j", help="Output JSON"),
+) -> None:
+    """Query indexed fleet results - filters, group-bys, percentiles, no rescanning."""
+    from .fleet_index import index_summary, query
+
+    for f in ingest or []:
+        try:
+            index_summary(json.loads(f.read_text()), db)
+        except (json.JSONDecodeError, OSError) as e:
+            _err(f"Cannot read fleet result {f}: {e}")
+    if not db.exists():
+        _err(f"Index not found: {db}\nCreate one with: repofail fleet ~/org --index {db}")
+    try:
+        pcts = [float(p) for p in percentiles.split(",")] if percentiles else None
+        result = query(
+            db, rule=rule, category=category, severity=severity, host=host,
+            min_score=min_score, max_score=max_score, group_by=group_by,
+            percentiles=pcts, limit=limit,
+        )
+    except ValueError as e:
+        _err(str(e))
+    if json_out:
+        typer.echo(json.dumps(result, indent=2))
+        return
+    typer.echo(f"Matching repos: {result['count']}")
+    for key, n in (result.get("groups") or {}).items():
+        typer.echo(f"  {key}: {n}")
+    for r in result.get("repos") or []:
+        typer.echo(f"  [{r['score']:>3}%] {r['name'] or r['path']} ({r['rule_count']} issue(s)) {r['host']}")
+    if result.get("percentiles"):
+        typer.echo("Score percentiles: " + ", ".join(f"{k}={v}" for k, v in result["percentiles"].items()))
+
+
+@app.command("db-update")
+def db_update_cmd(
+    source: Path = typer.Option(..., "--from", exists=True, dir_okay=False, help="Wheel table (JSON) or compiled index"),
+) -> None:
+    """Install a wheel-availability index for the ABI / Apple Silicon rules (offline)."""
+    from .scanner.wheeldb import DB_PATH, install_db
+
+    try:
+        db = install_db(source)
+    except (OSError, ValueError) as e:
+        _err(f"Cannot install wheel index from {source}: {e}")
+    typer.echo(f"Installed wheel index v{db.version} ({db.count} packages) at {DB_PATH}", err=True)
+
+
+@app.command("image")
+def image_cmd(
+    image: Path = typer.Argument(..., exists=True, dir_okay=False, help="Image tarball (docker save or OCI layout)"),
+    path: Path = typer.Option(Path("."), "--path", "-p", exists=True, resolve_path=True, help="Repo path or source archive (default: .)"),
+    json_out: bool = typer.Option(False, "--json", "-j", help="Output as JSON"),
+    ci: bool = typer.Option(False, "--ci", help="CI mode: exit 1 if HIGH rules fire"),
+    fail_on: str = typer.Option("HIGH", "--fail-on", help="In CI mode: fail on this severity or higher (HIGH/MEDIUM/LOW)"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Include rule IDs and low-confidence hints"),
+) -> None:
+    """Check the repo against a saved container image instead of this machine."""
+    import tarfile
+
+    from .scanner.container import inspect_image
+
+    try:
+        facts = inspect_image(image)
+    except (OSError, ValueError, KeyError, tarfile.TarError) as e:
+        _err(f"Cannot read image {image}: {e}")
+    try:
+        repo_profile = scan_repo(path)
+    except NotADirectoryError as e:
+        _err(str(e))
+    host_profile = facts["host"]
+    results = run_rules(repo_profile, host_profile)
+
+    if json_out:
+        info = {k: v for k, v in facts.items() if k != "host"}
+        _print_json(repo_profile, host_profile, results, verbose, extra={"image": info})
+    else:
+        python = f", Python {facts['python_version']}" if facts["python_version"] else ""
+        typer.echo(
+            f"Image: {facts['image']} ({facts['os']} {facts['arch']}{python}, "
+            f"{facts['layers']} layer(s), {len(facts['packages'])} package(s))",
+            err=True,
+        )
+        for name in facts["skipped_layers"]:
+            typer.echo(f"  skipped {name} (zstd layer; install zstandard to read it)", err=True)
+        _print_human(repo_profile, host_profile, results, verbose)
+    if ci:
+        _ci_exit(results, fail_on)
+
+
+def _fleet_matrix_main(
+    path: Path, hosts: Path, policy: Path | None, shard: str | None, queue: Path | None, ref: str | None, workers: int, json_out: bool
+) -> None:
+    """fleet --hosts: repos x hosts matrix with a per-host summary."""
+    from .fleet import fleet_matrix, load_hosts
+
+    if queue:
+        _err("--hosts and --queue are mutually exclusive")
+    if not hosts.exists():
+        _err(f"Host library not found: {hosts}")
+    try:
+        shard_spec = parse_shard(shard) if shard else None
+        matrix = fleet_matrix(path, load_hosts(hosts), policy_path=policy, shard=shard_spec, ref=ref, workers=workers)
+    except ValueError as e:
+        _err(str(e))
+    if json_out:
+        typer.echo(json.dumps(matrix, indent=2))
+    else:
+        if matrix.get("shard"):
+            typer.echo(f"Shard: {matrix['shard']}")
+        typer.echo(f"Total repos scanned: {matrix['total_repos_scanned']}")
+        width = max(len(n) for n in matrix["hosts"])
+        for name in matrix["hosts"]:
+            h = matrix["by_host"][name]
+            top = ", ".join(list(h["most_common_drift"])[:3])
+            typer.echo(f"  {name.ljust(width)}  {h['violations']} violation(s), {h['high']} HIGH" + (f" - {top}" if top else ""))
+    if matrix["policy"].get("fail_on") == "HIGH" and any(h["high"] for h in matrix["by_host"].values()):
+        raise typer.Exit(1)
+
+
+def _index_fleet_summary(summary: dict, db: Path) -> None:
+    from .fleet_index import index_summary
+
+    n = index_summary(summary, db)
+    typer.echo(f"Indexed {n} repo(s) into {db}", err=True)
+
+
+def _print_fleet_summary(summary: dict, json_out: bool) -> None:
+    """Print fleet summary (text or JSON); exit 1 on HIGH findings when policy fail_on=HIGH."""
     if json_out:
         typer.echo(json.dumps(summary, indent=2))
         if summary.get("violations", 0) > 0 and summary.get("policy", {}).get("fail_on") == "HIGH":
@@ -75,6 +271,12 @@ def fleet_cmd(
         return
     total = summary["total_repos_scanned"]
     violations = summary["violations"]
+    if summary.get("shard"):
+        typer.echo(f"Shard: {summary['shard']}")
+    if summary.get("shards_merged"):
+        typer.echo(f"Shards merged: {summary['shards_merged']}")
+    if summary.get("queue"):
+        typer.echo("Queue: " + ", ".join(f"{k} {v}" for k, v in sorted(summary["queue"].items())))
     typer.echo(f"Total repos scanned: {total}")
     typer.echo(f"Violations: {violations}")
     drift = summary.get("most_common_drift") or {}
@@ -106,7 +308,9 @@ def main(
     model: str = typer.Option(None, "--model", help="LLM model for --ai (default: gpt-4o-mini). Supports OpenAI, Anthropic, ollama/*)"),
     report: bool = typer.Option(False, "--report", "-r", help="Save failure report locally (opt-in telemetry)"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Include rule IDs and low-confidence hints"),
-    path: Path = typer.Option(Path("."), "--path", "-p", exists=True, file_okay=False, dir_okay=True, resolve_path=True, help="Repo path (default: .)"),
+    path: Path = typer.Option(Path("."), "--path", "-p", exists=True, file_okay=True, dir_okay=True, resolve_path=True, help="Repo path or source archive (default: .)"),
+    monorepo: bool = typer.Option(False, "--monorepo", help="Scan and report each subproject separately"),
+    workers: int = typer.Option(4, "--workers", "-w", help="With --monorepo: subprojects scanned in parallel"),
 ) -> None:
     """Scan a repository and report detected incompatibilities."""
     if ctx.invoked_subcommand is not None:
@@ -116,6 +320,9 @@ def main(
         return
 
     scan_path = path
+    if monorepo:
+        _monorepo_main(scan_path, workers, json_out, ci, fail_on, verbose)
+        return
     try:
         repo_profile = scan_repo(scan_path)
         host_profile = inspect_host()
@@ -142,6 +349,45 @@ def main(
         _ci_exit(results, fail_on)
 
 
+def _monorepo_main(scan_path: Path, workers: int, json_out: bool, ci: bool, fail_on: str, verbose: bool) -> None:
+    """--monorepo: findings per subproject plus the rolled-up (worst) score."""
+    from .monorepo import scan_monorepo
+
+    host_profile = inspect_host()
+    try:
+        mono = scan_monorepo(scan_path, host_profile, workers=workers)
+    except NotADirectoryError as e:
+        _err(str(e))
+    all_results = [r for sp in mono["subprojects"] for r in sp["results"]]
+    if json_out:
+        output = {
+            "estimated_success_probability": mono["score"],
+            "repo": {"name": mono["repo"].name, "path": mono["repo"].path},
+            "subprojects": [
+                {
+                    "path": sp["path"],
+                    "types": sp["types"],
+                    "estimated_success_probability": sp["score"],
+                    "results": [_result_json(r) for r in sp["results"]],
+                }
+                for sp in mono["subprojects"]
+            ],
+        }
+        typer.echo(json.dumps(output, indent=2))
+    else:
+        repo_name = mono["repo"].name or str(mono["repo"].path)
+        for sp in mono["subprojects"]:
+            if sp["results"]:
+                name = repo_name if sp["path"] == "." else f"{repo_name}/{sp['path']}"
+                typer.echo(format_human(name, sp["score"], sp["results"], verbose=verbose))
+        typer.echo(f"{repo_name}: {len(mono['subprojects'])} subproject(s), rolled-up score {mono['score']}%")
+        for sp in mono["subprojects"]:
+            label = ", ".join(sp["types"]) or "?"
+            typer.echo(f"  {sp['score']:>3}%  {sp['path']} ({label}) - {len(sp['results'])} issue(s)")
+    if ci:
+        _ci_exit(all_results, fail_on)
+
+
 def _host_summary(host) -> str:
     """Build host summary string."""
     parts = [f"{host.os} {host.arch}"]
@@ -279,7 +525,21 @@ def _print_markdown(repo_profile, host_profile, results) -> None:
     typer.echo(f"\n---\n{len(results)} potential runtime mismatch(es) detected.")
 
 
-def _print_json(repo_profile, host_profile, results, verbose: bool = False) -> None:
+def _result_json(r) -> dict:
+    """One RuleResult as emitted by --json."""
+    return {
+        "rule_id": r.rule_id,
+        "severity": r.severity.value,
+        "message": r.message,
+        "reason": r.reason,
+        "host_summary": r.host_summary,
+        "confidence": getattr(r, "confidence", "high"),
+        **({"category": r.category} if getattr(r, "category", "") else {}),
+        **({"evidence": r.evidence} if getattr(r, "evidence", None) else {}),
+    }
+
+
+def _print_json(repo_profile, host_profile, results, verbose: bool = False, extra: dict | None = None) -> None:
     """JSON output for piping/CI."""
     import json
     from dataclasses import asdict
@@ -305,22 +565,12 @@ def _print_json(repo_profile, host_profile, results, verbose: bool = False) -> N
             "subprojects": repo_profile.subprojects,
         },
         "host": asdict(host_profile),
-        "results": [
-            {
-                "rule_id": r.rule_id,
-                "severity": r.severity.value,
-                "message": r.message,
-                "reason": r.reason,
-                "host_summary": r.host_summary,
-                "confidence": getattr(r, "confidence", "high"),
-                **({"category": r.category} if getattr(r, "category", "") else {}),
-                **({"evidence": r.evidence} if getattr(r, "evidence", None) else {}),
-            }
-            for r in results
-        ],
+        "results": [_result_json(r) for r in results],
     }
     if low_conf_rules:
         output["low_confidence_rules"] = low_conf_rules
+    if extra:
+        output.update(extra)
     typer.echo(json.dumps(output, indent=2))
 
 
@@ -398,29 +648,74 @@ def audit_cmd(
 
 @app.command("sim")
 def sim_cmd(
-    repo_path: Path = typer.Argument(Path("."), file_okay=False, help="Repo to check"),
-    host_file: Path = typer.Option(..., "-H", help="Host JSON (from repofail -j)"),
+    repo_paths: Optional[list[Path]] = typer.Argument(None, file_okay=False, help="Repo(s) to check (default: .)"),
+    host_file: Optional[Path] = typer.Option(None, "-H", help="Host JSON (from repofail -j)"),
+    hosts: Optional[Path] = typer.Option(None, "--hosts", help="Host library: JSON file of hosts or dir of host JSONs (matrix)"),
+    json_out: bool = typer.Option(False, "--json", "-j", help="With --hosts: output JSON"),
 ) -> None:
     """Simulate: would this repo work on target host? (pre-deployment check)."""
-    from .fleet import simulate
+    from .fleet import load_hosts, simulate, simulate_matrix
+    repo_paths = repo_paths or [Path(".")]
+    for repo_path in repo_paths:
+        if not repo_path.exists() or not repo_path.is_dir():
+            _err(f"Repo path not found: {repo_path}")
+    if hosts is not None:
+        if not hosts.exists():
+            _err(f"Host library not found: {hosts}")
+        try:
+            matrix = simulate_matrix(repo_paths, load_hosts(hosts))
+        except Exception as e:
+            _err(str(e))
+        _print_sim_matrix(matrix, json_out)
+        return
+    if host_file is None:
+        _err("Pass a target host with -H host.json, or a host library with --hosts DIR_OR_FILE")
     if not host_file.exists():
         _err(f"Host file not found: {host_file}\nCreate one with: repofail -j > host.json")
-    if not repo_path.exists() or not repo_path.is_dir():
-        _err(f"Repo path not found: {repo_path}")
-    try:
-        repo, host, results = simulate(repo_path, host_file)
-    except Exception as e:
-        _err(str(e))
-    typer.echo(f"Repo: {repo.name or repo_path}")
-    typer.echo(f"Target host: {host.os} {host.arch}" + (" CUDA" if host.cuda_available else " no-CUDA"))
-    typer.echo()
-    if not results:
-        typer.echo("OK: No incompatibilities for target host.")
-        return
-    typer.echo(f"{len(results)} issue(s) on target host:")
-    for r in results:
-        typer.echo(f"  [{r.severity.value}] {r.rule_id}: {r.message}")
-    raise typer.Exit(1)
+    failing = False
+    for i, repo_path in enumerate(repo_paths):
+        try:
+            repo, host, results = simulate(repo_path, host_file)
+        except Exception as e:
+            _err(str(e))
+        if i:
+            typer.echo()
+        typer.echo(f"Repo: {repo.name or repo_path}")
+        typer.echo(f"Target host: {host.os} {host.arch}" + (" CUDA" if host.cuda_available else " no-CUDA"))
+        typer.echo()
+        if not results:
+            typer.echo("OK: No incompatibilities for target host.")
+            continue
+        failing = True
+        typer.echo(f"{len(results)} issue(s) on target host:")
+        for r in results:
+            typer.echo(f"  [{r.severity.value}] {r.rule_id}: {r.message}")
+    if failing:
+        raise typer.Exit(1)
+
+
+def _print_sim_matrix(matrix: dict, json_out: bool) -> None:
+    """Print repo x host scores; exit 1 if any cell has a HIGH finding."""
+    failing = any(
+        "HIGH" in cell["severities"] for row in matrix["repos"] for cell in row["cells"].values()
+    )
+    if json_out:
+        typer.echo(json.dumps(matrix, indent=2))
+    else:
+        names = matrix["hosts"]
+        width = max([len(r["name"]) for r in matrix["repos"]] + [4])
+        typer.echo("repo".ljust(width) + "  " + "  ".join(n.rjust(max(len(n), 4)) for n in names))
+        for row in matrix["repos"]:
+            cells = []
+            for n in names:
+                cell = row["cells"][n]
+                mark = "!" if "HIGH" in cell["severities"] else ""
+                cells.append(f"{cell['score']}%{mark}".rjust(max(len(n), 4)))
+            typer.echo(row["name"].ljust(width) + "  " + "  ".join(cells))
+        if failing:
+            typer.echo("\n! = HIGH severity finding on that host", err=True)
+    if failing:
+        raise typer.Exit(1)
 
 
 @app.command("init")
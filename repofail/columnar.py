@@ -0,0 +1,313 @@
+"""Columnar rule evaluation - run_rules over a whole repo x host matrix.
+
+Every built-in check starts with cheap early-outs on a few profile fields (host OS,
+has_cuda, a version compared to a spec). Those fields are packed into columns, one
+per repo and one per host, and each check's guard is evaluated for all cells at once:
+a repo mask x a host mask x a table over the distinct (repo value, host value) pairs.
+Only cells whose guard holds call the scalar check, so results are exactly those of
+engine.run_rules. NumPy is used when installed, the stdlib array module otherwise.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Iterator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .engine import CHECKS, run_rules
+from .models import HostProfile, RepoProfile
+from .rules import (
+    abi_wheel_mismatch,
+    apple_silicon,
+    docker_only,
+    go_version,
+    gpu_memory,
+    info_signals,
+    lock_file_missing,
+    ml_niche,
+    native_toolchain,
+    node_engine,
+    node_eol,
+    node_windows,
+    port_collision,
+    prebuilt_binaries,
+    python_eol,
+    python_version,
+    rust_compat,
+    spec_drift,
+    system_libs,
+    torch_cuda,
+)
+from .rules.base import RuleResult
+
+
+@dataclass(frozen=True, slots=True)
+class Guard:
+    """
+    Necessary condition for a check to fire: repo(r) and host(h) and pair.test(pair.repo(r), pair.host(h)).
+    A guard may be loose (let through cells the check then rejects) but never strict.
+    """
+
+    repo: Callable[[RepoProfile], Any] | None = None
+    host: Callable[[HostProfile], Any] | None = None
+    pair: Pair | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class Pair:
+    """Condition on a repo value and a host value, evaluated once per distinct pair."""
+
+    repo: Callable[[RepoProfile], Hashable]
+    host: Callable[[HostProfile], Hashable]
+    test: Callable[[Any, Any], Any]
+
+
+def _python_mismatch(spec: str | None, ver: str | None) -> bool:
+    return bool(spec and ver) and not python_version._version_in_range(ver, spec)
+
+
+def _node_mismatch(spec: str | None, ver: str | None) -> bool:
+    host_ver = node_engine._parse_node_version(ver)
+    return bool(spec and host_ver) and not node_engine._node_in_range(host_ver, spec)
+
+
+def _older(parse: Callable[[str | None], tuple[int, int] | None]) -> Callable[[Any, Any], bool]:
+    """Host version parses lower than the repo requirement."""
+
+    def test(req: str | None, ver: str | None) -> bool:
+        r, h = parse(req), parse(ver)
+        return bool(r and h) and h < r
+
+    return test
+
+
+def _minor_differs(repo_ver: str | None, host_ver: str | None) -> bool:
+    r, h = info_signals._parse_version(repo_ver), info_signals._parse_version(host_ver)
+    return bool(r and h) and r != h
+
+
+def _abi_repo(r: RepoProfile) -> bool:
+    return bool(abi_wheel_mismatch._unstable_packages(r) or abi_wheel_mismatch.indexed_packages(r))
+
+
+def _has_native(r: RepoProfile) -> bool:
+    return bool(r.node_native_modules or r.rust_system_libs or r.has_cargo_toml or r.native_build_backends)
+
+
+_rust_older = _older(rust_compat._parse_rust_ver)
+_GO_OS = {"macos": "darwin", "linux": "linux", "windows": "windows"}
+_LARGE_MODEL_FRAMEWORKS = {"Diffusers", "Transformers", "PEFT"}
+
+GUARDS: dict[Callable, Guard] = {
+    torch_cuda.check: Guard(repo=lambda r: r.requires_cuda, host=lambda h: not h.cuda_available),
+    python_version.check: Guard(pair=Pair(lambda r: r.python_version, lambda h: h.python_version, _python_mismatch)),
+    python_eol.check: Guard(repo=lambda r: r.python_version and python_eol._requires_python_eol(r.python_version)),
+    spec_drift.check: Guard(repo=lambda r: r.dockerfile is not None and r.dockerfile.python_version),
+    abi_wheel_mismatch.check: Guard(
+        repo=_abi_repo, host=lambda h: abi_wheel_mismatch._parse_python_minor(h.python_version)
+    ),
+    apple_silicon.check: Guard(host=lambda h: h.os == "macos" and h.arch == "arm64"),
+    native_toolchain.check: Guard(repo=_has_native, host=lambda h: not (h.rust_version and h.has_compiler)),
+    gpu_memory.check: Guard(
+        repo=lambda r: r.uses_torch and _LARGE_MODEL_FRAMEWORKS & set(r.frameworks),
+        host=lambda h: h.ram_gb is not None and h.ram_gb < gpu_memory.RAM_THRESHOLD_GB,
+    ),
+    node_windows.check: Guard(repo=lambda r: r.node_native_modules, host=lambda h: h.os == "windows"),
+    node_engine.check: Guard(
+        pair=Pair(
+            node_engine.engine_specs,
+            lambda h: h.node_version,
+            lambda specs, ver: any(_node_mismatch(spec, ver) for _, spec in specs),
+        )
+    ),
+    node_eol.check: Guard(repo=lambda r: r.node_engine_spec and node_eol._engines_require_eol(r.node_engine_spec)),
+    lock_file_missing.check: Guard(repo=lambda r: r.has_package_json and r.node_lock_file_missing),
+    system_libs.check: Guard(
+        pair=Pair(
+            lambda r: (r.requires_libgl, r.requires_ffmpeg),
+            lambda h: (h.has_libgl, h.has_ffmpeg),
+            lambda need, have: (need[0] and not have[0]) or (need[1] and not have[1]),
+        )
+    ),
+    port_collision.check: Guard(repo=lambda r: r.required_ports),
+    docker_only.check: Guard(repo=lambda r: r.has_dockerfile and r.has_devcontainer),
+    prebuilt_binaries.check: Guard(repo=lambda r: r.binary_artifacts),
+    rust_compat.check_rust_version: Guard(
+        pair=Pair(
+            rust_compat.rust_version_reqs,
+            lambda h: h.rust_version,
+            lambda reqs, ver: any(_rust_older(req, ver) for _, req in reqs),
+        )
+    ),
+    rust_compat.check_rust_target_platform: Guard(repo=lambda r: r.rust_target_platforms),
+    go_version.check: Guard(pair=Pair(lambda r: r.go_version, lambda h: h.go_version, _older(go_version._parse_go_ver))),
+    go_version.check_cgo: Guard(repo=lambda r: r.go_cgo_deps, host=lambda h: not h.has_compiler),
+    go_version.check_os_build_tags: Guard(
+        pair=Pair(
+            lambda r: tuple(r.go_os_specific_tags),
+            lambda h: _GO_OS.get(h.os, h.os),
+            lambda tags, host_os: tags and host_os not in tags,
+        )
+    ),
+    ml_niche.check_lora_mlx_scaling: Guard(
+        repo=lambda r: "PEFT" in r.frameworks or "LoRA" in " ".join(r.frameworks),
+        host=lambda h: h.os == "macos" and h.has_metal and not h.cuda_available,
+    ),
+    ml_niche.check_torchao_incompatible: Guard(repo=lambda r: "torchao" in r.frameworks and r.uses_torch),
+    info_signals.check_python_minor_mismatch: Guard(
+        pair=Pair(lambda r: r.python_version, lambda h: h.python_version, _minor_differs)
+    ),
+    info_signals.check_multiple_python_subprojects: Guard(
+        repo=lambda r: sum(1 for s in r.subprojects if s.get("type") == "python") >= 2
+    ),
+    info_signals.check_mixed_python_node: Guard(
+        repo=lambda r: {"python", "node"} <= {s.get("type") for s in r.subprojects}
+    ),
+    info_signals.check_docker_python_mismatch: Guard(
+        repo=lambda r: r.has_dockerfile,
+        pair=Pair(
+            lambda r: r.dockerfile.python_version if r.dockerfile else None,
+            lambda h: h.python_version,
+            _minor_differs,
+        ),
+    ),
+    info_signals.check_low_ram_multi_service: Guard(
+        repo=lambda r: len(r.subprojects) >= 2 or r.has_dockerfile,
+        host=lambda h: h.ram_gb is not None and h.ram_gb < 16,
+    ),
+}
+
+
+def _holds(fn: Callable, *args: Any) -> bool:
+    # A guard that raises can't rule the cell out; the scalar check decides (and swallows the error)
+    try:
+        return bool(fn(*args))
+    except Exception:
+        return True
+
+
+def _column(fn: Callable | None, items: list) -> Any:
+    """Boolean column of fn over items, or None when there is no condition."""
+    if fn is None:
+        return None
+    values = [_holds(fn, item) for item in items]
+    if np is not None:
+        return np.fromiter(values, dtype=bool, count=len(values))
+    return array("b", values)
+
+
+def _codes(fn: Callable, items: list) -> tuple[Any, list]:
+    """Dictionary-encode fn over items: (code per item, distinct values)."""
+    index: dict[Hashable, int] = {}
+    codes = []
+    for item in items:
+        try:
+            key = fn(item)
+            hash(key)
+        except Exception:
+            key = _Unknown
+        codes.append(index.setdefault(key, len(index)))
+    if np is not None:
+        return np.fromiter(codes, dtype=np.intp, count=len(codes)), list(index)
+    return array("l", codes), list(index)
+
+
+class _Unknown:
+    """Key for a value that couldn't be extracted - every test on it holds."""
+
+
+def _pair_test(test: Callable, rv: Any, hv: Any) -> bool:
+    if rv is _Unknown or hv is _Unknown:
+        return True
+    return _holds(test, rv, hv)
+
+
+def _cells(guard: Guard | None, repos: list[RepoProfile], hosts: list[HostProfile]) -> Iterator[tuple[int, int]]:
+    """(repo index, host index) of every cell whose guard holds, repo-major."""
+    n, m = len(repos), len(hosts)
+    if not n or not m:
+        return
+    if guard is None:
+        for i in range(n):
+            for j in range(m):
+                yield i, j
+        return
+    rmask = _column(guard.repo, repos)
+    hmask = _column(guard.host, hosts)
+    table = rcodes = hcodes = None
+    if guard.pair is not None:
+        rcodes, rvalues = _codes(guard.pair.repo, repos)
+        hcodes, hvalues = _codes(guard.pair.host, hosts)
+        table = [[_pair_test(guard.pair.test, rv, hv) for hv in hvalues] for rv in rvalues]
+    if np is not None:
+        mask = np.ones((n, m), dtype=bool)
+        if rmask is not None:
+            mask &= rmask[:, None]
+        if hmask is not None:
+            mask &= hmask[None, :]
+        if table is not None:
+            mask &= np.array(table, dtype=bool).reshape(len(table), -1)[rcodes[:, None], hcodes[None, :]]
+        rows, cols = np.nonzero(mask)
+        yield from zip(rows.tolist(), cols.tolist())
+        return
+    host_idx = [j for j in range(m) if hmask is None or hmask[j]]
+    for i in range(n):
+        if rmask is not None and not rmask[i]:
+            continue
+        if table is None:
+            for j in host_idx:
+                yield i, j
+        else:
+            row = table[rcodes[i]]
+            for j in host_idx:
+                if row[hcodes[j]]:
+                    yield i, j
+
+
+def evaluate_matrix(repos: list[RepoProfile], hosts: list[HostProfile]) -> list[list[list[RuleResult]]]:
+    """
+    run_rules(repo, host) for every repo x host, as results[repo][host].
+    Repos sharing a content digest are evaluated once; their result lists are shared (read-only).
+    """
+    # Scanned profiles with the same digest are rule-equivalent; hand-built ones (no digest) stay distinct
+    unique: list[RepoProfile] = []
+    slot: dict[str, int] = {}
+    repo_slot = []
+    for repo in repos:
+        if repo.content_digest:
+            k = slot.setdefault(repo.content_digest, len(unique))
+            if k == len(unique):
+                unique.append(repo)
+        else:
+            k = len(unique)
+            unique.append(repo)
+        repo_slot.append(k)
+
+    m = len(hosts)
+    eligible: list[list[list[int] | None]] = [[None] * m for _ in unique]
+    for c, check_fn in enumerate(CHECKS):
+        for i, j in _cells(GUARDS.get(check_fn), unique, hosts):
+            cell = eligible[i][j]
+            if cell is None:
+                eligible[i][j] = [c]
+            else:
+                cell.append(c)
+
+    results: list[list[list[RuleResult]]] = []
+    for i, repo in enumerate(unique):
+        # YAML rules aren't guarded: run the scalar engine for every cell unless the repo has none
+        has_yaml = repo.yaml_rules is None or bool(repo.yaml_rules)
+        row = []
+        for j, host in enumerate(hosts):
+            cell = eligible[i][j]
+            if cell is None and not has_yaml:
+                row.append([])
+            else:
+                row.append(run_rules(repo, host, checks=[CHECKS[c] for c in cell or ()]))
+        results.append(row)
+    return [results[k] for k in repo_slot]
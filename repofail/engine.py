@@ -23,6 +23,7 @@ from .rules import (
     ml_niche,
     info_signals,
     port_collision,
+    prebuilt_binaries,
     docker_only,
     go_version,
     rust_compat,
@@ -44,6 +45,7 @@ _RULE_ID_MAP: dict[str, str] = {
     "system_libs.check": "system_libs_missing",
     "port_collision.check": "port_collision",
     "docker_only.check": "docker_only",
+    "prebuilt_binaries.check": "prebuilt_binary_mismatch",
     "rust_compat.check_rust_version": "rust_version_mismatch",
     "rust_compat.check_rust_target_platform": "rust_target_platform",
     "go_version.check": "go_version_mismatch",
@@ -74,36 +76,46 @@ def _get_disabled_rules(config: dict) -> set[str]:
     return set()
 
 
-def run_rules(repo: RepoProfile, host: HostProfile) -> list[RuleResult]:
-    """Run all built-in and YAML rules, return any that fire."""
-    config = _load_config(Path(repo.path))
+# Built-in checks, in evaluation order
+CHECKS = [
+    torch_cuda.check,
+    python_version.check,
+    python_eol.check,
+    spec_drift.check,
+    abi_wheel_mismatch.check,
+    apple_silicon.check,
+    native_toolchain.check,
+    gpu_memory.check,
+    node_windows.check,
+    node_engine.check,
+    node_eol.check,
+    lock_file_missing.check,
+    system_libs.check,
+    port_collision.check,
+    docker_only.check,
+    prebuilt_binaries.check,
+    rust_compat.check_rust_version,
+    rust_compat.check_rust_target_platform,
+    go_version.check,
+    go_version.check_cgo,
+    go_version.check_os_build_tags,
+    ml_niche.check_lora_mlx_scaling,
+    ml_niche.check_torchao_incompatible,
+    *info_signals.CHECKS,
+]
+
+
+def run_rules(repo: RepoProfile, host: HostProfile, checks: list | None = None) -> list[RuleResult]:
+    """
+    Run all built-in and YAML rules, return any that fire.
+    checks restricts the built-in checks run (columnar mode passes those whose guard held).
+    """
+    # scan_repo captures the config (works for virtual trees); fall back to disk for hand-built profiles
+    config = repo.repofail_config if repo.repofail_config is not None else _load_config(Path(repo.path))
     disabled = _get_disabled_rules(config)
 
-    checks = [
-        torch_cuda.check,
-        python_version.check,
-        python_eol.check,
-        spec_drift.check,
-        abi_wheel_mismatch.check,
-        apple_silicon.check,
-        native_toolchain.check,
-        gpu_memory.check,
-        node_windows.check,
-        node_engine.check,
-        node_eol.check,
-        lock_file_missing.check,
-        system_libs.check,
-        port_collision.check,
-        docker_only.check,
-        rust_compat.check_rust_version,
-        rust_compat.check_rust_target_platform,
-        go_version.check,
-        go_version.check_cgo,
-        go_version.check_os_build_tags,
-        ml_niche.check_lora_mlx_scaling,
-        ml_niche.check_torchao_incompatible,
-    ]
-    checks.extend(info_signals.CHECKS)
+    if checks is None:
+        checks = CHECKS
     results: list[RuleResult] = []
     for check_fn in checks:
         fn_key = f"{check_fn.__module__.rsplit('.', 1)[-1]}.{check_fn.__name__}"
@@ -2,14 +2,23 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import sys
 from collections import Counter
+from dataclasses import fields
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 from .models import HostProfile, RepoProfile
 from .scanner import scan_repo, inspect_host
+from .scanner.archive import is_archive
+from .scanner.gitstore import is_bare_repo
+from .scanner.memo import ContentMemo, object_digest
+from .columnar import evaluate_matrix
 from .engine import run_rules
+from .rules.base import RuleResult
+from .risk import estimate_success_probability
 
 try:
     import yaml
@@ -34,15 +43,21 @@ RULE_CATEGORIES: dict[str, str] = {
     "node_native_windows": "Node/Windows",
     "missing_system_libs": "System libs",
     "docker_only": "Docker",
+    "prebuilt_binary_mismatch": "Binary/Arch",
     "lock_file_missing": "Lock file",
 }
 DEFAULT_CATEGORY = "Other"
 
+# Rule results per (host digest, repo content digest) - forks and template copies evaluate once
+RULE_MEMO = ContentMemo()
+
 
 def _is_repo(p: Path) -> bool:
-    """Check if path looks like a repo (has .git or deps file)."""
+    """Check if path looks like a repo (has .git or deps file, bare mirror, or source archive)."""
     return (
-        (p / ".git").exists()
+        is_archive(p)
+        or (p / ".git").exists()
+        or is_bare_repo(p)
         or (p / "pyproject.toml").exists()
         or (p / "requirements.txt").exists()
         or (p / "package.json").exists()
@@ -65,18 +80,28 @@ def _load_policy(policy_path: Path | None) -> dict[str, Any]:
         return {}
 
 
-def _find_repos(base_path: Path, max_depth: int = 4, max_repos: int = 50) -> list[Path]:
-    """Find repo roots recursively (nested repos)."""
-    found: list[Path] = []
+def iter_repos(base_path: Path, max_depth: int = 4, max_repos: int | None = 50) -> Iterator[Path]:
+    """
+    Yield repo roots recursively (nested repos), lazily. The base itself comes first if it is a repo.
+    max_repos=None walks the whole tree.
+    """
     base = Path(base_path).resolve()
+    if _is_repo(base):
+        yield base
+    found = 0
 
-    def walk(d: Path, depth: int) -> None:
-        if depth > max_depth or len(found) >= max_repos:
-            return
-        if not d.is_dir():
+    def walk(d: Path, depth: int) -> Iterator[Path]:
+        nonlocal found
+        if depth > max_depth or (max_repos is not None and found >= max_repos):
             return
         if d.name.startswith(".") or d.name in SKIP_AUDIT_DIRS:
             return
+        if is_archive(d):
+            found += 1
+            yield d
+            return
+        if not d.is_dir():
+            return
         try:
             rel = d.relative_to(base) if d != base else Path(".")
             if any(part in SKIP_AUDIT_DIRS for part in rel.parts):
@@ -84,91 +109,141 @@ def _find_repos(base_path: Path, max_depth: int = 4, max_repos: int = 50) -> lis
         except ValueError:
             return
         if _is_repo(d):
-            found.append(d)
+            found += 1
+            yield d
             return  # Don't descend - this dir is the repo root
         for child in sorted(d.iterdir()):
-            if child.is_dir():
-                walk(child, depth + 1)
+            if child.is_dir() or is_archive(child):
+                yield from walk(child, depth + 1)
 
     for child in sorted(base.iterdir()):
-        if child.is_dir():
-            walk(child, 1)
-    if _is_repo(base):
-        found.insert(0, base)
-    return list(dict.fromkeys(found))  # dedupe
+        if child.is_dir() or is_archive(child):
+            yield from walk(child, 1)
+
+
+def _find_repos(base_path: Path, max_depth: int = 4, max_repos: int = 50) -> list[Path]:
+    """Find repo roots recursively (nested repos)."""
+    return list(dict.fromkeys(iter_repos(base_path, max_depth, max_repos)))  # dedupe
 
 
 def audit(base_path: Path) -> list[dict]:
     """Scan all repo-like subdirs (including nested), return aggregated report."""
+    from .pipeline import discover, evaluate, scan
+
     base_path = Path(base_path).resolve()
     if not base_path.is_dir():
         return []
-    dirs = _find_repos(base_path)
-    results = []
-    host = inspect_host()
-    for d in dirs:
-        try:
-            repo = scan_repo(d)
-            rule_results = run_rules(repo, host)
-            high_count = sum(1 for r in rule_results if r.severity.value == "HIGH")
-            med_count = sum(1 for r in rule_results if r.severity.value in ("MEDIUM", "LOW"))
-            results.append({
-                "path": str(d),
-                "name": repo.name or d.name,
-                "rule_count": len(rule_results),
-                "rules": [r.rule_id for r in rule_results],
-                "has_high": high_count > 0,
-                "high_count": high_count,
-                "medium_count": med_count,
-                "score": __import__("repofail.risk", fromlist=["estimate_success_probability"]).estimate_success_probability(rule_results),
-            })
-        except Exception:
-            pass
-    return results
+    return list(evaluate(scan(discover(base_path, max_repos=50)), inspect_host()))
 
 
-def fleet_scan(
-    base_path: Path,
-    policy_path: Path | None = None,
-) -> dict[str, Any]:
+def host_key(host: HostProfile) -> str:
+    """Short host label for fleet results, e.g. 'linux x86_64 py3.11 cuda'."""
+    parts = [host.os, host.arch]
+    if host.python_version:
+        parts.append(f"py{'.'.join(host.python_version.split('.')[:2])}")
+    if host.cuda_available:
+        parts.append("cuda")
+    return " ".join(parts)
+
+
+def scan_one(path: Path, host: HostProfile, ref: str | None = None, base_path: Path | None = None) -> dict[str, Any]:
+    """Scan one repo (checkout or bare mirror at ref) and run rules; return its fleet summary row."""
+    return repo_row(path, scan_repo(path, ref=ref), host, base_path)
+
+
+def _evaluate(repo: RepoProfile, host: HostProfile) -> tuple[tuple[str, ...], tuple[str, ...], int]:
+    """Rule IDs, severities and score - all a fleet row keeps of the RuleResults."""
+    return _compact_results(run_rules(repo, host))
+
+
+def _compact_results(rule_results: list[RuleResult]) -> tuple[tuple[str, ...], tuple[str, ...], int]:
+    return (
+        tuple(sys.intern(r.rule_id) for r in rule_results),
+        tuple(r.severity.value for r in rule_results),
+        estimate_success_probability(rule_results),
+    )
+
+
+def repo_row(path: Path, repo: RepoProfile, host: HostProfile, base_path: Path | None = None) -> dict[str, Any]:
     """
-    Scan all repos under base_path; optionally apply policy.
-    Returns: total_repos, violations (count), repos (list), by_rule (most common drift), risk_clusters.
+    Run rules on a scanned repo and build its fleet summary row. Repos whose
+    content digest matches one already evaluated on the same host reuse its results.
+    With base_path, the row also carries rel_path (the mount-independent repo key).
     """
-    base_path = Path(base_path).resolve()
-    policy = _load_policy(policy_path)
-    max_repos = int(policy.get("max_repos", 500))
-    max_depth = int(policy.get("max_depth", 4))
+    if repo.content_digest:
+        rules, severities, score = RULE_MEMO.get(object_digest(host), repo.content_digest, lambda: _evaluate(repo, host))
+    else:
+        rules, severities, score = _evaluate(repo, host)
+    high_count = severities.count("HIGH")
+    row = {
+        "path": str(path),
+        "name": repo.name or Path(path).name,
+        "rule_count": len(rules),
+        "rules": list(rules),
+        "severities": list(severities),
+        "has_high": high_count > 0,
+        "high_count": high_count,
+        "medium_count": severities.count("MEDIUM") + severities.count("LOW"),
+        "score": score,
+        "host": sys.intern(host_key(host)),
+    }
+    if base_path is not None:
+        row["rel_path"] = rel_path(Path(path), base_path)
+    return row
+
+
+def compact_row(row: dict[str, Any]) -> dict[str, Any]:
+    """Intern the repeated strings of a row loaded from JSON (rule IDs, severities, host)."""
+    row["rules"] = [sys.intern(r) for r in row.get("rules", [])]
+    if "severities" in row:
+        row["severities"] = [sys.intern(v) for v in row["severities"]]
+    if "host" in row:
+        row["host"] = sys.intern(row["host"])
+    return row
+
+
+def parse_shard(spec: str) -> tuple[int, int]:
+    """Parse 'K/N' (1-based shard K of N) -> (K, N). Raises ValueError if invalid."""
+    try:
+        k_str, n_str = spec.split("/", 1)
+        k, n = int(k_str), int(n_str)
+    except ValueError:
+        raise ValueError(f"Invalid shard {spec!r}: expected K/N, e.g. 1/4") from None
+    if n < 1 or not 1 <= k <= n:
+        raise ValueError(f"Invalid shard {spec!r}: need 1 <= K <= N")
+    return k, n
+
+
+def rel_path(path: Path, base_path: Path) -> str:
+    """Repo path relative to the fleet root ('.' for the root itself); absolute if outside it."""
+    try:
+        return path.relative_to(base_path).as_posix()
+    except ValueError:
+        return path.as_posix()
 
-    dirs = _find_repos(base_path, max_depth=max_depth, max_repos=max_repos)
-    host = inspect_host()
-    repos: list[dict[str, Any]] = []
-    rule_counter: Counter[str] = Counter()
-    category_counter: Counter[str] = Counter()
 
+def _shard_index(rel_path: str, n: int) -> int:
+    """Stable 0-based shard for a repo path (relative to fleet root, so mounts can differ)."""
+    digest = hashlib.sha1(rel_path.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % n
+
+
+def _select_shard(dirs: Iterable[Path], base_path: Path, shard: tuple[int, int]) -> Iterator[Path]:
+    """Keep only repos that hash to shard K of N."""
+    k, n = shard
     for d in dirs:
-        try:
-            repo = scan_repo(d)
-            rule_results = run_rules(repo, host)
-            rule_ids = [r.rule_id for r in rule_results]
-            for rid in rule_ids:
-                rule_counter[rid] += 1
-                category_counter[RULE_CATEGORIES.get(rid, DEFAULT_CATEGORY)] += 1
-            high_count = sum(1 for r in rule_results if r.severity.value == "HIGH")
-            med_count = sum(1 for r in rule_results if r.severity.value in ("MEDIUM", "LOW"))
-            score = __import__("repofail.risk", fromlist=["estimate_success_probability"]).estimate_success_probability(rule_results)
-            repos.append({
-                "path": str(d),
-                "name": repo.name or d.name,
-                "rule_count": len(rule_results),
-                "rules": rule_ids,
-                "has_high": high_count > 0,
-                "high_count": high_count,
-                "medium_count": med_count,
-                "score": score,
-            })
-        except Exception:
-            pass
+        if _shard_index(rel_path(d, base_path), n) == k - 1:
+            yield d
+
+
+def _summarize(repos: list[dict[str, Any]], policy: dict[str, Any]) -> dict[str, Any]:
+    """Aggregate per-repo results into the fleet summary (drift, clusters, violations)."""
+    rule_counter: Counter[str] = Counter()
+    category_counter: Counter[str] = Counter()
+    for r in repos:
+        for rid in r.get("rules", []):
+            rule_counter[rid] += 1
+            category_counter[RULE_CATEGORIES.get(rid, DEFAULT_CATEGORY)] += 1
 
     violations = sum(1 for r in repos if r["rule_count"] > 0)
     by_rule = dict(rule_counter.most_common(15))
@@ -184,22 +259,52 @@ def fleet_scan(
     }
 
 
+def fleet_scan(
+    base_path: Path,
+    policy_path: Path | None = None,
+    shard: tuple[int, int] | None = None,
+    ref: str | None = None,
+    workers: int = 1,
+) -> dict[str, Any]:
+    """
+    Scan all repos under base_path; optionally apply policy.
+    With shard=(K, N), only scan repos whose stable path hash falls in shard K of N.
+    Bare mirrors are read from their object store at ref (default HEAD), without checkout.
+    workers > 1 scans repos in that many processes.
+    Returns: total_repos, violations (count), repos (list), by_rule (most common drift), risk_clusters.
+    """
+    from .pipeline import run_fleet
+
+    policy = _load_policy(policy_path)
+    return run_fleet(base_path, inspect_host(), policy, shard=shard, ref=ref, workers=workers)
+
+
+def merge_fleet_results(summaries: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Combine shard outputs of fleet_scan into one report.
+    Counts are recomputed from the per-repo rule lists, so truncated top-N
+    tables in the shards do not skew most_common_drift or risk_clusters.
+    Repos seen in more than one input (overlapping shards) are counted once, keyed on
+    their path relative to the fleet root, so shards run from different mounts dedupe.
+    """
+    repos: dict[str, dict[str, Any]] = {}
+    policy: dict[str, Any] = {}
+    for s in summaries:
+        for r in s.get("repos", []):
+            key = r.get("rel_path") or r["path"]
+            if key not in repos:
+                repos[key] = compact_row(r)
+        if not policy and s.get("policy"):
+            policy = s["policy"]
+    merged = _summarize(sorted(repos.values(), key=lambda r: r["path"]), policy)
+    merged["shards_merged"] = len(summaries)
+    return merged
+
+
 def host_from_dict(data: dict) -> HostProfile:
-    """Build HostProfile from dict (e.g. from JSON file)."""
-    return HostProfile(
-        os=data.get("os", "linux"),
-        arch=data.get("arch", "x86_64"),
-        cuda_available=data.get("cuda_available", False),
-        cuda_version=data.get("cuda_version"),
-        python_version=data.get("python_version"),
-        node_version=data.get("node_version"),
-        rust_version=data.get("rust_version"),
-        has_compiler=data.get("has_compiler", True),
-        has_metal=data.get("has_metal", False),
-        has_libgl=data.get("has_libgl", False),
-        has_ffmpeg=data.get("has_ffmpeg", False),
-        ram_gb=data.get("ram_gb"),
-    )
+    """Build HostProfile from dict (e.g. from JSON file); every HostProfile field is read."""
+    defaults = {"os": "linux", "arch": "x86_64", "has_compiler": True}
+    return HostProfile(**{f.name: data.get(f.name, defaults.get(f.name, f.default)) for f in fields(HostProfile)})
 
 
 def simulate(repo_path: Path, host_path: Path) -> tuple[RepoProfile, HostProfile, list]:
@@ -211,3 +316,103 @@ def simulate(repo_path: Path, host_path: Path) -> tuple[RepoProfile, HostProfile
     host = host_from_dict(data)
     results = run_rules(repo, host)
     return repo, host, results
+
+
+def _host_entries(data: Any, stem: str) -> list[tuple[str, dict]]:
+    """(name, host dict) pairs from one host file's JSON."""
+    if isinstance(data, dict) and isinstance(data.get("hosts"), dict):
+        return [(str(k), v.get("host", v)) for k, v in data["hosts"].items()]
+    if isinstance(data, dict) and isinstance(data.get("hosts"), list):
+        data = data["hosts"]
+    if isinstance(data, list):
+        return [
+            (str(h.get("name") or f"{stem}-{i + 1}"), h.get("host", h))
+            for i, h in enumerate(data)
+            if isinstance(h, dict)
+        ]
+    if isinstance(data, dict):
+        return [(str(data.get("name") or stem), data.get("host", data))]
+    raise ValueError(f"Not a host profile: {stem}")
+
+
+def load_hosts(path: Path) -> list[tuple[str, HostProfile]]:
+    """
+    Host library for matrix simulation: a host JSON (from repofail -j), a file with a
+    list or {"hosts": {name: host}} of them, or a directory of such files. Named by
+    their "name" key, else the file stem.
+    """
+    path = Path(path)
+    files = sorted(path.glob("*.json")) if path.is_dir() else [path]
+    hosts: list[tuple[str, HostProfile]] = []
+    seen: set[str] = set()
+    for f in files:
+        for name, data in _host_entries(json.loads(f.read_text()), f.stem):
+            if name in seen:
+                raise ValueError(f"Duplicate host name {name!r} in {f}")
+            seen.add(name)
+            hosts.append((name, host_from_dict(data)))
+    if not hosts:
+        raise ValueError(f"No host profiles found in {path}")
+    return hosts
+
+
+def simulate_matrix(repo_paths: list[Path], hosts: list[tuple[str, HostProfile]]) -> dict[str, Any]:
+    """
+    Repo x host compatibility matrix. Each repo is scanned once; rules for the whole
+    matrix are evaluated column-wise (config and YAML rules were captured by the scan).
+    """
+    repos = [scan_repo(repo_path) for repo_path in repo_paths]
+    return _matrix(repo_paths, repos, hosts)
+
+
+def _matrix(
+    repo_paths: list[Path], repos: list[RepoProfile], hosts: list[tuple[str, HostProfile]], base_path: Path | None = None
+) -> dict[str, Any]:
+    """{hosts, repos: [{path, name, cells: {host: {score, rules, severities}}}]} for scanned repos."""
+    matrix = evaluate_matrix(repos, [host for _, host in hosts])
+    rows = []
+    for repo_path, repo, results in zip(repo_paths, repos, matrix):
+        cells = {}
+        for (name, _), rule_results in zip(hosts, results):
+            rules, severities, score = _compact_results(rule_results)
+            cells[name] = {"score": score, "rules": list(rules), "severities": list(severities)}
+        row = {"path": str(repo_path), "name": repo.name or Path(repo_path).name, "cells": cells}
+        if base_path is not None:
+            row["rel_path"] = rel_path(Path(repo_path), base_path)
+        rows.append(row)
+    return {"hosts": [name for name, _ in hosts], "repos": rows}
+
+
+def fleet_matrix(
+    base_path: Path,
+    hosts: list[tuple[str, HostProfile]],
+    policy_path: Path | None = None,
+    shard: tuple[int, int] | None = None,
+    ref: str | None = None,
+    workers: int = 1,
+) -> dict[str, Any]:
+    """
+    Fleet-wide repo x host matrix: every repo under base_path is scanned once and the
+    whole fleet is evaluated against all hosts column-wise. Adds a per-host summary
+    (violations, repos with HIGH findings, most common drift) under by_host.
+    """
+    from .pipeline import discover, scan
+
+    policy = _load_policy(policy_path)
+    base = Path(base_path).resolve()
+    repos = discover(base, max_depth=int(policy.get("max_depth", 4)), max_repos=int(policy.get("max_repos", 500)), shard=shard)
+    scanned = list(scan(repos, ref=ref, workers=workers))
+    matrix = _matrix([p for p, _ in scanned], [r for _, r in scanned], hosts, base)
+    by_host = {}
+    for name in matrix["hosts"]:
+        cells = [row["cells"][name] for row in matrix["repos"]]
+        drift = Counter(rid for cell in cells for rid in cell["rules"])
+        by_host[name] = {
+            "violations": sum(1 for cell in cells if cell["rules"]),
+            "high": sum(1 for cell in cells if "HIGH" in cell["severities"]),
+            "most_common_drift": dict(drift.most_common(15)),
+        }
+    matrix.update(total_repos_scanned=len(scanned), by_host=by_host, policy=policy)
+    if shard:
+        matrix["shard"] = f"{shard[0]}/{shard[1]}"
+    return matrix
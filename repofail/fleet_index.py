@@ -0,0 +1,204 @@
+"""Fleet results index - persist fleet summaries to SQLite and query without rescanning."""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+from .fleet import DEFAULT_CATEGORY, RULE_CATEGORIES
+
+GROUP_BY_COLUMNS = {
+    "rule": "f.rule_id",
+    "category": "f.category",
+    "severity": "f.severity",
+    "host": "r.host",
+    "score_bucket": "r.score_bucket",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    rel_path TEXT NOT NULL,  -- mount-independent repo key (fleet rel_path, else path)
+    name TEXT,
+    host TEXT NOT NULL DEFAULT '',
+    score INTEGER NOT NULL,
+    score_bucket INTEGER NOT NULL,
+    rule_count INTEGER NOT NULL,
+    high_count INTEGER NOT NULL,
+    medium_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS findings (
+    repo_id INTEGER NOT NULL REFERENCES repos(id) ON DELETE CASCADE,
+    rule_id TEXT NOT NULL,
+    category TEXT NOT NULL,
+    severity TEXT NOT NULL
+);
+"""
+
+_INDEXES = """
+CREATE UNIQUE INDEX IF NOT EXISTS repos_key ON repos (rel_path, host);
+CREATE INDEX IF NOT EXISTS findings_rule ON findings (rule_id, repo_id);
+CREATE INDEX IF NOT EXISTS findings_category ON findings (category, repo_id);
+CREATE INDEX IF NOT EXISTS findings_severity ON findings (severity, repo_id);
+CREATE INDEX IF NOT EXISTS findings_repo ON findings (repo_id);
+CREATE INDEX IF NOT EXISTS repos_score_bucket ON repos (score_bucket);
+CREATE INDEX IF NOT EXISTS repos_score ON repos (score);
+CREATE INDEX IF NOT EXISTS repos_host ON repos (host);
+"""
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(_SCHEMA)
+    if "rel_path" not in {row[1] for row in conn.execute("PRAGMA table_info(repos)")}:
+        # Index written before rel_path existed: its rows are keyed on the absolute path
+        with conn:
+            conn.execute("ALTER TABLE repos ADD COLUMN rel_path TEXT NOT NULL DEFAULT ''")
+            conn.execute("UPDATE repos SET rel_path = path")
+    conn.executescript(_INDEXES)
+    return conn
+
+
+def score_bucket(score: int) -> int:
+    """Lower bound of the 10-point bucket: 0, 10, ..., 90 (100 falls in 90)."""
+    return min(90, max(0, int(score)) // 10 * 10)
+
+
+def index_summary(summary: dict[str, Any], db_path: Path) -> int:
+    """
+    Store a fleet summary (fleet_scan / fleet-merge / queue output) in the index.
+    Repos are keyed on rel_path (else path), so re-indexing the same repo on the same host -
+    even from a worker with a different mount - replaces the old row. Returns repos indexed.
+    """
+    conn = _connect(db_path)
+    count = 0
+    try:
+        with conn:
+            for r in summary.get("repos", []):
+                host = r.get("host", "")
+                key = r.get("rel_path") or r["path"]
+                conn.execute("DELETE FROM repos WHERE rel_path = ? AND host = ?", (key, host))
+                cur = conn.execute(
+                    "INSERT INTO repos (path, rel_path, name, host, score, score_bucket, rule_count, high_count,"
+                    " medium_count) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        r["path"],
+                        key,
+                        r.get("name", ""),
+                        host,
+                        int(r.get("score", 100)),
+                        score_bucket(r.get("score", 100)),
+                        int(r.get("rule_count", 0)),
+                        int(r.get("high_count", 0)),
+                        int(r.get("medium_count", 0)),
+                    ),
+                )
+                rules = r.get("rules", [])
+                severities = r.get("severities") or [""] * len(rules)
+                conn.executemany(
+                    "INSERT INTO findings (repo_id, rule_id, category, severity) VALUES (?, ?, ?, ?)",
+                    [
+                        (cur.lastrowid, rid, RULE_CATEGORIES.get(rid, DEFAULT_CATEGORY), sev)
+                        for rid, sev in zip(rules, severities)
+                    ],
+                )
+                count += 1
+    finally:
+        conn.close()
+    return count
+
+
+def _where(
+    rule: str | None,
+    category: str | None,
+    severity: str | None,
+    host: str | None,
+    min_score: int | None,
+    max_score: int | None,
+) -> tuple[str, list[Any]]:
+    """WHERE clause over repos r. Finding filters must all hold for the same finding."""
+    clauses: list[str] = []
+    params: list[Any] = []
+    if host is not None:
+        clauses.append("r.host = ?")
+        params.append(host)
+    if min_score is not None:
+        clauses.append("r.score >= ?")
+        params.append(min_score)
+    if max_score is not None:
+        clauses.append("r.score <= ?")
+        params.append(max_score)
+    finding: list[str] = []
+    for col, val in (("rule_id", rule), ("category", category), ("severity", severity.upper() if severity else None)):
+        if val is not None:
+            finding.append(f"f.{col} = ?")
+            params.append(val)
+    if finding:
+        clauses.append(
+            "r.id IN (SELECT f.repo_id FROM findings f WHERE " + " AND ".join(finding) + ")"
+        )
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def _percentiles(conn: sqlite3.Connection, where: str, params: list[Any], total: int, pcts: list[float]) -> dict[str, int]:
+    """Nearest-rank percentiles of score, read straight off the score index."""
+    out: dict[str, int] = {}
+    for p in pcts:
+        rank = max(1, min(total, -(-p * total // 100)))  # ceil(p/100 * n)
+        row = conn.execute(
+            f"SELECT r.score FROM repos r{where} ORDER BY r.score LIMIT 1 OFFSET ?",
+            [*params, int(rank) - 1],
+        ).fetchone()
+        out[f"p{p:g}"] = row[0]
+    return out
+
+
+def query(
+    db_path: Path,
+    rule: str | None = None,
+    category: str | None = None,
+    severity: str | None = None,
+    host: str | None = None,
+    min_score: int | None = None,
+    max_score: int | None = None,
+    group_by: str | None = None,
+    percentiles: list[float] | None = None,
+    limit: int = 50,
+) -> dict[str, Any]:
+    """
+    Filter indexed repos; optionally group (rule, category, severity, host, score_bucket)
+    and compute score percentiles. Groups count distinct repos.
+    """
+    if group_by is not None and group_by not in GROUP_BY_COLUMNS:
+        raise ValueError(f"Unknown group-by {group_by!r}: use one of {', '.join(GROUP_BY_COLUMNS)}")
+    where, params = _where(rule, category, severity, host, min_score, max_score)
+    conn = _connect(db_path)
+    try:
+        total = conn.execute(f"SELECT COUNT(*) FROM repos r{where}", params).fetchone()[0]
+        result: dict[str, Any] = {"count": total}
+        if group_by:
+            col = GROUP_BY_COLUMNS[group_by]
+            join = " JOIN findings f ON f.repo_id = r.id" if col.startswith("f.") else ""
+            rows = conn.execute(
+                f"SELECT {col}, COUNT(DISTINCT r.id) AS n FROM repos r{join}{where} GROUP BY {col} ORDER BY n DESC, {col}",
+                params,
+            ).fetchall()
+            result["groups"] = {str(k): n for k, n in rows}
+        else:
+            rows = conn.execute(
+                f"SELECT r.path, r.rel_path, r.name, r.host, r.score, r.rule_count FROM repos r{where}"
+                " ORDER BY r.score, r.rel_path LIMIT ?",
+                [*params, limit],
+            ).fetchall()
+            result["repos"] = [
+                {"path": p, "rel_path": k, "name": n, "host": h, "score": s, "rule_count": c}
+                for p, k, n, h, s, c in rows
+            ]
+        if percentiles and total:
+            result["percentiles"] = _percentiles(conn, where, params, total, percentiles)
+        return result
+    finally:
+        conn.close()
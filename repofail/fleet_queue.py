@@ -0,0 +1,281 @@
+"""Fleet work queue - lease-based work stealing over a shared SQLite file.
+
+Tasks are keyed by repo path relative to the fleet root, so workers that mount the
+fleet somewhere else resolve them against their own base path. A worker renews its
+lease while a scan runs, and only the current lease holder can complete a task.
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from .fleet import SKIP_AUDIT_DIRS, _find_repos, _load_policy, _summarize, compact_row, rel_path, scan_one
+from .models import HostProfile
+from .scanner import inspect_host
+from .scanner.archive import is_archive
+from .scanner.gitstore import is_bare_repo
+
+DEFAULT_LEASE_SECONDS = 900  # long enough for a giant monorepo; expired leases are re-claimed
+MAX_ATTEMPTS = 3  # a repo that crashes its worker this many times is marked failed
+POLL_SECONDS = 5.0  # idle workers re-check for expired leases at most this often
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL DEFAULT 0,
+    state TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_claim ON tasks (state, size DESC);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    """Open the queue DB in autocommit mode; transactions are explicit (BEGIN IMMEDIATE)."""
+    conn = sqlite3.connect(str(db_path), timeout=60, isolation_level=None)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _estimate_repo_size(path: Path) -> int:
+    """Cheap size estimate in bytes: archive size, git packfiles if present, else a walk of the tree."""
+    if is_archive(path):
+        return path.stat().st_size
+    git_dir = path if is_bare_repo(path) else path / ".git"
+    pack_dir = git_dir / "objects" / "pack"
+    if pack_dir.is_dir():
+        return sum(p.stat().st_size for p in pack_dir.glob("*.pack"))
+    total = 0
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [d for d in dirs if d not in SKIP_AUDIT_DIRS and not d.startswith(".")]
+        for f in files:
+            try:
+                total += os.stat(os.path.join(root, f)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def enqueue(
+    db_path: Path,
+    base_path: Path,
+    policy: dict[str, Any] | None = None,
+    ref: str | None = None,
+) -> int:
+    """Discover repos under base_path and add them to the queue. Idempotent; returns number added."""
+    policy = policy or {}
+    base_path = Path(base_path).resolve()
+    dirs = _find_repos(
+        base_path,
+        max_depth=int(policy.get("max_depth", 4)),
+        max_repos=int(policy.get("max_repos", 500)),
+    )
+    conn = _connect(db_path)
+    try:
+        known = {row[0] for row in conn.execute("SELECT path FROM tasks")}
+        rels = ((rel_path(d, base_path), d) for d in dirs)
+        rows = [(rel, _estimate_repo_size(d)) for rel, d in rels if rel not in known]
+        conn.execute("BEGIN IMMEDIATE")
+        added = conn.executemany("INSERT OR IGNORE INTO tasks (path, size) VALUES (?, ?)", rows).rowcount
+        conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('policy', ?)", (json.dumps(policy),))
+        conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('base', ?)", (str(base_path),))
+        if ref:
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('ref', ?)", (ref,))
+        conn.execute("COMMIT")
+        return max(0, added)
+    finally:
+        conn.close()
+
+
+def claim(conn: sqlite3.Connection, worker: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> str | None:
+    """
+    Atomically lease the largest unclaimed repo (or one whose lease expired).
+    Largest-first keeps giant monorepos off the tail of the run.
+    """
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute(
+            "SELECT path, attempts FROM tasks"
+            " WHERE state = 'pending' OR (state = 'leased' AND lease_until < ?)"
+            " ORDER BY size DESC, path LIMIT 1",
+            (now,),
+        ).fetchone()
+        if row is None:
+            conn.execute("COMMIT")
+            return None
+        path, attempts = row
+        if attempts >= MAX_ATTEMPTS:
+            conn.execute("UPDATE tasks SET state = 'failed', worker = NULL WHERE path = ?", (path,))
+            conn.execute("COMMIT")
+            return claim(conn, worker, lease_seconds)
+        conn.execute(
+            "UPDATE tasks SET state = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1 WHERE path = ?",
+            (worker, now + lease_seconds, path),
+        )
+        conn.execute("COMMIT")
+        return path
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def renew(conn: sqlite3.Connection, path: str, worker: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+    """Extend worker's lease on path; False if the lease was lost (expired and re-claimed)."""
+    cur = conn.execute(
+        "UPDATE tasks SET lease_until = ? WHERE path = ? AND worker = ? AND state = 'leased'",
+        (time.time() + lease_seconds, path, worker),
+    )
+    return cur.rowcount > 0
+
+
+def complete(conn: sqlite3.Connection, path: str, worker: str, result: dict[str, Any] | None) -> bool:
+    """
+    Record a finished repo; result=None marks it failed (scan raised). Only the holder
+    of a live lease can complete a task - returns False (and records nothing) otherwise.
+    """
+    owned = "path = ? AND worker = ? AND state = 'leased' AND lease_until > ?"
+    if result is None:
+        cur = conn.execute(f"UPDATE tasks SET state = 'failed', lease_until = NULL WHERE {owned}", (path, worker, time.time()))
+    else:
+        cur = conn.execute(
+            f"UPDATE tasks SET state = 'done', lease_until = NULL, result = ? WHERE {owned}",
+            (json.dumps(result), path, worker, time.time()),
+        )
+    return cur.rowcount > 0
+
+
+@contextmanager
+def _heartbeat(db_path: Path, path: str, worker: str, lease_seconds: float):
+    """Renew the lease on path every third of lease_seconds until the block exits."""
+    stop = threading.Event()
+
+    def beat() -> None:
+        conn = _connect(db_path)
+        try:
+            while not stop.wait(lease_seconds / 3):
+                if not renew(conn, path, worker, lease_seconds):
+                    return
+        finally:
+            conn.close()
+
+    thread = threading.Thread(target=beat, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_worker(
+    db_path: Path,
+    host: HostProfile | None = None,
+    worker_id: str | None = None,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    wait: bool = True,
+    base_path: Path | None = None,
+) -> int:
+    """
+    Claim and scan repos until the queue is drained. Returns number of repos processed.
+    Task paths are resolved against base_path (this worker's mount of the fleet;
+    default: the base the queue was filled from). With wait=True, an idle worker keeps
+    polling while other workers hold leases, so it can pick up the repo if a lease
+    expires (crashed worker).
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+    host = host or inspect_host()
+    conn = _connect(db_path)
+    meta = dict(conn.execute("SELECT key, value FROM meta WHERE key IN ('ref', 'base')").fetchall())
+    ref = meta.get("ref")
+    base = Path(base_path).resolve() if base_path else Path(meta.get("base", "."))
+    processed = 0
+    try:
+        while True:
+            path = claim(conn, worker_id, lease_seconds)
+            if path is None:
+                next_expiry = conn.execute("SELECT MIN(lease_until) FROM tasks WHERE state = 'leased'").fetchone()[0]
+                if not wait or next_expiry is None:
+                    return processed
+                time.sleep(min(POLL_SECONDS, max(0.05, next_expiry - time.time())))
+                continue
+            with _heartbeat(db_path, path, worker_id, lease_seconds):
+                try:
+                    result = scan_one(base / path, host, ref=ref, base_path=base)
+                except Exception:
+                    result = None
+            if complete(conn, path, worker_id, result):
+                processed += 1
+    finally:
+        conn.close()
+
+
+def _worker_main(db_path: str, lease_seconds: float, base_path: str) -> None:
+    """Entry point for local worker processes standing in for nodes."""
+    run_worker(Path(db_path), lease_seconds=lease_seconds, base_path=Path(base_path))
+
+
+def queue_status(db_path: Path) -> dict[str, int]:
+    """Task counts by state."""
+    conn = _connect(db_path)
+    try:
+        return dict(conn.execute("SELECT state, COUNT(*) FROM tasks GROUP BY state").fetchall())
+    finally:
+        conn.close()
+
+
+def queue_summary(db_path: Path) -> dict[str, Any]:
+    """Fleet summary (same shape as fleet_scan) from all completed tasks."""
+    conn = _connect(db_path)
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'policy'").fetchone()
+        policy = json.loads(row[0]) if row else {}
+        repos = [
+            compact_row(json.loads(r[0]))
+            for r in conn.execute("SELECT result FROM tasks WHERE state = 'done' ORDER BY path")
+        ]
+    finally:
+        conn.close()
+    summary = _summarize(repos, policy)
+    summary["queue"] = queue_status(db_path)
+    return summary
+
+
+def fleet_queue_scan(
+    base_path: Path,
+    db_path: Path,
+    policy_path: Path | None = None,
+    workers: int = 1,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    ref: str | None = None,
+) -> dict[str, Any]:
+    """
+    Enqueue repos under base_path into the shared queue, then work it until drained.
+    Run the same command on several machines against one DB on a shared filesystem;
+    workers > 1 additionally spawns local worker processes.
+    """
+    enqueue(db_path, base_path, _load_policy(policy_path), ref=ref)
+    procs = []
+    ctx = multiprocessing.get_context("spawn")
+    for _ in range(max(0, workers - 1)):
+        proc = ctx.Process(target=_worker_main, args=(str(db_path), lease_seconds, str(base_path)))
+        proc.start()
+        procs.append(proc)
+    run_worker(db_path, lease_seconds=lease_seconds, base_path=base_path)
+    for proc in procs:
+        proc.join()
+    return queue_summary(db_path)
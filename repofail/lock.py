@@ -28,12 +28,10 @@ def generate_lock(repo_path: Path) -> dict[str, Any]:
     }
     try:
         repo = scan_repo(repo_path)
-        if repo.raw.get("dockerfile"):
-            # First Dockerfile parsed may have base_image
-            df = repo.raw["dockerfile"]
-            if isinstance(df, dict) and df.get("base_image"):
-                lock["docker_base"] = df["base_image"]
-        # Also check first Dockerfile on disk if not in merged raw
+        if repo.dockerfile and repo.dockerfile.base_image:
+            # Root Dockerfile parsed at scan time
+            lock["docker_base"] = repo.dockerfile.base_image
+        # Also check first Dockerfile on disk if not captured by the scan
         if lock["docker_base"] is None and repo.has_dockerfile:
             for p in (repo_path / "Dockerfile",):
                 if p.exists():
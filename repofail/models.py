@@ -1,10 +1,17 @@
 """Structured profiles for repo and host."""
 
+import re
+import sys
+from bisect import bisect_left
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Any, Optional
 
 
-@dataclass
+def _intern_all(values) -> tuple[str, ...]:
+    return tuple(sys.intern(str(v)) for v in values)
+
+
+@dataclass(frozen=True, slots=True)
 class HostProfile:
     """Structured output from host inspection."""
 
@@ -23,7 +30,165 @@ class HostProfile:
     ram_gb: Optional[float] = None
 
 
-@dataclass
+def normalize_name(name: str, ecosystem: str = "python") -> str:
+    """PEP 503 name for Python ('Foo_Bar.x' -> 'foo-bar-x'); npm names are only lowercased."""
+    if ecosystem == "python":
+        return sys.intern(re.sub(r"[-_.]+", "-", name).lower())
+    return sys.intern(name.lower())
+
+
+_PLATFORM_EQ = re.compile(r"(sys_platform|platform_system)\s*==\s*['\"]([^'\"]+)['\"]")
+_PLATFORM_OTHER = re.compile(r"(sys_platform|platform_system)\s*(!=|not\s+in|in\b)")
+_OS_MARKER_VALUES = {"macos": {"darwin"}, "linux": {"linux"}, "windows": {"win32", "windows", "cygwin"}}
+
+
+@dataclass(frozen=True, slots=True)
+class Dependency:
+    """One declared (or locked) dependency and where it was declared."""
+
+    name: str  # normalized
+    specifier: str = ""  # ">=2.2,<2.4", "^18.2.0", "@ https://..."
+    extras: tuple[str, ...] = ()
+    marker: str = ""  # environment marker, e.g. 'sys_platform == "linux"'
+    ecosystem: str = "python"  # "python" | "node"
+    source: str = ""  # repo-relative file
+    line: int = 0
+
+    def excludes_os(self, os: str) -> bool:
+        """True if the marker pins the platform to others only (sys_platform == 'linux' seen from macOS)."""
+        if not self.marker or _PLATFORM_OTHER.search(self.marker):
+            return False
+        values = [v.lower() for _, v in _PLATFORM_EQ.findall(self.marker)]
+        return bool(values) and not (set(values) & _OS_MARKER_VALUES.get(os, set()))
+
+
+@dataclass(frozen=True, slots=True)
+class DependencyIndex:
+    """Every dependency a repo declares (Python and Node, all files), indexed by name. Built once per scan."""
+
+    deps: tuple[Dependency, ...] = ()
+    _by_name: dict[str, tuple[Dependency, ...]] = field(init=False, repr=False, compare=False)
+    _sorted: tuple[str, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        by_name: dict[str, list[Dependency]] = {}
+        for dep in self.deps:
+            by_name.setdefault(dep.name, []).append(dep)
+        object.__setattr__(self, "_by_name", {k: tuple(v) for k, v in by_name.items()})
+        object.__setattr__(self, "_sorted", tuple(sorted(by_name)))
+
+    def __len__(self) -> int:
+        return len(self.deps)
+
+    def __iter__(self):
+        return iter(self.deps)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def all(self, name: str, ecosystem: str | None = None) -> tuple[Dependency, ...]:
+        """Every declaration of name, in scan order (root configs first)."""
+        found = self._by_name.get(name, ())
+        return found if ecosystem is None else tuple(d for d in found if d.ecosystem == ecosystem)
+
+    def get(self, name: str, ecosystem: str | None = None) -> Optional[Dependency]:
+        """First declaration of name, or None."""
+        found = self.all(name, ecosystem)
+        return found[0] if found else None
+
+    def specifier(self, name: str, ecosystem: str | None = "python") -> Optional[str]:
+        """First non-empty version specifier declared for name."""
+        for dep in self.all(name, ecosystem):
+            if dep.specifier:
+                return dep.specifier
+        return None
+
+    def names(self, ecosystem: str | None = None) -> list[str]:
+        """Distinct names, sorted."""
+        if ecosystem is None:
+            return list(self._sorted)
+        return [n for n in self._sorted if any(d.ecosystem == ecosystem for d in self._by_name[n])]
+
+    def with_prefix(self, prefix: str, ecosystem: str | None = None) -> list[str]:
+        """Distinct names starting with prefix, sorted ('nvidia-cudnn-cu' -> ['nvidia-cudnn-cu12'])."""
+        i = bisect_left(self._sorted, prefix)
+        out = []
+        while i < len(self._sorted) and self._sorted[i].startswith(prefix):
+            name = self._sorted[i]
+            if ecosystem is None or self.all(name, ecosystem):
+                out.append(name)
+            i += 1
+        return out
+
+
+@dataclass(frozen=True, slots=True)
+class DockerfileInfo:
+    """Root Dockerfile facts."""
+
+    python_version: Optional[str] = None
+    base_image: Optional[str] = None
+    has_cuda: bool = False
+    platform_amd64: bool = False
+    python_from_image: bool = False  # python_version is what the base image ships, not a tag
+    cuda_version: Optional[str] = None  # from the base-image index
+    image_archs: tuple[str, ...] = ()  # architectures the base image is published for (empty = unknown)
+
+    @classmethod
+    def from_parsed(cls, data: dict[str, Any]) -> "DockerfileInfo":
+        return cls(
+            python_version=data.get("python_version"),
+            base_image=data.get("base_image"),
+            has_cuda=bool(data.get("has_cuda")),
+            platform_amd64=bool(data.get("platform_amd64")),
+            python_from_image=bool(data.get("python_from_image")),
+            cuda_version=data.get("cuda_version"),
+            image_archs=tuple(data.get("image_archs", ())),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class WorkflowInfo:
+    """One GitHub Actions workflow: runners and Python matrix."""
+
+    runs_on: tuple[str, ...] = ()
+    python_versions: tuple[str, ...] = ()
+    has_cuda: bool = False
+
+    @classmethod
+    def from_parsed(cls, data: dict[str, Any]) -> "WorkflowInfo":
+        return cls(
+            runs_on=_intern_all(data.get("runs_on", ())),
+            python_versions=_intern_all(data.get("python_versions", ())),
+            has_cuda=bool(data.get("has_cuda")),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class WorkspaceMember:
+    """One package of a Node (npm/yarn/pnpm) or Cargo workspace, for per-package attribution."""
+
+    path: str  # repo-relative directory
+    name: str = ""
+    ecosystem: str = "node"  # "node" | "rust"
+    version_req: Optional[str] = None  # engines.node / rust-version
+    native: tuple[str, ...] = ()  # native addons / system crates it pulls in
+    depends_on: tuple[str, ...] = ()  # names of other members it depends on
+
+
+@dataclass(frozen=True, slots=True)
+class BinaryArtifact:
+    """A prebuilt native library or vendored wheel shipped in the repo, with what it was built for."""
+
+    path: str  # repo-relative file
+    name: str  # library stem / normalized wheel distribution name
+    format: str  # "elf" | "macho" | "pe" | "wheel"
+    os: str  # "linux" | "macos" | "windows" | "freebsd" | "any"
+    archs: tuple[str, ...] = ()  # "x86_64", "arm64", ... (several for universal binaries)
+    python: str = ""  # wheel python tag, e.g. "cp311"
+    abi: str = ""  # wheel abi tag, e.g. "cp311", "abi3", "none"
+
+
+@dataclass(slots=True)
 class RepoProfile:
     """Structured output from repo scanning."""
 
@@ -33,6 +198,7 @@ class RepoProfile:
     # Python
     python_version: Optional[str] = None  # e.g. ">=3.10,<3.12"
     has_requirements_txt: bool = False
+    requirements_cycles: list[list[str]] = field(default_factory=list)  # -r/-c include loops, as file chains
     has_pyproject: bool = False
     has_setup_py: bool = False
 
@@ -72,6 +238,7 @@ class RepoProfile:
     required_ports: list[int] = field(default_factory=list)  # from docker-compose, .env
     github_workflows: list[str] = field(default_factory=list)
     os_specific: bool = False
+    binary_artifacts: list[BinaryArtifact] = field(default_factory=list)  # prebuilt .so/.dylib/.dll, vendored wheels
 
     # For rule output - where CUDA usage was found
     cuda_files: list[str] = field(default_factory=list)
@@ -79,6 +246,18 @@ class RepoProfile:
 
     # Monorepo: discovered subprojects (path rel to repo, type, key fields)
     subprojects: list[dict] = field(default_factory=list)
+    workspace_members: list[WorkspaceMember] = field(default_factory=list)  # expanded from workspace globs
+
+    # Parsed records for the rule engine (first / root occurrence of each)
+    dependencies: DependencyIndex = field(default_factory=DependencyIndex)
+    dockerfile: Optional[DockerfileInfo] = None
+    workflows: dict[str, WorkflowInfo] = field(default_factory=dict)  # by workflow file stem
+    native_build_backends: list[str] = field(default_factory=list)  # maturin, setuptools-rust, ...
+
+    # Repo-local engine config, captured at scan time (None = not scanned; read from disk)
+    repofail_config: Optional[dict] = None  # .repofail.yaml
+    yaml_rules: Optional[list[dict]] = None  # .repofail/rules.yaml or repofail-rules.yaml
+    has_native_install: Optional[bool] = None  # Makefile / pyproject.toml / requirements.txt at root
 
-    # Raw data for rule engine
-    raw: dict = field(default_factory=dict)
+    # sha256 over the scanned content rules depend on; equal digests -> equal rule results
+    content_digest: str = ""
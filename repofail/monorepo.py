@@ -0,0 +1,99 @@
+"""Monorepo mode - one profile per subproject, scanned and evaluated in parallel.
+
+scan_repo merges all subprojects into one profile where the first value wins, so in
+a monorepo most subprojects never reach the rules. Here subproject roots are found
+by one uncapped, pruned walk (scan_repo's config discovery stops after MAX_CONFIGS),
+and each is scanned on its own, with nested subprojects excluded so every file
+belongs to its innermost project. Rules then run per subproject, and the
+repo score rolls up as the worst subproject's score.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import re
+from dataclasses import replace
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from .engine import run_rules
+from .models import HostProfile, RepoProfile
+from .pipeline import bounded_map
+from .risk import estimate_success_probability
+from .scanner import scan_repo
+from .scanner.memo import object_digest
+from .scanner.repo import CONFIG_PATTERNS, SKIP_PARTS
+from .scanner.vfs import VirtualPath, open_tree
+from .scanner.walk import iter_source_files
+
+# Config kind -> project type, in the order scan_repo records them
+PROJECT_TYPES = {
+    "pyproject": "python", "requirements": "python", "setup_py": "python",
+    "package_json": "node", "cargo": "rust", "go_mod": "go", "dockerfile": "docker",
+}
+_TYPE_ORDER = list(dict.fromkeys(PROJECT_TYPES.values()))
+_PROJECT_PATTERNS = [
+    (re.compile(fnmatch.translate(pattern)), PROJECT_TYPES[kind]) for pattern, kind in CONFIG_PATTERNS if kind in PROJECT_TYPES
+]
+_PROJECT_FILE = re.compile("|".join(f"(?:{p.pattern})" for p, _ in _PROJECT_PATTERNS))
+
+
+def subproject_roots(tree: Path | VirtualPath) -> dict[str, list[str]]:
+    """Subproject path -> project types found there, parents before children ('.' first)."""
+    roots: dict[str, set[str]] = {}
+    for path in iter_source_files(tree, prune=SKIP_PARTS, max_files=None, pattern=_PROJECT_FILE):
+        rel = path.parent.relative_to(tree).as_posix() if path.parent != tree else "."
+        types = roots.setdefault(rel, set())
+        types.update(ptype for pattern, ptype in _PROJECT_PATTERNS if pattern.match(path.name))
+    ordered = sorted(roots.items(), key=lambda kv: (kv[0] != ".", kv[0]))
+    return {rel: [t for t in _TYPE_ORDER if t in types] for rel, types in ordered}
+
+
+def _nested(root: str, roots: list[str]) -> tuple[str, ...]:
+    """Other roots below root, relative to it."""
+    if root == ".":
+        return tuple(r for r in roots if r != ".")
+    return tuple(r[len(root) + 1 :] for r in roots if r.startswith(root + "/"))
+
+
+def _scan_subproject(job: tuple[str, tuple[str, ...]], tree: Path | VirtualPath, repo: RepoProfile, host: HostProfile) -> dict[str, Any]:
+    """Scan one subproject root (nested roots excluded) and run rules on it."""
+    rel, exclude = job
+    sub = scan_repo(tree if rel == "." else tree / rel, exclude=exclude)
+    if not sub.repofail_config or not sub.yaml_rules:
+        # Repo-level .repofail.yaml and custom rules apply unless the subproject has its own
+        sub = replace(
+            sub,
+            repofail_config=sub.repofail_config or repo.repofail_config,
+            yaml_rules=sub.yaml_rules or repo.yaml_rules,
+        )
+        sub.content_digest = object_digest(sub, exclude=("path", "name", "content_digest"))
+    results = run_rules(sub, host)
+    return {
+        "path": rel,
+        "profile": sub,
+        "results": results,
+        "score": estimate_success_probability(results),
+    }
+
+
+def scan_monorepo(path: str | Path | VirtualPath, host: HostProfile, ref: str | None = None, workers: int = 1) -> dict[str, Any]:
+    """
+    Scan path, then scan and evaluate each subproject in parallel (workers threads).
+    Returns repo (merged profile), subprojects ([{path, types, profile, results, score}],
+    parents first) and score (lowest subproject score; 100 if none fired).
+    """
+    tree = open_tree(path, ref)
+    repo = scan_repo(tree)
+    roots = subproject_roots(tree) or {".": []}
+    paths = list(roots)
+    jobs = [(rel, _nested(rel, paths)) for rel in paths]
+    subprojects = list(bounded_map(partial(_scan_subproject, tree=tree, repo=repo, host=host), jobs, workers=workers))
+    for sp in subprojects:
+        sp["types"] = roots[sp["path"]]
+    return {
+        "repo": repo,
+        "subprojects": subprojects,
+        "score": min((sp["score"] for sp in subprojects), default=100),
+    }
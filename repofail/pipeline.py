@@ -0,0 +1,171 @@
+"""Fleet pipeline - discover -> scan -> evaluate -> aggregate as lazy generator stages.
+
+Each stage takes an iterator and yields items, so repos stream through the chain
+instead of being collected into lists between steps. A stage given workers runs on
+a thread or process pool with a bounded number of items in flight: upstream is only
+pulled when a slot frees up, so memory stays flat however large the fleet is.
+Consumers (dashboards, exporters) can tap() any stage without changing the others.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+from .fleet import _select_shard, _summarize, iter_repos, repo_row
+from .models import HostProfile, RepoProfile
+from .scanner import scan_repo
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+STAGES = ("discover", "scan", "evaluate")
+
+
+def bounded_map(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    workers: int = 1,
+    mode: str = "thread",
+    max_in_flight: int | None = None,
+) -> Iterator[R]:
+    """
+    Ordered map over items. workers <= 1 runs inline; otherwise on a thread or
+    process pool with at most max_in_flight (default 2 x workers) items submitted.
+    fn must be picklable (module-level or partial) for mode="process".
+    """
+    if workers <= 1:
+        for item in items:
+            yield fn(item)
+        return
+    limit = max(1, max_in_flight or 2 * workers)
+    pool: Executor
+    if mode == "process":
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    elif mode == "thread":
+        pool = ThreadPoolExecutor(max_workers=workers)
+    else:
+        raise ValueError(f"Unknown pipeline mode {mode!r}: use 'thread' or 'process'")
+    pending: deque = deque()
+    with pool:
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= limit:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def tap(items: Iterable[T], fn: Callable[[T], Any] | None) -> Iterator[T]:
+    """Pass items through unchanged, calling fn on each (progress, exporters, dashboards)."""
+    for item in items:
+        if fn is not None:
+            fn(item)
+        yield item
+
+
+# Stages
+
+def discover(
+    base_path: Path,
+    max_depth: int = 4,
+    max_repos: int = 500,
+    shard: tuple[int, int] | None = None,
+) -> Iterator[Path]:
+    """
+    Repo roots under base_path, optionally only those in shard K of N. max_repos caps
+    each shard, so N shards together cover up to N x max_repos repos.
+    """
+    base_path = Path(base_path).resolve()
+    if not shard:
+        return iter_repos(base_path, max_depth, max_repos)
+    return islice(_select_shard(iter_repos(base_path, max_depth, None), base_path, shard), max_repos)
+
+
+def _scan_item(path: Path, ref: str | None = None) -> tuple[Path, RepoProfile] | None:
+    try:
+        return path, scan_repo(path, ref=ref)
+    except Exception:
+        return None  # unreadable repo: drop it, as the fleet loop always has
+
+
+def scan(
+    paths: Iterable[Path],
+    ref: str | None = None,
+    workers: int = 1,
+    mode: str = "process",
+    max_in_flight: int | None = None,
+) -> Iterator[tuple[Path, RepoProfile]]:
+    """(path, profile) per repo. Repos that fail to scan are skipped."""
+    for item in bounded_map(partial(_scan_item, ref=ref), paths, workers, mode, max_in_flight):
+        if item is not None:
+            yield item
+
+
+def _evaluate_item(
+    item: tuple[Path, RepoProfile], host: HostProfile, base_path: Path | None = None
+) -> dict[str, Any] | None:
+    try:
+        return repo_row(item[0], item[1], host, base_path)
+    except Exception:
+        return None
+
+
+def evaluate(
+    scanned: Iterable[tuple[Path, RepoProfile]],
+    host: HostProfile,
+    workers: int = 1,
+    mode: str = "thread",
+    max_in_flight: int | None = None,
+    base_path: Path | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Fleet summary row per scanned repo (rules, severities, score; rel_path with base_path)."""
+    for row in bounded_map(partial(_evaluate_item, host=host, base_path=base_path), scanned, workers, mode, max_in_flight):
+        if row is not None:
+            yield row
+
+
+def aggregate(rows: Iterable[dict[str, Any]], policy: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Fleet summary (violations, drift, risk clusters) from summary rows."""
+    return _summarize(list(rows), policy or {})
+
+
+def run_fleet(
+    base_path: Path,
+    host: HostProfile,
+    policy: dict[str, Any] | None = None,
+    shard: tuple[int, int] | None = None,
+    ref: str | None = None,
+    workers: int = 1,
+    mode: str = "process",
+    taps: dict[str, Callable[[Any], Any]] | None = None,
+) -> dict[str, Any]:
+    """
+    The fleet scan: discover -> scan (workers in parallel) -> evaluate -> aggregate.
+    taps maps a stage name (discover, scan, evaluate) to a callback for each item it yields.
+    """
+    policy = policy or {}
+    taps = taps or {}
+    unknown = set(taps) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown pipeline stage(s): {', '.join(sorted(unknown))}")
+    repos = tap(
+        discover(
+            base_path,
+            max_depth=int(policy.get("max_depth", 4)),
+            max_repos=int(policy.get("max_repos", 500)),
+            shard=shard,
+        ),
+        taps.get("discover"),
+    )
+    scanned = tap(scan(repos, ref=ref, workers=workers, mode=mode), taps.get("scan"))
+    rows = tap(evaluate(scanned, host, base_path=Path(base_path).resolve()), taps.get("evaluate"))
+    summary = aggregate(rows, policy)
+    if shard:
+        summary["shard"] = f"{shard[0]}/{shard[1]}"
+    return summary
@@ -3,21 +3,14 @@
 import re
 
 from ..models import HostProfile, RepoProfile
+from ..scanner.classify import classify
+from ..scanner.wheeldb import default_db
 from .base import RuleResult, Severity
 
-# Packages with unstable binary wheel availability on arm64 + Python 3.12
+# Packages with unstable binary wheel availability on arm64 + Python 3.12 are the
+# "wheels:arm64_py312_unstable" class of the package table (exact names, explicit prefixes).
 # Likely: Symbol not found, undefined symbol, or build-from-source fallback
-ARM64_PY312_UNSTABLE = {
-    "bitsandbytes",
-    "torchvision",
-    "opencv-python",
-    "opencv-contrib-python",
-    "opencv",
-    "xformers",
-    "pytorch3d",
-    "triton",
-    "onnxruntime-gpu",
-}
+ARM64_PY312_UNSTABLE = "wheels:arm64_py312_unstable"
 
 
 def _parse_python_minor(ver: str | None) -> tuple[int, int] | None:
@@ -28,52 +21,109 @@ def _parse_python_minor(ver: str | None) -> tuple[int, int] | None:
     return (int(m.group(1)), int(m.group(2))) if m else None
 
 
-def _get_repo_packages(repo: RepoProfile) -> set[str]:
-    """Extract package names from repo."""
-    packages: set[str] = set()
-    raw = repo.raw or {}
-    if "requirements" in raw:
-        for p in raw["requirements"].get("packages", []):
-            packages.add(str(p).lower().replace("_", "-"))
-    if "pyproject" in raw:
-        for p in raw["pyproject"].get("packages", []):
-            packages.add(str(p).lower().replace("_", "-"))
-    return packages
+def _unstable_packages(repo: RepoProfile) -> list[str]:
+    """Declared Python packages of the ARM64_PY312_UNSTABLE class, e.g. triton, opencv-python-headless."""
+    deps = repo.dependencies
+    names = {name for name in deps.names("python") if ARM64_PY312_UNSTABLE in classify(name)}
+    # Locked / declared only for other platforms (sys_platform == 'linux') never install on a Mac
+    return sorted(n for n in names if not all(d.excludes_os("macos") for d in deps.all(n, "python")))
+
+
+def indexed_packages(repo: RepoProfile) -> list[str]:
+    """Declared Python packages the wheel index knows about."""
+    db = default_db()
+    return [n for n in repo.dependencies.names("python") if n in db]
+
+
+def dependency_specifier(repo: RepoProfile, name: str) -> str:
+    """A pin (lockfile / ==) if any declaration has one, else the first non-empty specifier."""
+    decls = repo.dependencies.all(name, "python")
+    pinned = [d.specifier for d in decls if d.specifier.startswith("==")]
+    return pinned[0] if pinned else next((d.specifier for d in decls if d.specifier), "")
+
+
+def wheel_gaps(repo: RepoProfile, host: HostProfile) -> list[dict]:
+    """
+    Indexed packages where no version the specifier allows has a wheel for the host's
+    platform and Python, though some allowed version has wheels for the platform (so
+    pip falls back to building from source, or fails). If an older allowed release
+    still has a matching wheel, pip installs that one and there is no gap.
+    """
+    py = _parse_python_minor(host.python_version)
+    if not py:
+        return []
+    db = default_db()
+    platform = f"{host.os}-{host.arch}"
+    gaps = []
+    for name in indexed_packages(repo):
+        if all(d.excludes_os(host.os) for d in repo.dependencies.all(name, "python")):
+            continue
+        specifier = dependency_specifier(repo, name)
+        if db.installable(name, specifier, platform, py) is not None:
+            continue
+        found = db.installable(name, specifier, platform)
+        if found is not None:
+            gaps.append({"package": name, "versions": found[0], "platform": platform, "python": f"{py[0]}.{py[1]}"})
+    return gaps
 
 
 def check(repo: RepoProfile, host: HostProfile) -> RuleResult | None:
     """
-    Trigger when: macOS arm64 + Python >= 3.12 + deps that lag arm64 3.12 wheels.
+    Trigger when: macOS arm64 + Python >= 3.12 + deps that lag arm64 3.12 wheels, or the
+    wheel index shows the host's platform has wheels for a dependency but not for its Python.
     HIGH: deterministic pip install or import failure risk.
     """
-    if host.os != "macos" or host.arch != "arm64":
-        return None
     py = _parse_python_minor(host.python_version)
-    if not py or py < (3, 12):
+    if not py:
         return None
-
-    packages = _get_repo_packages(repo)
-    found = [p for p in packages if any(u in p for u in ARM64_PY312_UNSTABLE)]
-    if not found:
+    found = _unstable_packages(repo) if host.os == "macos" and host.arch == "arm64" and py >= (3, 12) else []
+    gaps = wheel_gaps(repo, host)
+    if not found and not gaps:
         return None
 
-    return RuleResult(
-        rule_id="abi_wheel_mismatch",
-        severity=Severity.HIGH,
-        message="Binary wheel availability unstable (arm64 + Python 3.12).",
-        reason=(
+    host_os_arch = "macOS arm64" if host.os == "macos" and host.arch == "arm64" else f"{host.os} {host.arch}"
+    if found:
+        message = "Binary wheel availability unstable (arm64 + Python 3.12)."
+        reason = (
             f"macOS arm64, Python 3.12+, dependency: {found[0]}. "
             "Likely to hit: Symbol not found, undefined symbol, or build-from-source fallback."
-        ),
-        host_summary=f"macOS arm64, Python {host.python_version}",
-        evidence={
-            "host_os_arch": "macOS arm64",
-            "host_python": host.python_version,
-            "problematic_packages": found[:5],
+        )
+        evidence = {
             "expected_failure": "Symbol not found, undefined symbol, or build-from-source fallback",
             "determinism": 1.0,
             "breakage_likelihood": "~90%",
             "likely_error": "pip install: No matching distribution / import: undefined symbol",
+        }
+    else:
+        g = gaps[0]
+        message = f"No {g['platform']} wheel for Python {g['python']}."
+        reason = (
+            f"{g['package']} {g['versions']} publishes {g['platform']} wheels, but none for Python {g['python']}. "
+            "pip will try to build from source or find no matching distribution."
+        )
+        # The index proves the wheel is missing; whether the install fails depends on an sdist and a toolchain
+        evidence = {
+            "expected_failure": "No matching distribution, or a build from source",
+            "determinism": 0.8,
+            "breakage_likelihood": "~60%" if host.has_compiler else "~85%",
+            "likely_error": (
+                f"pip install: No matching distribution found for {g['package']}"
+                f" / Failed building wheel for {g['package']}"
+            ),
+        }
+    found = found + [g["package"] for g in gaps if g["package"] not in found]
+    return RuleResult(
+        rule_id="abi_wheel_mismatch",
+        severity=Severity.HIGH,
+        message=message,
+        reason=reason,
+        host_summary=f"{host_os_arch}, Python {host.python_version}",
+        evidence={
+            "host_os_arch": host_os_arch,
+            "host_python": host.python_version,
+            "problematic_packages": found[:5],
+            "wheel_index": gaps[:10],
+            **evidence,
         },
         category="architecture_mismatch",
         confidence="high",
@@ -3,33 +3,20 @@
 import re
 
 from ..models import HostProfile, RepoProfile
+from ..scanner.classify import classify
+from ..scanner.wheeldb import default_db
+from .abi_wheel_mismatch import dependency_specifier, indexed_packages
 from .base import RuleResult, Severity
 
-# Packages with known x86-only or problematic wheels on Apple Silicon
-X86_ONLY_PACKAGES = {
-    "cuda-python",
-    "nvidia-cuda-runtime-cu",
-    "nvidia-cudnn-cu",
-    "nvidia-cublas-cu",
-    "nvidia-cufft-cu",
-    "nvidia-curand-cu",
-    "nvidia-cusolver-cu",
-    "nvidia-cusparse-cu",
-    "nvidia-nccl-cu",
-    "nvidia-nvtx-cu",
-    "nvidia-nvjitlink-cu",
-    "horovod",
-    "faiss-gpu",
-    "faiss-cpu",
-    "faiss",  # Many builds x86-only
-}
-
-
-def _tensorflow_version_old(raw: dict) -> bool:
+# Packages with known x86-only or problematic wheels on Apple Silicon: the "wheels:x86_only"
+# class of the package table (exact names, explicit prefixes such as nvidia-cudnn-cu)
+X86_ONLY_PACKAGES = "wheels:x86_only"
+
+
+def _tensorflow_version_old(repo: RepoProfile) -> bool:
     """True if tensorflow constraint implies < 2.11 (no native arm64 wheels)."""
-    for src in ["pyproject", "requirements"]:
-        data = raw.get(src) or {}
-        tv = str(data.get("tensorflow_version") or "")
+    for dep in repo.dependencies.all("tensorflow", "python"):
+        tv = dep.specifier
         if not tv:
             continue
         # Match <2.11, <=2.10, ==2.10.*, ~=2.10, etc.
@@ -41,17 +28,21 @@ def _tensorflow_version_old(raw: dict) -> bool:
     return False
 
 
-def _get_repo_packages(repo: RepoProfile) -> set[str]:
-    """Extract package names from repo."""
-    packages: set[str] = set()
-    raw = repo.raw or {}
-    if "requirements" in raw:
-        for p in raw["requirements"].get("packages", []):
-            packages.add(str(p).lower().replace("_", "-"))
-    if "pyproject" in raw:
-        for p in raw["pyproject"].get("packages", []):
-            packages.add(str(p).lower().replace("_", "-"))
-    return packages
+def _x86_only_packages(repo: RepoProfile) -> list[str]:
+    """
+    Declared Python packages of the X86_ONLY_PACKAGES class (faiss-cpu, nvidia-cudnn-cu12), or with
+    wheels in the wheel index but none for macOS arm64 in any version the specifier allows.
+    """
+    deps = repo.dependencies
+    names = {name for name in deps.names("python") if X86_ONLY_PACKAGES in classify(name)}
+    # Wheel index: wheels published, but none for macOS arm64 (sdist-only packages are a build issue, not x86-only)
+    db = default_db()
+    for name in indexed_packages(repo):
+        specifier = dependency_specifier(repo, name)
+        if any(mask for _, mask in db.allowed(name, specifier)) and db.installable(name, specifier, "macos-arm64") is None:
+            names.add(name)
+    # Locked / declared only for other platforms (sys_platform == 'linux') never install on a Mac
+    return sorted(n for n in names if not all(d.excludes_os("macos") for d in deps.all(n, "python")))
 
 
 def check(repo: RepoProfile, host: HostProfile) -> RuleResult | None:
@@ -62,13 +53,12 @@ def check(repo: RepoProfile, host: HostProfile) -> RuleResult | None:
     reasons = []
     evidence = {"host": "macOS arm64"}
 
-    packages = _get_repo_packages(repo)
-    found = [p for p in packages if any(x in p for x in X86_ONLY_PACKAGES)]
+    found = _x86_only_packages(repo)
     if found:
         reasons.append(f"Packages: {', '.join(found[:5])}")
         evidence["problematic_packages"] = found[:5]
 
-    if repo.uses_tensorflow and _tensorflow_version_old(repo.raw):
+    if repo.uses_tensorflow and _tensorflow_version_old(repo):
         reasons.append("tensorflow < 2.11 (no native arm64 wheels)")
         evidence["tensorflow_old"] = True
 
@@ -76,10 +66,17 @@ def check(repo: RepoProfile, host: HostProfile) -> RuleResult | None:
         reasons.append("Dockerfile uses --platform=linux/amd64")
         evidence["docker_platform"] = "amd64"
 
+    # Base-image index: image only published for other architectures (runs under emulation)
+    df = repo.dockerfile
+    amd64_image = bool(df and df.image_archs and "arm64" not in df.image_archs)
+    if amd64_image:
+        reasons.append(f"Base image {df.base_image} has no arm64 build")
+        evidence["image_archs"] = list(df.image_archs)
+
     if not reasons:
         return None
 
-    severity = Severity.HIGH if ("cuda" in " ".join(found).lower() or "faiss" in " ".join(found).lower() or repo.docker_platform_amd64) else Severity.MEDIUM
+    severity = Severity.HIGH if ("cuda" in " ".join(found).lower() or "faiss" in " ".join(found).lower() or repo.docker_platform_amd64 or amd64_image) else Severity.MEDIUM
     return RuleResult(
         rule_id="apple_silicon_wheels",
         severity=severity,
@@ -21,7 +21,7 @@ RULE_CATEGORIES = (
 )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RuleResult:
     """Output of a single rule check."""
 
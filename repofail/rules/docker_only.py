@@ -8,6 +8,8 @@ from .base import RuleResult, Severity
 
 def _has_clear_native_install(repo: RepoProfile) -> bool:
     """True if repo has obvious native install path (make, pip -e)."""
+    if repo.has_native_install is not None:
+        return repo.has_native_install
     repo_path = Path(repo.path)
     if (repo_path / "Makefile").exists() or (repo_path / "makefile").exists():
         return True
@@ -23,15 +25,24 @@ def check(repo: RepoProfile, host: HostProfile) -> RuleResult | None:
     if _has_clear_native_install(repo):
         return None
 
+    reason = (
+        "Dockerfile and devcontainer present, but no obvious native install path "
+        "(e.g. Makefile, root pyproject.toml). Documentation may assume Docker/Dev Container."
+    )
+    evidence = {"has_dockerfile": True, "has_devcontainer": True}
+    df = repo.dockerfile
+    if df and df.base_image:
+        evidence["base_image"] = df.base_image
+        if df.image_archs:
+            evidence["image_archs"] = list(df.image_archs)
+            if host.arch not in df.image_archs:
+                reason += f" Base image {df.base_image} has no {host.arch} build; the container runs under emulation."
     return RuleResult(
         rule_id="docker_only_dev",
         severity=Severity.HIGH,
         message="Repo appears container-first. Running natively may fail.",
-        reason=(
-            "Dockerfile and devcontainer present, but no obvious native install path "
-            "(e.g. Makefile, root pyproject.toml). Documentation may assume Docker/Dev Container."
-        ),
+        reason=reason,
         host_summary=f"{host.os} {host.arch}",
-        evidence={"has_dockerfile": True, "has_devcontainer": True},
+        evidence=evidence,
         category="runtime_environment",
     )
@@ -92,9 +92,7 @@ def check_docker_python_mismatch(repo: RepoProfile, host: HostProfile) -> RuleRe
     """Docker present but repo Python constraint may differ from host."""
     if not repo.has_dockerfile:
         return None
-    docker_py = None
-    if repo.raw.get("dockerfile"):
-        docker_py = repo.raw["dockerfile"].get("python_version")
+    docker_py = repo.dockerfile.python_version if repo.dockerfile else None
     repo_py = repo.python_version
     host_ver = _host_minor(host)
     if not host_ver:
@@ -4,15 +4,6 @@ from ..models import HostProfile, RepoProfile
 from .base import RuleResult, Severity
 
 
-def _get_package_versions(repo: RepoProfile) -> dict[str, str]:
-    """Merge version constraints from requirements and pyproject."""
-    versions: dict[str, str] = {}
-    for source in [repo.raw.get("requirements"), repo.raw.get("pyproject")]:
-        if source:
-            versions.update(source.get("package_versions", {}))
-    return versions
-
-
 def _torch_max_version(constraint: str) -> float | None:
     """
     Heuristic: extract max torch version allowed by constraint.
@@ -65,9 +56,8 @@ def check_torchao_incompatible(repo: RepoProfile, host: HostProfile) -> RuleResu
     if not repo.uses_torch:
         return None
 
-    versions = _get_package_versions(repo)
-    torch_constraint = versions.get("torch")
-    torchao_constraint = versions.get("torchao")
+    torch_constraint = repo.dependencies.specifier("torch")
+    torchao_constraint = repo.dependencies.specifier("torchao")
 
     if not torch_constraint and not torchao_constraint:
         return None  # Can't infer
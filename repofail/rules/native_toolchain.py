@@ -6,7 +6,7 @@ from .base import RuleResult, Severity
 
 def check(repo: RepoProfile, host: HostProfile) -> RuleResult | None:
     """If repo has native modules and host missing compiler/Rust, flag HIGH for Cargo/maturin, MEDIUM otherwise."""
-    native_backends = repo.raw.get("native_build_backends", [])
+    native_backends = repo.native_build_backends
     has_native = (
         bool(repo.node_native_modules)
         or bool(repo.rust_system_libs)
@@ -18,7 +18,9 @@ def check(repo: RepoProfile, host: HostProfile) -> RuleResult | None:
 
     # Cargo/Rust/maturin need Rust; node/setup.py need compiler
     needs_rust = repo.has_cargo_toml or "maturin" in native_backends or "setuptools-rust" in native_backends
-    if needs_rust and host.rust_version:
+    # -sys crates also build or link C code (cc / pkg-config), so Rust alone is not enough
+    needs_cc = bool(repo.rust_system_libs)
+    if needs_rust and host.rust_version and (host.has_compiler or not needs_cc):
         return None
     if not needs_rust and host.has_compiler:
         return None
@@ -29,6 +31,8 @@ def check(repo: RepoProfile, host: HostProfile) -> RuleResult | None:
         reasons.append(f"Node native: {', '.join(repo.node_native_modules[:3])}")
     if repo.has_cargo_toml or repo.rust_system_libs:
         reasons.append("Cargo.toml / Rust")
+    if needs_cc and not host.has_compiler:
+        reasons.append(f"Rust system crates need a C toolchain: {', '.join(repo.rust_system_libs[:3])}")
     if native_backends:
         reasons.append(f"Build backends: {', '.join(native_backends)}")
     if repo.has_setup_py:
@@ -36,6 +40,7 @@ def check(repo: RepoProfile, host: HostProfile) -> RuleResult | None:
 
     evidence = {
         "has_cargo": repo.has_cargo_toml,
+        **({"rust_system_crates": repo.rust_system_libs[:10]} if repo.rust_system_libs else {}),
         "native_build_backends": native_backends,
         "host_has_compiler": host.has_compiler,
         "host_rust": bool(host.rust_version),
@@ -47,30 +47,43 @@ def _node_in_range(version: tuple[int, int], spec: str) -> bool:
     return True
 
 
+def engine_specs(repo: RepoProfile) -> tuple[tuple[str, str], ...]:
+    """(package path, engines.node) for the repo and every workspace member that sets one."""
+    specs = [(".", repo.node_engine_spec)] if repo.node_engine_spec else []
+    specs += [(m.path, m.version_req) for m in repo.workspace_members if m.ecosystem == "node" and m.version_req]
+    return tuple(dict.fromkeys(specs))
+
+
 def check(repo: RepoProfile, host: HostProfile) -> RuleResult | None:
-    """If package.json engines.node is set and host Node is outside range, flag HIGH."""
-    if not repo.node_engine_spec or not host.node_version:
+    """If package.json engines.node (root or any workspace package) excludes host Node, flag HIGH."""
+    specs = engine_specs(repo)
+    if not specs or not host.node_version:
         return None
 
     host_ver = _parse_node_version(host.node_version)
     if not host_ver:
         return None
 
-    if _node_in_range(host_ver, repo.node_engine_spec):
+    violated = [(path, spec) for path, spec in specs if not _node_in_range(host_ver, spec)]
+    if not violated:
         return None
 
+    spec = violated[0][1]
+    packages = [path for path, _ in violated if path != "."]
+    where = "" if violated[0][0] == "." else f" ({', '.join(packages[:3])}{', ...' if len(packages) > 3 else ''})"
     return RuleResult(
         rule_id="node_engine_mismatch",
         severity=Severity.HIGH,
         message="Node engine constraint violated.",
         reason=(
-            f"engines.node: {repo.node_engine_spec}, host: {host.node_version}. "
+            f"engines.node: {spec}{where}, host: {host.node_version}. "
             "npm/yarn may refuse to install or runtime may fail."
         ),
         host_summary=f"Node {host.node_version}",
         evidence={
-            "engines_node": repo.node_engine_spec,
+            "engines_node": spec,
             "host_node": host.node_version,
+            **({"workspace_packages": packages} if packages else {}),
             "determinism": 1.0,
             "breakage_likelihood": "~100%",
             "likely_error": "npm ERR! code EBADENGINE / runtime version mismatch",
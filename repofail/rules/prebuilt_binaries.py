@@ -0,0 +1,103 @@
+"""Rule: prebuilt binaries / vendored wheels built for another OS, architecture or Python."""
+
+import re
+
+from ..models import BinaryArtifact, HostProfile, RepoProfile
+from .base import RuleResult, Severity
+
+
+def _host_python_tag(host: HostProfile) -> tuple[int, int] | None:
+    m = re.match(r"(\d+)\.(\d+)", host.python_version or "")
+    return (int(m.group(1)), int(m.group(2))) if m else None
+
+
+def _tag_version(tag: str) -> tuple[int, int] | None:
+    """'cp311' -> (3, 11)."""
+    m = re.match(r"cp(\d)(\d+)$", tag)
+    return (int(m.group(1)), int(m.group(2))) if m else None
+
+
+def _python_ok(artifact: BinaryArtifact, host: HostProfile) -> bool:
+    host_ver = _host_python_tag(host)
+    if artifact.format != "wheel" or host_ver is None:
+        return True
+    tag = _tag_version(artifact.python.split(".")[0])
+    if tag is None:
+        return True
+    if artifact.abi == "abi3":
+        return host_ver >= tag
+    return host_ver == tag if artifact.abi.startswith("cp") else True
+
+
+def _mismatch(artifact: BinaryArtifact, host: HostProfile) -> str | None:
+    """Why artifact can't load on host ("os", "arch", "python"), or None if it can."""
+    if artifact.os != "any" and host.os not in artifact.os.split("/"):
+        return "os"
+    if artifact.os != "any" and host.arch not in artifact.archs:
+        return "arch"
+    if not _python_ok(artifact, host):
+        return "python"
+    return None
+
+
+def _likely_error(artifact: BinaryArtifact, mismatch: str, host: HostProfile) -> str:
+    """The loader / installer error the host would print for artifact."""
+    name = artifact.path.rpartition("/")[2]
+    if artifact.format == "wheel":
+        return f"ERROR: {name} is not a supported wheel on this platform."
+    if host.os == "windows":
+        return f"OSError: [WinError 193] %1 is not a valid Win32 application ({name})"
+    if mismatch == "os":
+        kind = "invalid ELF header" if host.os == "linux" else "not a mach-o file"
+        return f"OSError: {name}: {kind} (built for {artifact.os})"
+    have = "/".join(artifact.archs) or "unknown"
+    if host.os == "macos":
+        return f"OSError: {name}: incompatible architecture (have '{have}', need '{host.arch}')"
+    return f"OSError: {name}: wrong ELF machine (built for {have}, host is {host.arch})"
+
+
+def check(repo: RepoProfile, host: HostProfile) -> RuleResult | None:
+    """
+    Group artifacts by library / distribution name; a group fails when none of its
+    builds fits the host. HIGH when a build for the host OS exists but has the wrong
+    arch or Python; MEDIUM when every build targets another OS.
+    """
+    if not repo.binary_artifacts:
+        return None
+    groups: dict[str, list[BinaryArtifact]] = {}
+    for a in repo.binary_artifacts:
+        groups.setdefault(a.name, []).append(a)
+
+    failing: list[tuple[BinaryArtifact, str]] = []
+    for artifacts in groups.values():
+        reasons = [(a, _mismatch(a, host)) for a in artifacts]
+        if any(r is None for _, r in reasons):
+            continue
+        # Prefer the build closest to the host: same OS beats other OS
+        best = min(reasons, key=lambda ar: ar[1] == "os")
+        failing.append(best)
+    if not failing:
+        return None
+
+    severe = [(a, r) for a, r in failing if r != "os"]
+    severity = Severity.HIGH if severe else Severity.MEDIUM
+    shown = (severe or failing)[:5]
+    details = []
+    for a, r in shown:
+        target = f"{a.os} {'/'.join(a.archs)}".strip() if r != "python" else f"{a.python}-{a.abi}"
+        details.append(f"{a.path} ({target})")
+    host_summary = f"{host.os} {host.arch}" + (f", Python {host.python_version}" if host.python_version else "")
+    return RuleResult(
+        rule_id="prebuilt_binary_mismatch",
+        severity=severity,
+        message="Prebuilt binaries in the repo were built for a different platform.",
+        reason=f"No host-compatible build of: {', '.join(details)}. Host: {host_summary}.",
+        host_summary=host_summary,
+        evidence={
+            "binaries": [{"path": a.path, "os": a.os, "archs": list(a.archs), "mismatch": r} for a, r in failing[:20]],
+            "determinism": 1.0,
+            "likely_error": _likely_error(*shown[0], host),
+        },
+        category="architecture_mismatch",
+        confidence="high",
+    )
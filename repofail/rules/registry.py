@@ -151,6 +151,12 @@ RULE_INFO = {
         "when": "Cargo.toml has [target.'cfg(windows)'] but host is macOS/Linux, etc.",
         "fix": "Check if cross-compilation is needed or if there are host-compatible targets.",
     },
+    "prebuilt_binary_mismatch": {
+        "description": "Repo ships prebuilt libraries or vendored wheels built for another OS, CPU or Python.",
+        "severity": "MEDIUM/HIGH",
+        "when": ".so/.dylib/.dll headers or wheel tags target a platform other than host.os / host.arch",
+        "fix": "Rebuild the binary for this platform, or fetch the matching wheel / release asset.",
+    },
     "port_collision_risk": {
         "description": "Required service port already in use on host.",
         "severity": "HIGH",
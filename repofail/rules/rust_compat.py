@@ -15,26 +15,41 @@ def _parse_rust_ver(s: str | None) -> tuple[int, int] | None:
     return None
 
 
+def rust_version_reqs(repo: RepoProfile) -> tuple[tuple[str, str], ...]:
+    """(crate path, rust-version) for the repo and every Cargo workspace member that sets one."""
+    reqs = [(".", repo.rust_version_req)] if repo.rust_version_req else []
+    reqs += [(m.path, m.version_req) for m in repo.workspace_members if m.ecosystem == "rust" and m.version_req]
+    return tuple(dict.fromkeys(reqs))
+
+
 def check_rust_version(repo: RepoProfile, host: HostProfile) -> RuleResult | None:
-    """Check if host rustc is older than Cargo.toml rust-version."""
-    if not repo.rust_version_req or not host.rust_version:
+    """Check if host rustc is older than any Cargo.toml rust-version (root or workspace member)."""
+    reqs = rust_version_reqs(repo)
+    if not reqs or not host.rust_version:
         return None
-    req = _parse_rust_ver(repo.rust_version_req)
     host_ver = _parse_rust_ver(host.rust_version)
-    if not req or not host_ver:
+    if not host_ver:
         return None
-    if host_ver < req:
-        return RuleResult(
-            rule_id="rust_version_mismatch",
-            severity=Severity.HIGH,
-            message="Rust toolchain too old for this crate.",
-            reason=f"Cargo.toml requires rust-version {repo.rust_version_req}, host has {host.rust_version}.",
-            host_summary=f"rustc {host.rust_version}",
-            evidence={"rust_version_req": repo.rust_version_req, "host_rust": host.rust_version},
-            category="spec_violation",
-            confidence="high",
-        )
-    return None
+    too_new = [(path, req) for path, req in reqs if (_parse_rust_ver(req) or (0, 0)) > host_ver]
+    if not too_new:
+        return None
+    path, req = max(too_new, key=lambda pr: _parse_rust_ver(pr[1]))
+    crates = [p for p, _ in too_new if p != "."]
+    where = "" if path == "." else f" ({path})"
+    return RuleResult(
+        rule_id="rust_version_mismatch",
+        severity=Severity.HIGH,
+        message="Rust toolchain too old for this crate.",
+        reason=f"Cargo.toml requires rust-version {req}{where}, host has {host.rust_version}.",
+        host_summary=f"rustc {host.rust_version}",
+        evidence={
+            "rust_version_req": req,
+            "host_rust": host.rust_version,
+            **({"workspace_crates": crates} if crates else {}),
+        },
+        category="spec_violation",
+        confidence="high",
+    )
 
 
 def check_rust_target_platform(repo: RepoProfile, host: HostProfile) -> RuleResult | None:
@@ -28,24 +28,24 @@ def check(repo: RepoProfile, host: HostProfile) -> RuleResult | None:
             by_source.setdefault("pyproject", set()).add(v)
             sources.append(f"pyproject: {repo.python_version}")
 
-    raw = repo.raw or {}
-    docker = raw.get("dockerfile") or {}
-    if isinstance(docker, dict):
-        dp = docker.get("python_version")
+    if repo.dockerfile:
+        dp = repo.dockerfile.python_version
         if dp:
             v = _extract_minor(dp)
             if v:
                 by_source.setdefault("docker", set()).add(v)
-                sources.append(f"Dockerfile: {dp}")
+                if repo.dockerfile.python_from_image:
+                    sources.append(f"Dockerfile: {dp} (shipped by {repo.dockerfile.base_image})")
+                else:
+                    sources.append(f"Dockerfile: {dp}")
 
     ci_versions: set[str] = set()
-    for wf_name, wf_data in (raw.get("workflows") or {}).items():
-        if isinstance(wf_data, dict):
-            for pv in wf_data.get("python_versions") or []:
-                v = _extract_minor(str(pv))
-                if v:
-                    ci_versions.add(v)
-                    sources.append(f"CI ({wf_name}): {pv}")
+    for wf_name, wf in repo.workflows.items():
+        for pv in wf.python_versions:
+            v = _extract_minor(str(pv))
+            if v:
+                ci_versions.add(v)
+                sources.append(f"CI ({wf_name}): {pv}")
     if ci_versions:
         by_source["ci"] = ci_versions
 
@@ -27,6 +27,8 @@ def check(repo: RepoProfile, host: HostProfile) -> RuleResult | None:
     if repo.cuda_usages:
         for u in repo.cuda_usages[:8]:
             f, ln, kind = u.get("file", "?"), u.get("line", 0), u.get("kind", "cuda")
+            if u.get("cell"):
+                f = f"{f} cell {u['cell']}"
             repo_cuda_usage.append(f"Found {kind} in {f}:{ln}" if ln else f"{f}: {kind}")
     elif repo.cuda_files:
         for f in repo.cuda_files[:5]:
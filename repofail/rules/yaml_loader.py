@@ -67,7 +67,7 @@ def load_yaml_rules(repo_path: Path) -> list[dict]:
 
 def run_yaml_rules(repo: RepoProfile, host: HostProfile, repo_path: Path) -> list[RuleResult]:
     """Run YAML rules from repo, return any that fire."""
-    rules = load_yaml_rules(Path(repo.path))
+    rules = repo.yaml_rules if repo.yaml_rules is not None else load_yaml_rules(Path(repo.path))
     results = []
     for r in rules:
         if not isinstance(r, dict) or "id" not in r or "when" not in r:
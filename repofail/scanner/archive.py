@@ -0,0 +1,156 @@
+"""Source archives (tar, tar.gz/bz2/xz, zip, sdists) as virtual trees - streamed, never extracted.
+
+Members are visited once in archive order. Only files the scanner reads are kept in
+memory (configs by the _discover_configs basename rules, lockfiles, workflows, repofail
+config, .py / .ipynb / .go sources, C/C++/CUDA sources, small .txt / .in files that may be -r / -c include targets);
+Python sources and notebooks are capped per file and, like the tree walk, in number.
+Every other member is recorded as present without its content, so existence checks
+(lock files, Makefile, devcontainer) still see it. Native libraries keep only their
+leading header bytes, which is all the prebuilt-binary scanner reads.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import tarfile
+import zipfile
+from pathlib import Path, PurePosixPath
+
+from .binaries import HEADER_BYTES, is_binary_name
+from .lockfiles import NODE_LOCKFILES, PYTHON_LOCKFILES
+from .native_scan import CMAKE_NAMES, CMAKE_SUFFIXES, CUDA_SUFFIXES, CXX_SUFFIXES, MAX_FILE_BYTES
+from .repo import CONFIG_PATTERNS, SKIP_PARTS
+from .vfs import FileSource, VirtualPath, VirtualTree
+from .walk import MAX_FILES
+
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+ZIP_SUFFIXES = (".zip",)
+ARCHIVE_SUFFIXES = TAR_SUFFIXES + ZIP_SUFFIXES
+
+# Files read by path rather than by discovery
+_ROOT_FILES = {".repofail.yaml", "repofail-rules.yaml", ".repofail/rules.yaml"}
+_GO_SKIP = {"vendor", "testdata", ".git", "node_modules"}
+# Any small .txt / .in may be named by a requirements include (-r base.txt, -c pins.txt)
+MAX_TEXT_BYTES = 256 * 1024
+# Python sources; notebooks carry their outputs inline, so they get more room
+MAX_SOURCE_BYTES = MAX_FILE_BYTES
+MAX_NOTEBOOK_BYTES = 8 * 1024 * 1024
+_SOURCE_SUFFIXES = (".py", ".ipynb")
+
+
+def is_archive(path: Path) -> bool:
+    """True for a regular file with a supported archive suffix."""
+    return path.is_file() and path.name.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def archive_stem(name: str) -> str:
+    """'pkg-1.0.tar.gz' -> 'pkg-1.0'."""
+    lower = name.lower()
+    for suffix in ARCHIVE_SUFFIXES:
+        if lower.endswith(suffix):
+            return name[: -len(suffix)]
+    return name
+
+
+def _wanted(rel: str, size: int = 0) -> bool:
+    """Whether the scanner will read this member's content (rel has no top-level prefix)."""
+    parts = rel.split("/")
+    base = parts[-1]
+    if rel in _ROOT_FILES:
+        return True
+    if len(parts) == 3 and parts[0] == ".github" and parts[1] == "workflows":
+        return base.endswith((".yml", ".yaml"))
+    if base.endswith(".go"):
+        return not any(p in _GO_SKIP for p in parts)
+    if any(p in SKIP_PARTS for p in parts[:-1]):
+        return False
+    if base.endswith(".py"):
+        return size <= MAX_SOURCE_BYTES
+    if base.endswith(".ipynb"):
+        return size <= MAX_NOTEBOOK_BYTES
+    if base in NODE_LOCKFILES or base in PYTHON_LOCKFILES:
+        return True
+    if base in ("pnpm-workspace.yaml", "Cargo.lock"):
+        return True
+    if base.endswith(CUDA_SUFFIXES + CMAKE_SUFFIXES) or base in CMAKE_NAMES:
+        return True
+    if base.endswith(CXX_SUFFIXES) and size <= MAX_FILE_BYTES:
+        return True
+    if base.endswith((".txt", ".in")) and size <= MAX_TEXT_BYTES:
+        return True  # Possible -r / -c include targets
+    return any(fnmatch.fnmatchcase(base, pattern) for pattern, _ in CONFIG_PATTERNS)
+
+
+def _member_path(name: str) -> str | None:
+    """Normalized relative POSIX path, or None for unsafe / empty names."""
+    parts = [p for p in PurePosixPath(name.replace("\\", "/")).parts if p not in ("", ".", "/")]
+    if not parts or ".." in parts:
+        return None
+    return "/".join(parts)
+
+
+def _common_prefix(paths: list[str]) -> str | None:
+    """The single top-level directory shared by every member (sdist layout), if any."""
+    top = None
+    for rel in paths:
+        head, sep, _ = rel.partition("/")
+        if not sep or (top is not None and head != top):
+            return None
+        top = head
+    return top
+
+
+def _iter_tar(path: Path):
+    # Stream mode: one sequential pass, decompressing as we go
+    with tarfile.open(path, "r|*") as tf:
+        for member in tf:
+            if not member.isfile():
+                continue
+            rel = _member_path(member.name)
+            if rel is None:
+                continue
+            yield rel, member.size, (lambda n=-1, m=member: tf.extractfile(m).read(n))
+
+
+def _iter_zip(path: Path):
+    with zipfile.ZipFile(path) as zf:
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+            rel = _member_path(info.filename)
+            if rel is None:
+                continue
+            yield rel, info.file_size, (lambda n=-1, i=info: _read_zip(zf, i, n))
+
+
+def _read_zip(zf: zipfile.ZipFile, info: zipfile.ZipInfo, n: int) -> bytes:
+    with zf.open(info) as f:
+        return f.read(n)
+
+
+def open_archive(path: Path) -> VirtualPath:
+    """Virtual tree of an archive. A single shared top-level directory is treated as the root."""
+    lower = path.name.lower()
+    members = _iter_zip(path) if lower.endswith(ZIP_SUFFIXES) else _iter_tar(path)
+    entries: dict[str, FileSource] = {}
+    sources = 0
+    for rel, size, read in members:
+        # The prefix isn't known until the end, so test both with and without it
+        _, sep, rest = rel.partition("/")
+        keep = _wanted(rel, size) or (sep and _wanted(rest, size))
+        if keep and rel.endswith(_SOURCE_SUFFIXES):
+            sources += 1
+            keep = sources <= MAX_FILES
+        if keep:
+            entries[rel] = read()
+        elif is_binary_name(rel.rsplit("/", 1)[-1]):
+            entries[rel] = read(HEADER_BYTES)
+        else:
+            entries[rel] = None
+    name = archive_stem(path.name)
+    top = _common_prefix(list(entries))
+    if top is not None:
+        cut = len(top) + 1
+        entries = {rel[cut:]: data for rel, data in entries.items()}
+        name = top
+    return VirtualTree(str(path), entries, name=name).root()
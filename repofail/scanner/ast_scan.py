@@ -4,6 +4,11 @@ import ast
 from pathlib import Path
 from typing import Any
 
+from .memo import PARSE_MEMO, digest
+from .notebook import read_code_cells, strip_magics
+
+MAX_NOTEBOOKS = 50
+
 
 def _is_torch_cuda_import(node: ast.ImportFrom) -> bool:
     """Check if this is 'from torch import cuda' or 'from torch.cuda import ...'."""
@@ -155,30 +160,82 @@ def scan_python_file(path: Path, repo_path: Path) -> dict[str, Any]:
         "cuda_files": [],
         "cuda_usages": [],
     }
-    try:
-        tree = ast.parse(path.read_text(errors="replace"))
-    except SyntaxError:
+    data = path.read_bytes()
+    found = PARSE_MEMO.get("python_ast", digest(data), lambda: _analyze_source(data.decode("utf-8", "replace")))
+    if found is None:
         return result
-
-    visitor = ImportVisitor()
-    visitor.visit(tree)
-    result["uses_torch"] = visitor.uses_torch
-    result["uses_tensorflow"] = visitor.uses_tensorflow
-    result["requires_cuda"] = visitor.requires_cuda
-    result["cuda_optional"] = _has_cuda_conditional(tree)
-    if visitor.requires_cuda:
+    result["uses_torch"] = found["uses_torch"]
+    result["uses_tensorflow"] = found["uses_tensorflow"]
+    result["requires_cuda"] = found["requires_cuda"]
+    result["cuda_optional"] = found["cuda_optional"]
+    if found["requires_cuda"]:
         try:
             rel = str(path.relative_to(repo_path))
         except ValueError:
             rel = path.name
         result["cuda_files"] = [rel]
-        for ln, kind in visitor.cuda_usages[:10]:  # cap for brevity
+        for ln, kind in found["cuda_usages"]:
             result["cuda_usages"].append({"file": rel, "line": ln, "kind": kind})
     return result
 
 
-def scan_python_tree(repo_path: Path, max_files: int = 100) -> dict[str, Any]:
-    """Scan Python files in repo, aggregating results."""
+def scan_notebook_file(path: Path, repo_path: Path) -> dict[str, Any]:
+    """Scan the code cells of one .ipynb file; cuda_usages carry the cell number and its line."""
+    result: dict[str, Any] = {
+        "uses_torch": False,
+        "uses_tensorflow": False,
+        "requires_cuda": False,
+        "cuda_optional": False,
+        "cuda_files": [],
+        "cuda_usages": [],
+    }
+    try:
+        rel = str(path.relative_to(repo_path))
+    except ValueError:
+        rel = path.name
+    for cell_no, source in read_code_cells(path):
+        code = strip_magics(source)
+        if code is None:
+            continue
+        found = PARSE_MEMO.get("python_ast", digest(code.encode()), lambda: _analyze_source(code))
+        if found is None:
+            continue
+        result["uses_torch"] = result["uses_torch"] or found["uses_torch"]
+        result["uses_tensorflow"] = result["uses_tensorflow"] or found["uses_tensorflow"]
+        result["cuda_optional"] = result["cuda_optional"] or found["cuda_optional"]
+        if found["requires_cuda"]:
+            result["requires_cuda"] = True
+            result["cuda_files"] = [rel]
+            for ln, kind in found["cuda_usages"]:
+                result["cuda_usages"].append({"file": rel, "cell": cell_no, "line": ln, "kind": kind})
+    return result
+
+
+def _analyze_source(source: str) -> dict[str, Any] | None:
+    """Path-independent findings for one source file (memoized by content), or None if it doesn't parse."""
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return None
+    visitor = ImportVisitor()
+    visitor.visit(tree)
+    return {
+        "uses_torch": visitor.uses_torch,
+        "uses_tensorflow": visitor.uses_tensorflow,
+        "requires_cuda": visitor.requires_cuda,
+        "cuda_optional": _has_cuda_conditional(tree),
+        "cuda_usages": tuple(visitor.cuda_usages[:10]),  # cap for brevity
+    }
+
+
+def _ancestors(path: Path, repo_path: Path) -> list[str]:
+    """Repo-relative POSIX paths of the directories containing path ('a', 'a/b', ...)."""
+    parts = path.relative_to(repo_path).parts[:-1]
+    return ["/".join(parts[: i + 1]) for i in range(len(parts))]
+
+
+def scan_python_tree(repo_path: Path, max_files: int = 100, exclude: tuple[str, ...] = ()) -> dict[str, Any]:
+    """Scan Python files and notebooks in repo, aggregating results. exclude: repo-relative subtrees to skip."""
     result: dict[str, Any] = {
         "uses_torch": False,
         "uses_tensorflow": False,
@@ -188,20 +245,40 @@ def scan_python_tree(repo_path: Path, max_files: int = 100) -> dict[str, Any]:
         "cuda_usages": [],
     }
     skip_dirs = {".git", "__pycache__", ".venv", "venv", "node_modules", ".tox", "build", "dist", "eggs", "tests"}
+
+    def merge(file_result: dict[str, Any]) -> None:
+        result["uses_torch"] = result["uses_torch"] or file_result["uses_torch"]
+        result["uses_tensorflow"] = result["uses_tensorflow"] or file_result["uses_tensorflow"]
+        result["requires_cuda"] = result["requires_cuda"] or file_result["requires_cuda"]
+        result["cuda_optional"] = result["cuda_optional"] or file_result.get("cuda_optional", False)
+        result["cuda_files"].extend(file_result.get("cuda_files", []))
+        result["cuda_usages"].extend(file_result.get("cuda_usages", []))
+
+    def skipped(path: Path) -> bool:
+        if any(part in path.parts for part in skip_dirs):
+            return True
+        return bool(exclude) and any(d in exclude for d in _ancestors(path, repo_path))
+
     count = 0
     for py in repo_path.rglob("*.py"):
         if count >= max_files:
             break
-        if any(part in py.parts for part in skip_dirs):
+        if skipped(py):
+            continue
+        try:
+            merge(scan_python_file(py, repo_path))
+            count += 1
+        except Exception:
+            pass
+
+    count = 0
+    for nb in repo_path.rglob("*.ipynb"):
+        if count >= MAX_NOTEBOOKS:
+            break
+        if ".ipynb_checkpoints" in nb.parts or skipped(nb):
             continue
         try:
-            file_result = scan_python_file(py, repo_path)
-            result["uses_torch"] = result["uses_torch"] or file_result["uses_torch"]
-            result["uses_tensorflow"] = result["uses_tensorflow"] or file_result["uses_tensorflow"]
-            result["requires_cuda"] = result["requires_cuda"] or file_result["requires_cuda"]
-            result["cuda_optional"] = result["cuda_optional"] or file_result.get("cuda_optional", False)
-            result["cuda_files"].extend(file_result.get("cuda_files", []))
-            result["cuda_usages"].extend(file_result.get("cuda_usages", []))
+            merge(scan_notebook_file(nb, repo_path))
             count += 1
         except Exception:
             pass
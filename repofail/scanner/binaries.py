@@ -0,0 +1,160 @@
+"""Prebuilt binary scanner - architecture and OS of shipped .so/.dylib/.dll and wheels.
+
+Each binary is memory-mapped and only its object-file header is read (ELF e_machine,
+Mach-O cputype / fat-arch table, PE COFF machine), so a multi-hundred-megabyte library
+costs a page or two. Vendored wheels are classified by their filename tags alone,
+without opening the zip. Files are read on a small thread pool.
+"""
+
+from __future__ import annotations
+
+import mmap
+import re
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from ..models import BinaryArtifact
+from .walk import iter_source_files
+
+WORKERS = 8
+MAX_BINARIES = 2000
+HEADER_BYTES = 4096  # enough for every header read_binary_header parses
+BINARY_NAME = re.compile(r"\.(?:so(?:\.\d+)*|dylib|dll|pyd|node)$")  # versioned sonames: libfoo.so.1.2
+WHEEL_SUFFIX = ".whl"
+# Vendored wheels and prebuilt libraries usually live under vendor/ or third_party/ - don't prune those.
+# Test fixtures are deliberately foreign builds.
+PRUNE_DIRS = {".git", "node_modules", "__pycache__", ".venv", "venv", ".tox", "target", "tests", "testdata", "fixtures"}
+
+
+def is_binary_name(name: str) -> bool:
+    """Whether a file name looks like a native library / extension module."""
+    return BINARY_NAME.search(name) is not None
+
+_ELF_MACHINES = {3: "i386", 40: "armv7", 62: "x86_64", 183: "arm64", 243: "riscv64", 21: "ppc64", 22: "s390x"}
+_ELF_OSABI = {2: "netbsd", 6: "solaris", 9: "freebsd", 12: "openbsd"}  # anything else (SYSV, GNU) is taken as Linux
+_MACHO_CPUS = {7: "i386", 0x01000007: "x86_64", 12: "armv7", 0x0100000C: "arm64", 18: "ppc"}
+_PE_MACHINES = {0x14C: "i386", 0x8664: "x86_64", 0xAA64: "arm64", 0x1C4: "armv7"}
+
+# Wheel platform tag suffix -> archs, and prefix -> os; first match wins
+_WHEEL_ARCHS = {
+    "x86_64": ("x86_64",), "amd64": ("x86_64",), "aarch64": ("arm64",), "arm64": ("arm64",),
+    "i686": ("i386",), "win32": ("i386",), "armv7l": ("armv7",), "ppc64le": ("ppc64",), "s390x": ("s390x",),
+    "universal2": ("x86_64", "arm64"), "intel": ("i386", "x86_64"), "universal": ("i386", "x86_64"),
+}
+_WHEEL_OS = (("manylinux", "linux"), ("musllinux", "linux"), ("linux", "linux"), ("macosx", "macos"), ("win", "windows"))
+_WHEEL_NAME = re.compile(r"^(?P<name>[^-]+)-[^-]+(?:-\d[^-]*)?-(?P<py>[^-]+)-(?P<abi>[^-]+)-(?P<plat>[^-]+)\.whl$")
+
+
+def read_binary_header(buf: Any) -> tuple[str, str, tuple[str, ...]] | None:
+    """(format, os, archs) from the leading bytes of an ELF, Mach-O or PE file; None if unrecognized."""
+    if len(buf) < 64:
+        return None
+    magic = bytes(buf[:4])
+    if magic == b"\x7fELF":
+        endian = "<" if buf[5] == 1 else ">"
+        (machine,) = struct.unpack_from(endian + "H", buf, 18)
+        return "elf", _ELF_OSABI.get(buf[7], "linux"), (_ELF_MACHINES.get(machine, f"elf-{machine}"),)
+    if magic in (b"\xce\xfa\xed\xfe", b"\xcf\xfa\xed\xfe"):  # thin Mach-O, little-endian
+        (cpu,) = struct.unpack_from("<I", buf, 4)
+        return "macho", "macos", (_MACHO_CPUS.get(cpu, f"macho-{cpu}"),)
+    if magic in (b"\xca\xfe\xba\xbe", b"\xca\xfe\xba\xbf"):  # fat (universal) Mach-O, big-endian table
+        (nfat,) = struct.unpack_from(">I", buf, 4)
+        if not 0 < nfat < 20:  # Java class files share the magic (their "count" is the version, >= 45)
+            return None
+        entry = 20 if magic[3] == 0xBE else 32
+        if len(buf) < 8 + nfat * entry:
+            return None
+        cpus = [struct.unpack_from(">I", buf, 8 + i * entry)[0] for i in range(nfat)]
+        return "macho", "macos", tuple(dict.fromkeys(_MACHO_CPUS.get(c, f"macho-{c}") for c in cpus))
+    if magic[:2] == b"MZ":
+        (pe_offset,) = struct.unpack_from("<I", buf, 0x3C)
+        if pe_offset + 6 > len(buf) or bytes(buf[pe_offset : pe_offset + 4]) != b"PE\0\0":
+            return None
+        (machine,) = struct.unpack_from("<H", buf, pe_offset + 4)
+        return "pe", "windows", (_PE_MACHINES.get(machine, f"pe-{machine:#x}"),)
+    return None
+
+
+def wheel_tags(filename: str) -> dict[str, Any] | None:
+    """Distribution name, python/abi tags, os and archs from a wheel filename (compressed tag sets allowed)."""
+    m = _WHEEL_NAME.match(filename)
+    if not m:
+        return None
+    oses: list[str] = []
+    archs: list[str] = []
+    for plat in m.group("plat").split("."):
+        if plat == "any":
+            oses.append("any")
+            continue
+        os_name = next((os for prefix, os in _WHEEL_OS if plat.startswith(prefix)), "unknown")
+        oses.append(os_name)
+        arch = next((a for suffix, a in _WHEEL_ARCHS.items() if plat.endswith(suffix)), (plat,))
+        archs.extend(arch)
+    return {
+        "name": m.group("name").lower().replace("_", "-"),
+        "python": m.group("py"),
+        "abi": m.group("abi"),
+        "os": "any" if "any" in oses else "/".join(dict.fromkeys(oses)),
+        "archs": tuple(dict.fromkeys(archs)),
+    }
+
+
+def _scan_binary(job: tuple[Path, str]) -> BinaryArtifact | None:
+    path, rel = job
+    name = rel.rsplit("/", 1)[-1]
+    stem = name.split(".", 1)[0]  # libfoo.so.1 -> libfoo
+    try:
+        if isinstance(path, Path):
+            with path.open("rb") as f:
+                try:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:  # empty file
+                    return None
+                try:
+                    header = read_binary_header(mm)
+                finally:
+                    mm.close()
+        else:
+            header = read_binary_header(path.read_bytes()[:HEADER_BYTES])
+    except (OSError, struct.error):
+        return None
+    if header is None:
+        return None
+    fmt, os_name, archs = header
+    return BinaryArtifact(path=rel, name=stem, format=fmt, os=os_name, archs=archs)
+
+
+def _wheel_artifact(rel: str) -> BinaryArtifact | None:
+    tags = wheel_tags(rel.rsplit("/", 1)[-1])
+    if tags is None:
+        return None
+    return BinaryArtifact(
+        path=rel, name=tags["name"], format="wheel", os=tags["os"], archs=tags["archs"],
+        python=tags["python"], abi=tags["abi"],
+    )
+
+
+def scan_binaries(repo_path: Path, exclude: tuple[str, ...] = (), workers: int = WORKERS) -> list[BinaryArtifact]:
+    """Prebuilt native libraries and vendored wheels in the tree, with their target OS / architecture."""
+    jobs: list[tuple[Path, str]] = []
+    artifacts: list[BinaryArtifact] = []
+    files = iter_source_files(
+        repo_path, suffixes=(WHEEL_SUFFIX,), exclude=exclude, prune=PRUNE_DIRS, max_files=MAX_BINARIES, pattern=BINARY_NAME
+    )
+    for p in files:
+        rel = p.relative_to(repo_path).as_posix()
+        if rel.endswith(WHEEL_SUFFIX):
+            wheel = _wheel_artifact(rel)
+            if wheel is not None:
+                artifacts.append(wheel)
+        else:
+            jobs.append((p, rel))
+    if workers > 1 and len(jobs) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            found = list(pool.map(_scan_binary, jobs))
+    else:
+        found = [_scan_binary(job) for job in jobs]
+    artifacts.extend(a for a in found if a is not None)
+    return sorted(artifacts, key=lambda a: a.path)
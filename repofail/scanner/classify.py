@@ -0,0 +1,62 @@
+"""Package classifier - which dependency names mean torch, CUDA-only wheels, system libs, ...
+
+Classes are data (repofail/data/package_classes.json): per class, exact names and name
+prefixes. Exact names go in one dict and every prefix in one trie, so a name is
+classified in a single pass over its characters whatever the size of the tables.
+Names are matched after PEP 503 normalization; no substring matching, so 'av' only
+means PyAV and never 'django-environ-avro'.
+"""
+
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from pathlib import Path
+
+DATA_PATH = Path(__file__).resolve().parent.parent / "data" / "package_classes.json"
+
+_TAGS = "\0"  # trie node key holding the classes of the prefix ending there
+
+
+class PackageClassifier:
+    """Exact-name map plus prefix trie built from a {class: {"exact": [...], "prefix": [...]}} table."""
+
+    def __init__(self, table: dict[str, dict[str, list[str]]]) -> None:
+        self.trie: dict = {}
+        exact: dict[str, set[str]] = {}
+        for cls, entry in table.items():
+            for name in entry.get("exact", ()):
+                exact.setdefault(name, set()).add(cls)
+            for prefix in entry.get("prefix", ()):
+                node = self.trie
+                for ch in prefix:
+                    node = node.setdefault(ch, {})
+                node.setdefault(_TAGS, set()).add(cls)
+        self.exact: dict[str, frozenset[str]] = {name: frozenset(classes) for name, classes in exact.items()}
+        self.classify = lru_cache(maxsize=8192)(self._classify)
+
+    @classmethod
+    def from_file(cls, path: Path) -> "PackageClassifier":
+        return cls(json.loads(Path(path).read_text()))
+
+    def _classify(self, name: str) -> frozenset[str]:
+        """Classes of a normalized package name (empty if none)."""
+        found = set(self.exact.get(name, ()))
+        node = self.trie
+        for ch in name:
+            node = node.get(ch)
+            if node is None:
+                break
+            found.update(node.get(_TAGS, ()))
+        return frozenset(found)
+
+
+@lru_cache(maxsize=1)
+def default_classifier() -> PackageClassifier:
+    """Classifier for the bundled table (loaded once per process)."""
+    return PackageClassifier.from_file(DATA_PATH)
+
+
+def classify(name: str) -> frozenset[str]:
+    """Classes of a normalized package name, from the bundled table."""
+    return default_classifier().classify(name)
@@ -0,0 +1,288 @@
+"""Saved container images (`docker save` / OCI layout tarballs) as a host profile.
+
+The outer tarball is opened for random access to its index (manifest.json, or
+index.json and the manifest blob); each layer is then streamed once, in order, and
+never extracted. Only the paths that matter to the rules are recorded - Python
+binaries and patchlevel.h, site-packages dist-info, the CUDA toolkit's version.json,
+/etc/ld.so.cache, compilers, ffmpeg, Node / Go / Rust markers - together with the
+layer they came from, so whiteouts (".wh.name", opaque ".wh..wh..opq") from later
+layers remove them exactly as the overlay filesystem would. zstd layers need the
+optional `zstandard` package; without it they are skipped and reported.
+"""
+
+from __future__ import annotations
+
+import json
+import posixpath
+import re
+import tarfile
+from pathlib import Path
+from typing import Any
+
+from ..models import HostProfile, normalize_name
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAX_READ_BYTES = 4 * 1024 * 1024
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+_ARCHS = {"amd64": "x86_64", "x86_64": "x86_64", "arm64": "arm64", "aarch64": "arm64", "386": "i386", "arm": "armv7"}
+_OCI_INDEX_TYPES = ("application/vnd.oci.image.index.v1+json", "application/vnd.docker.distribution.manifest.list.v2+json")
+
+_BIN_DIRS = ("usr/local/bin", "opt/conda/bin", "usr/bin", "bin")
+_PYTHON = re.compile(r"^(?P<dir>usr/local/bin|opt/conda/bin|usr/bin|bin)/python(?P<ver>3\.\d+)$")
+_PATCHLEVEL = re.compile(r"^(?:usr/local|opt/conda|usr)/include/python(?P<ver>3\.\d+)[a-z]*/patchlevel\.h$")
+_DIST_INFO = re.compile(r"/(?:site|dist)-packages/(?P<name>[^/]+?)-(?P<ver>[^/-]+)\.dist-info(?=/|$)")
+_CUDA_VERSION = re.compile(r"^usr/local/cuda(?:-[\d.]+)?/version\.(?:json|txt)$")
+_RUSTUP = re.compile(r"^usr/local/rustup/toolchains/(?P<ver>\d+\.\d+\.\d+)-")
+_TOOLS = {"gcc", "cc", "clang", "ffmpeg", "node"}
+_READ = {"etc/ld.so.cache", "usr/local/go/VERSION", "usr/local/include/node/node_version.h", "usr/include/node/node_version.h"}
+
+
+def _normalize(name: str) -> str:
+    """'./usr/bin/../lib/x' -> 'usr/lib/x'."""
+    path = posixpath.normpath("/" + name).lstrip("/")
+    return "" if path == "." else path
+
+
+def _marker(path: str) -> str | None:
+    """Key under which a layer path is recorded, or None if the rules don't need it."""
+    if _PYTHON.match(path) or _PATCHLEVEL.match(path) or _CUDA_VERSION.match(path) or path in _READ:
+        return path
+    if "-packages/" in path:
+        m = _DIST_INFO.search(path)
+        if m:
+            return path[: m.end()]
+    if _RUSTUP.match(path):
+        return path
+    head, _, base = path.rpartition("/")
+    if head in _BIN_DIRS and base in _TOOLS:
+        return path
+    if base.startswith(("libGL.so", "libcudart.so", "libavcodec.so")) and "/lib" in "/" + head:
+        return path
+    return None
+
+
+def _wants_content(path: str) -> bool:
+    return path in _READ or bool(_PATCHLEVEL.match(path) or _CUDA_VERSION.match(path))
+
+
+def _apply_whiteout(state: dict[str, tuple[int, bytes | None]], path: str, layer: int) -> bool:
+    """Apply path if it is a whiteout entry of layer; True if it was one."""
+    head, _, base = path.rpartition("/")
+    if not base.startswith(".wh."):
+        return False
+    if base == ".wh..wh..opq":
+        prefix = head + "/" if head else ""
+        for key in [k for k, (i, _) in state.items() if i < layer and k.startswith(prefix)]:
+            del state[key]
+        return True
+    target = posixpath.join(head, base[len(".wh.") :])
+    for key in [k for k in state if k == target or k.startswith(target + "/")]:
+        del state[key]
+    return True
+
+
+def _open_layer(fileobj: Any) -> tarfile.TarFile | None:
+    """Stream reader for one layer blob (tar, gzip, bzip2, xz; zstd with `zstandard`)."""
+    if fileobj.peek(4)[:4] == _ZSTD_MAGIC:
+        if zstandard is None:
+            return None
+        fileobj = zstandard.ZstdDecompressor().stream_reader(fileobj)
+    return tarfile.open(fileobj=fileobj, mode="r|*")
+
+
+def _content(state: dict[str, tuple[int, bytes | None]], path: str) -> bytes | None:
+    return state[path][1] if path in state else None
+
+
+def _read_json(outer: tarfile.TarFile, name: str) -> Any:
+    try:
+        f = outer.extractfile(name)
+    except KeyError:
+        raise ValueError(f"{name} is missing from the image tarball") from None
+    if f is None:
+        raise ValueError(f"{name} is not a regular file")
+    return json.loads(f.read())
+
+
+def _blob(digest: str) -> str:
+    algo, _, hexdigest = digest.partition(":")
+    return f"blobs/{algo}/{hexdigest}"
+
+
+def _image_layout(outer: tarfile.TarFile) -> tuple[str, dict[str, Any], list[str]]:
+    """(reference, config, layer member names in order) for a docker save or OCI layout tarball."""
+    names = set(outer.getnames())
+    if "manifest.json" in names:
+        manifest = _read_json(outer, "manifest.json")
+        if not isinstance(manifest, list) or not manifest:
+            raise ValueError("manifest.json lists no images")
+        entry = manifest[0]
+        ref = (entry.get("RepoTags") or [""])[0]
+        return ref, _read_json(outer, entry["Config"]), list(entry.get("Layers") or [])
+    if "index.json" in names:
+        index = _read_json(outer, "index.json")
+        ref = ""
+        while True:
+            manifests = index.get("manifests") or []
+            if not manifests:
+                raise ValueError("index.json lists no manifests")
+            desc = next((m for m in manifests if (m.get("platform") or {}).get("os", "linux") == "linux"), manifests[0])
+            ref = ref or (desc.get("annotations") or {}).get("org.opencontainers.image.ref.name", "")
+            index = _read_json(outer, _blob(desc["digest"]))
+            if desc.get("mediaType") not in _OCI_INDEX_TYPES and "layers" in index:
+                break
+        config = _read_json(outer, _blob(index["config"]["digest"]))
+        return ref, config, [_blob(layer["digest"]) for layer in index.get("layers") or []]
+    raise ValueError("not a docker save or OCI layout tarball (no manifest.json or index.json)")
+
+
+def _env(config: dict[str, Any]) -> dict[str, str]:
+    env = {}
+    for item in (config.get("config") or {}).get("Env") or []:
+        key, _, value = item.partition("=")
+        env[key] = value
+    return env
+
+
+def _python_version(state: dict[str, tuple[int, bytes | None]], env: dict[str, str]) -> str | None:
+    """Interpreter the image runs: first bin dir (PATH order) with a python3.X, highest minor."""
+    found: dict[str, list[str]] = {}
+    for path in state:
+        m = _PYTHON.match(path)
+        if m:
+            found.setdefault(m.group("dir"), []).append(m.group("ver"))
+    minor = next((max(found[d], key=lambda v: int(v.split(".")[1])) for d in _BIN_DIRS if d in found), None)
+    if minor is None:
+        return None
+    for path, (_, data) in state.items():
+        m = _PATCHLEVEL.match(path)
+        if m and m.group("ver") == minor and data:
+            patch = re.search(rb'#define\s+PY_VERSION\s+"([^"+]+)', data)
+            if patch:
+                return patch.group(1).decode()
+    declared = env.get("PYTHON_VERSION", "")
+    return declared if declared.startswith(minor + ".") else minor
+
+
+def _cuda_version(state: dict[str, tuple[int, bytes | None]]) -> str | None:
+    for path in sorted(state, key=lambda p: not p.startswith("usr/local/cuda/")):
+        data = state[path][1]
+        if not data or not _CUDA_VERSION.match(path):
+            continue
+        if path.endswith(".json"):
+            try:
+                return json.loads(data)["cuda"]["version"]
+            except (ValueError, KeyError, TypeError):
+                continue
+        m = re.search(rb"CUDA Version (\d+(?:\.\d+)*)", data)
+        if m:
+            return m.group(1).decode()
+    return None
+
+
+def _header_version(data: bytes | None) -> str | None:
+    """'v20.11.1' from node_version.h."""
+    if not data:
+        return None
+    parts = [re.search(rb"#define\s+NODE_%s_VERSION\s+(\d+)" % k, data) for k in (b"MAJOR", b"MINOR", b"PATCH")]
+    return "v" + ".".join(p.group(1).decode() for p in parts) if all(parts) else None
+
+
+def inspect_image(path: Path) -> dict[str, Any]:
+    """
+    Facts about a saved image: image reference, os, arch, layers, skipped_layers,
+    python_version, packages ({name: version} from dist-info), cuda_version, and
+    `host` - a HostProfile for the image. cuda_available means the CUDA runtime is
+    in the image (the GPU itself comes from the node it is scheduled on).
+    """
+    state: dict[str, tuple[int, bytes | None]] = {}
+    skipped: list[str] = []
+    with tarfile.open(path, "r:*") as outer:
+        ref, config, layers = _image_layout(outer)
+        for i, name in enumerate(layers):
+            try:
+                blob = outer.extractfile(name)
+            except KeyError:
+                blob = None
+            layer = _open_layer(blob) if blob is not None else None
+            if layer is None:
+                skipped.append(name)
+                continue
+            with layer:
+                for member in layer:
+                    rel = _normalize(member.name)
+                    if not rel or _apply_whiteout(state, rel, i):
+                        continue
+                    key = _marker(rel)
+                    if key is None:
+                        continue
+                    data = None
+                    if member.isfile() and _wants_content(rel):
+                        f = layer.extractfile(member)
+                        data = f.read(MAX_READ_BYTES) if f is not None else None
+                    state[key] = (i, data)
+
+    env = _env(config)
+    present = set(state)
+    ld_cache = _content(state, "etc/ld.so.cache") or b""
+    libs = {p.rpartition("/")[2].split(".so", 1)[0] for p in present if ".so." in p.rpartition("/")[2] + "."}
+    tools = {p.rpartition("/")[2] for p in present if p.rpartition("/")[0] in _BIN_DIRS}
+
+    packages: dict[str, str] = {}
+    for p in sorted(present):
+        m = _DIST_INFO.search(p)
+        if m:
+            packages[normalize_name(m.group("name"))] = m.group("ver")
+
+    python_version = _python_version(state, env)
+    toolkit = _cuda_version(state)
+    cuda_runtime = toolkit is not None or "libcudart" in libs or b"libcudart.so" in ld_cache
+    cuda_version = (toolkit or env.get("CUDA_VERSION") or None) if cuda_runtime else None
+    node_version = None
+    if "node" in tools:
+        node_version = _header_version(_content(state, "usr/local/include/node/node_version.h")) or _header_version(
+            _content(state, "usr/include/node/node_version.h")
+        )
+        if node_version is None and env.get("NODE_VERSION"):
+            node_version = "v" + env["NODE_VERSION"].lstrip("v")
+    go_file = _content(state, "usr/local/go/VERSION")
+    go_version = None
+    if go_file:
+        go_version = go_file.decode(errors="replace").splitlines()[0].strip() or None
+    elif env.get("GOLANG_VERSION"):
+        go_version = "go" + env["GOLANG_VERSION"]
+    rust_version = env.get("RUST_VERSION") or next(
+        (m.group("ver") for m in map(_RUSTUP.match, sorted(present)) if m), None
+    )
+
+    os_name = config.get("os") or "linux"
+    arch = _ARCHS.get(config.get("architecture", ""), config.get("architecture") or "unknown")
+    host = HostProfile(
+        os=os_name,
+        arch=arch,
+        cuda_available=cuda_runtime,
+        cuda_version=cuda_version,
+        python_version=python_version,
+        node_version=node_version,
+        rust_version=rust_version,
+        go_version=go_version,
+        has_compiler=bool(tools & {"gcc", "cc", "clang"}),
+        has_libgl="libGL" in libs or b"libGL.so" in ld_cache,
+        has_ffmpeg="ffmpeg" in tools,
+    )
+    return {
+        "image": ref or Path(path).name,
+        "os": os_name,
+        "arch": arch,
+        "layers": len(layers),
+        "skipped_layers": skipped,
+        "python_version": python_version,
+        "packages": packages,
+        "cuda_version": cuda_version,
+        "host": host,
+    }
@@ -0,0 +1,298 @@
+"""Read trees and blobs straight from a git object store - no checkout, no git binary.
+
+Supports loose objects, pack files (idx v2) with OFS_DELTA / REF_DELTA chains,
+loose and packed refs, and annotated tags.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+
+from .vfs import VirtualPath, VirtualTree
+
+OBJ_COMMIT, OBJ_TREE, OBJ_BLOB, OBJ_TAG, OBJ_OFS_DELTA, OBJ_REF_DELTA = 1, 2, 3, 4, 6, 7
+_TYPE_NAMES = {b"commit": OBJ_COMMIT, b"tree": OBJ_TREE, b"blob": OBJ_BLOB, b"tag": OBJ_TAG}
+
+# Subtrees never worth listing - the scanner skips them anyway
+PRUNE_DIRS = {".git", "node_modules", ".venv", "venv", "__pycache__", ".tox"}
+
+BASE_CACHE_SIZE = 64  # delta bases kept decompressed; chains share bases heavily
+BASE_CACHE_MAX_OBJECT = 1 << 20  # don't pin huge blobs in the base cache
+
+
+class GitError(Exception):
+    """Corrupt or unsupported object store."""
+
+
+def is_bare_repo(path: Path) -> bool:
+    """True for a bare repository / mirror (HEAD, objects/, refs/ and no .git)."""
+    return (
+        (path / "HEAD").is_file()
+        and (path / "objects").is_dir()
+        and (path / "refs").is_dir()
+        and not (path / ".git").exists()
+    )
+
+
+def _git_dir(path: Path) -> Path:
+    return path if is_bare_repo(path) else path / ".git"
+
+
+class _Pack:
+    """One pack file plus its v2 index, both memory-mapped."""
+
+    def __init__(self, idx_path: Path) -> None:
+        with open(idx_path, "rb") as f:
+            self.idx = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.idx[:4] != b"\xfftOc" or struct.unpack(">I", self.idx[4:8])[0] != 2:
+            raise GitError(f"Unsupported pack index: {idx_path}")
+        self.fanout = struct.unpack(">256I", self.idx[8 : 8 + 1024])
+        self.count = self.fanout[255]
+        self.sha_base = 8 + 1024
+        self.ofs_base = self.sha_base + 24 * self.count  # shas (20) + crc32 (4)
+        self.large_base = self.ofs_base + 4 * self.count
+        with open(idx_path.with_suffix(".pack"), "rb") as f:
+            self.pack = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def find(self, sha: bytes) -> int | None:
+        """Pack offset for a binary sha, by binary search within its fanout bucket."""
+        lo = self.fanout[sha[0] - 1] if sha[0] else 0
+        hi = self.fanout[sha[0]]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = self.sha_base + 20 * mid
+            cur = self.idx[start : start + 20]
+            if cur < sha:
+                lo = mid + 1
+            elif cur > sha:
+                hi = mid
+            else:
+                off = struct.unpack(">I", self.idx[self.ofs_base + 4 * mid : self.ofs_base + 4 * mid + 4])[0]
+                if off & 0x80000000:
+                    i = self.large_base + 8 * (off & 0x7FFFFFFF)
+                    off = struct.unpack(">Q", self.idx[i : i + 8])[0]
+                return off
+        return None
+
+
+def _inflate(buf, start: int, size: int) -> bytes:
+    """Decompress a zlib stream beginning at buf[start]; compressed length is unknown."""
+    d = zlib.decompressobj()
+    out = []
+    pos = start
+    chunk = max(4096, size + 64)
+    while not d.eof:
+        piece = buf[pos : pos + chunk]
+        if not piece:
+            raise GitError("Truncated zlib stream")
+        out.append(d.decompress(piece))
+        pos += len(piece)
+    return b"".join(out)
+
+
+def _delta_varint(delta: bytes, pos: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        c = delta[pos]
+        pos += 1
+        value |= (c & 0x7F) << shift
+        shift += 7
+        if not c & 0x80:
+            return value, pos
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """Apply a git delta (copy/insert instructions) to base."""
+    src_size, pos = _delta_varint(delta, 0)
+    dst_size, pos = _delta_varint(delta, pos)
+    if src_size != len(base):
+        raise GitError("Delta base size mismatch")
+    out = bytearray()
+    n = len(delta)
+    while pos < n:
+        op = delta[pos]
+        pos += 1
+        if op & 0x80:
+            offset = size = 0
+            for i in range(4):
+                if op & (1 << i):
+                    offset |= delta[pos] << (8 * i)
+                    pos += 1
+            for i in range(3):
+                if op & (0x10 << i):
+                    size |= delta[pos] << (8 * i)
+                    pos += 1
+            out += base[offset : offset + (size or 0x10000)]
+        elif op:
+            out += delta[pos : pos + op]
+            pos += op
+        else:
+            raise GitError("Invalid delta opcode 0")
+    if len(out) != dst_size:
+        raise GitError("Delta result size mismatch")
+    return bytes(out)
+
+
+class ObjectStore:
+    """Object lookup across loose objects and all packs of one repository."""
+
+    def __init__(self, repo: Path) -> None:
+        self.git_dir = _git_dir(Path(repo))
+        self.objects = self.git_dir / "objects"
+        pack_dir = self.objects / "pack"
+        self.packs = [_Pack(p) for p in sorted(pack_dir.glob("*.idx"))] if pack_dir.is_dir() else []
+        self._bases: OrderedDict[tuple[int, int], tuple[int, bytes]] = OrderedDict()
+
+    # Objects
+    def read(self, sha_hex: str) -> tuple[int, bytes]:
+        """(type, data) for an object id. Raises KeyError if absent."""
+        loose = self.objects / sha_hex[:2] / sha_hex[2:]
+        if loose.is_file():
+            raw = zlib.decompress(loose.read_bytes())
+            header, _, data = raw.partition(b"\0")
+            kind = _TYPE_NAMES.get(header.split(b" ", 1)[0])
+            if kind is None:
+                raise GitError(f"Unknown object type in {sha_hex}")
+            return kind, data
+        sha = bytes.fromhex(sha_hex)
+        for i, pack in enumerate(self.packs):
+            off = pack.find(sha)
+            if off is not None:
+                return self._read_packed(i, off)
+        raise KeyError(sha_hex)
+
+    def _read_packed(self, pack_no: int, offset: int) -> tuple[int, bytes]:
+        key = (pack_no, offset)
+        hit = self._bases.get(key)
+        if hit is not None:
+            self._bases.move_to_end(key)
+            return hit
+        buf = self.packs[pack_no].pack
+        pos = offset
+        c = buf[pos]
+        pos += 1
+        kind = (c >> 4) & 7
+        size = c & 0x0F
+        shift = 4
+        while c & 0x80:
+            c = buf[pos]
+            pos += 1
+            size |= (c & 0x7F) << shift
+            shift += 7
+        if kind == OBJ_OFS_DELTA:
+            c = buf[pos]
+            pos += 1
+            rel = c & 0x7F
+            while c & 0x80:
+                c = buf[pos]
+                pos += 1
+                rel = ((rel + 1) << 7) | (c & 0x7F)
+            base_kind, base = self._read_packed(pack_no, offset - rel)
+            result = (base_kind, apply_delta(base, _inflate(buf, pos, size)))
+        elif kind == OBJ_REF_DELTA:
+            base_kind, base = self.read(bytes(buf[pos : pos + 20]).hex())
+            result = (base_kind, apply_delta(base, _inflate(buf, pos + 20, size)))
+        elif kind in (OBJ_COMMIT, OBJ_TREE, OBJ_BLOB, OBJ_TAG):
+            result = (kind, _inflate(buf, pos, size))
+        else:
+            raise GitError(f"Unknown pack object type {kind}")
+        if len(result[1]) <= BASE_CACHE_MAX_OBJECT:
+            self._bases[key] = result
+            if len(self._bases) > BASE_CACHE_SIZE:
+                self._bases.popitem(last=False)
+        return result
+
+    # Refs
+    def _packed_refs(self) -> dict[str, str]:
+        refs: dict[str, str] = {}
+        p = self.git_dir / "packed-refs"
+        if p.is_file():
+            for line in p.read_text(errors="replace").splitlines():
+                if line and line[0] not in "#^":
+                    sha, _, name = line.partition(" ")
+                    refs[name.strip()] = sha
+        return refs
+
+    def resolve_ref(self, ref: str = "HEAD") -> str:
+        """Commit id for HEAD, a branch, tag, full ref name or hex id. Peels annotated tags."""
+        sha = self._resolve_name(ref, depth=0)
+        for _ in range(10):
+            kind, data = self.read(sha)
+            if kind != OBJ_TAG:
+                return sha
+            sha = data.split(b"\n", 1)[0].split(b" ", 1)[1].decode()
+        raise GitError(f"Tag chain too deep for {ref}")
+
+    def _resolve_name(self, ref: str, depth: int) -> str:
+        if depth > 10:
+            raise GitError(f"Symbolic ref loop at {ref}")
+        if len(ref) == 40 and all(ch in "0123456789abcdef" for ch in ref.lower()):
+            return ref.lower()
+        packed = None
+        for name in (ref, f"refs/{ref}", f"refs/heads/{ref}", f"refs/tags/{ref}", f"refs/remotes/{ref}"):
+            p = self.git_dir / name
+            if p.is_file():
+                content = p.read_text(errors="replace").strip()
+                if content.startswith("ref:"):
+                    return self._resolve_name(content[4:].strip(), depth + 1)
+                return content
+            if packed is None:
+                packed = self._packed_refs()
+            if name in packed:
+                return packed[name]
+        raise KeyError(f"Unknown ref: {ref}")
+
+    # Trees
+    def tree_of(self, commit_sha: str) -> str:
+        kind, data = self.read(commit_sha)
+        if kind == OBJ_TREE:
+            return commit_sha
+        if kind != OBJ_COMMIT or not data.startswith(b"tree "):
+            raise GitError(f"{commit_sha} is not a commit")
+        return data[5:45].decode()
+
+    def walk_tree(self, tree_sha: str, prefix: str = "") -> dict[str, str]:
+        """{path: blob_sha} for every regular file under tree (submodules and symlinks skipped)."""
+        files: dict[str, str] = {}
+        kind, data = self.read(tree_sha)
+        if kind != OBJ_TREE:
+            raise GitError(f"{tree_sha} is not a tree")
+        pos, n = 0, len(data)
+        while pos < n:
+            sp = data.index(b" ", pos)
+            nul = data.index(b"\0", sp)
+            mode = data[pos:sp]
+            name = data[sp + 1 : nul].decode("utf-8", "replace")
+            sha = data[nul + 1 : nul + 21].hex()
+            pos = nul + 21
+            path = f"{prefix}{name}"
+            if mode == b"40000":
+                if name not in PRUNE_DIRS:
+                    files.update(self.walk_tree(sha, path + "/"))
+            elif mode.startswith(b"100"):
+                files[path] = sha
+        return files
+
+    def blob(self, sha: str) -> bytes:
+        kind, data = self.read(sha)
+        if kind != OBJ_BLOB:
+            raise GitError(f"{sha} is not a blob")
+        return data
+
+
+def open_git_tree(repo: Path, ref: str = "HEAD") -> VirtualPath:
+    """Virtual tree of a repository at ref, read from its object store. Blobs load on demand."""
+    store = ObjectStore(repo)
+    files = store.walk_tree(store.tree_of(store.resolve_ref(ref)))
+    name = repo.name[:-4] if repo.name.endswith(".git") else repo.name
+    tree = VirtualTree(
+        str(repo),
+        {path: (lambda sha=sha: store.blob(sha)) for path, sha in files.items()},
+        name=name or os.path.basename(str(repo)),
+    )
+    return tree.root()
@@ -0,0 +1,285 @@
+"""Go source scanner - build constraints and cgo from bounded file headers.
+
+Build constraints (//go:build, legacy // +build) must precede the package clause and
+`import "C"` sits in the import section, so only the head of each file is read:
+chunk by chunk up to the first top-level declaration, never the whole file. Files
+are read on a small thread pool. Constraints are parsed into an expression tree and
+evaluated per GOOS, together with GOOS/GOARCH filename suffixes (x_linux.go), so
+`!windows` means "everywhere but Windows" rather than "mentions windows".
+"""
+
+from __future__ import annotations
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Union
+
+from .walk import iter_source_files
+
+CHUNK_SIZE = 4096
+MAX_HEADER_BYTES = 64 * 1024  # cgo preambles can be long; never read past this
+WORKERS = 8
+
+# OS tags reported as OS-specific (the rest of GOOS is too rare to matter for hosts)
+REPORTED_GOOS = ("linux", "darwin", "windows", "freebsd")
+KNOWN_GOOS = {
+    "aix", "android", "darwin", "dragonfly", "freebsd", "hurd", "illumos", "ios", "js",
+    "linux", "nacl", "netbsd", "openbsd", "plan9", "solaris", "wasip1", "windows", "zos",
+}
+KNOWN_GOARCH = {
+    "386", "amd64", "arm", "arm64", "loong64", "mips", "mips64", "mips64le", "mipsle",
+    "ppc64", "ppc64le", "riscv64", "s390x", "wasm",
+}
+UNIX_GOOS = KNOWN_GOOS - {"js", "nacl", "plan9", "wasip1", "windows", "zos"}
+_ARCHES = ("amd64", "arm64")  # host architectures a constraint is evaluated against
+
+# Expression tree: a tag name, ("!", x), ("&&", a, b) or ("||", a, b)
+Expr = Union[str, tuple]
+
+_TOKEN = re.compile(r"\s*(\|\||&&|!|\(|\)|[A-Za-z0-9_.]+)")
+_DECL = re.compile(r"^(func|type|var|const)\b")
+
+
+def parse_build_expr(text: str) -> Expr:
+    """Parse a //go:build expression ('linux && (amd64 || arm64)'). Raises ValueError if malformed."""
+    tokens = []
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if not m:
+            raise ValueError(f"Bad build constraint: {text!r}")
+        tokens.append(m.group(1))
+        pos = m.end()
+    tokens.append("")
+
+    i = 0
+
+    def peek() -> str:
+        return tokens[i]
+
+    def take() -> str:
+        nonlocal i
+        i += 1
+        return tokens[i - 1]
+
+    def or_expr() -> Expr:
+        left = and_expr()
+        while peek() == "||":
+            take()
+            left = ("||", left, and_expr())
+        return left
+
+    def and_expr() -> Expr:
+        left = not_expr()
+        while peek() == "&&":
+            take()
+            left = ("&&", left, not_expr())
+        return left
+
+    def not_expr() -> Expr:
+        if peek() == "!":
+            take()
+            return ("!", not_expr())
+        if peek() == "(":
+            take()
+            inner = or_expr()
+            if take() != ")":
+                raise ValueError(f"Unbalanced parentheses: {text!r}")
+            return inner
+        tok = take()
+        if not tok or tok in ("&&", "||", ")"):
+            raise ValueError(f"Bad build constraint: {text!r}")
+        return tok
+
+    expr = or_expr()
+    if peek():
+        raise ValueError(f"Trailing tokens in build constraint: {text!r}")
+    return expr
+
+
+def plus_build_expr(lines: list[str]) -> Expr | None:
+    """Legacy '// +build' lines: space = OR, comma = AND, lines AND-ed together."""
+    line_exprs: list[Expr] = []
+    for line in lines:
+        options: list[Expr] = []
+        for option in line.split():
+            terms: list[Expr] = [("!", t[1:]) if t.startswith("!") else t for t in option.split(",") if t.strip("!")]
+            if terms:
+                expr = terms[0]
+                for t in terms[1:]:
+                    expr = ("&&", expr, t)
+                options.append(expr)
+        if options:
+            expr = options[0]
+            for o in options[1:]:
+                expr = ("||", expr, o)
+            line_exprs.append(expr)
+    if not line_exprs:
+        return None
+    expr = line_exprs[0]
+    for e in line_exprs[1:]:
+        expr = ("&&", expr, e)
+    return expr
+
+
+def eval_build_expr(expr: Expr, tags: set[str]) -> bool:
+    if isinstance(expr, str):
+        return expr in tags or expr.startswith("go1.")  # release tags are satisfied by current toolchains
+    op = expr[0]
+    if op == "!":
+        return not eval_build_expr(expr[1], tags)
+    if op == "&&":
+        return eval_build_expr(expr[1], tags) and eval_build_expr(expr[2], tags)
+    return eval_build_expr(expr[1], tags) or eval_build_expr(expr[2], tags)
+
+
+def filename_constraint(name: str) -> Expr | None:
+    """GOOS/GOARCH implied by a file name: x_linux.go, x_windows_amd64.go, x_arm64_test.go."""
+    stem = name[: -len(".go")] if name.endswith(".go") else name
+    if stem.endswith("_test"):
+        stem = stem[: -len("_test")]
+    parts = stem.split("_")[1:]  # the first element is never a constraint ("linux.go" is unconstrained)
+    if len(parts) >= 2 and parts[-2] in KNOWN_GOOS and parts[-1] in KNOWN_GOARCH:
+        return ("&&", parts[-2], parts[-1])
+    if parts and (parts[-1] in KNOWN_GOOS or parts[-1] in KNOWN_GOARCH):
+        return parts[-1]
+    return None
+
+
+def host_tags(goos: str, goarch: str) -> set[str]:
+    """Tags satisfied when building for goos/goarch (cgo assumed enabled)."""
+    tags = {goos, goarch, "cgo", "gc"}
+    if goos in UNIX_GOOS:
+        tags.add("unix")
+    if goos == "ios":
+        tags.add("darwin")
+    if goos == "android":
+        tags.add("linux")
+    return tags
+
+
+def allowed_goos(expr: Expr) -> set[str]:
+    """REPORTED_GOOS values (on amd64 or arm64) for which expr holds."""
+    return {
+        goos for goos in REPORTED_GOOS if any(eval_build_expr(expr, host_tags(goos, arch)) for arch in _ARCHES)
+    }
+
+
+def read_go_header(path: Path) -> dict[str, Any]:
+    """
+    Build constraint and cgo use of one .go file, reading only up to its first
+    top-level declaration. Returns {constraint: Expr | None, cgo: bool}.
+    """
+    go_build: str | None = None
+    plus_build: list[str] = []
+    cgo = False
+    in_package = False  # past the package clause
+    in_import_group = False
+    in_block_comment = False
+    pending = ""
+    read = 0
+    with path.open("rb") as f:
+        done = False
+        while not done and read < MAX_HEADER_BYTES:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                lines, pending = (pending.split("\n") if pending else []), ""
+                done = True
+            else:
+                read += len(chunk)
+                text = pending + chunk.decode("utf-8", "replace")
+                lines = text.split("\n")
+                pending = lines.pop()
+            for raw in lines:
+                line = raw.strip()
+                if in_block_comment:
+                    if "*/" in line:
+                        in_block_comment = False
+                        line = line.split("*/", 1)[1].strip()
+                    else:
+                        continue
+                if line.startswith("/*") and "*/" not in line[2:]:
+                    in_block_comment = True
+                    continue
+                if not in_package:
+                    if line.startswith("//go:build "):
+                        go_build = go_build or line[len("//go:build ") :]
+                    elif line.startswith("// +build ") or line.startswith("//+build "):
+                        plus_build.append(line.split("+build", 1)[1])
+                    elif line.startswith("package "):
+                        in_package = True
+                    continue
+                if in_import_group:
+                    if line.startswith(")"):
+                        in_import_group = False
+                    elif re.match(r'^(?:[A-Za-z_.]+\s+)?"C"', line):
+                        cgo = True
+                    continue
+                if line.startswith("import"):
+                    rest = line[len("import") :].strip()
+                    if rest.startswith("("):
+                        in_import_group = not rest.endswith(")")
+                        cgo = cgo or '"C"' in rest
+                    elif rest == '"C"':
+                        cgo = True
+                    continue
+                if _DECL.match(line):
+                    done = True
+                    break
+    constraint: Expr | None = None
+    if go_build is not None:
+        try:
+            constraint = parse_build_expr(go_build)
+        except ValueError:
+            constraint = None
+    elif plus_build:
+        constraint = plus_build_expr(plus_build)
+    return {"constraint": constraint, "cgo": cgo}
+
+
+def _scan_file(args: tuple[Path, str]) -> dict[str, Any]:
+    path, rel = args
+    try:
+        header = read_go_header(path)
+    except (OSError, UnicodeError):
+        return {"file": rel, "constraint": None, "cgo": False}
+    by_name = filename_constraint(Path(rel).name)
+    constraint = header["constraint"]
+    if by_name is not None:
+        constraint = by_name if constraint is None else ("&&", constraint, by_name)
+    return {"file": rel, "constraint": constraint, "cgo": header["cgo"]}
+
+
+def scan_go_sources(repo_path: Path, exclude: tuple[str, ...] = (), workers: int = WORKERS) -> dict[str, Any]:
+    """
+    Scan .go files (vendor/testdata pruned). Returns os_tags (GOOS values that some
+    OS-restricted file builds on), cgo_dirs (repo-relative package dirs with
+    `import "C"`), and files (count).
+    """
+    jobs = []
+    for p in iter_source_files(repo_path, suffixes=(".go",), exclude=exclude):
+        jobs.append((p, p.relative_to(repo_path).as_posix()))
+    if workers > 1 and len(jobs) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            files = list(pool.map(_scan_file, jobs))
+    else:
+        files = [_scan_file(job) for job in jobs]
+
+    os_tags: set[str] = set()
+    cgo_dirs: list[str] = []
+    for f in files:
+        if f["constraint"] is not None:
+            allowed = allowed_goos(f["constraint"])
+            if allowed and allowed != set(REPORTED_GOOS):
+                os_tags |= allowed
+        if f["cgo"]:
+            d = f["file"].rsplit("/", 1)[0] if "/" in f["file"] else "."
+            if d not in cgo_dirs:
+                cgo_dirs.append(d)
+    return {
+        "os_tags": [t for t in REPORTED_GOOS if t in os_tags],
+        "cgo_dirs": cgo_dirs,
+        "files": len(files),
+    }
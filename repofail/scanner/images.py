@@ -0,0 +1,90 @@
+"""Base image index - what a container base image ships, without pulling it.
+
+Facts are data (repofail/data/base_images.json): per image name, tag patterns with the
+Python and CUDA versions and the architectures published for matching tags. Patterns
+are regexes (full match) whose named groups `python` / `cuda` take the version straight
+from the tag ("3.11-slim", "12.1.0-devel-ubuntu22.04"). Names ending in "/*" cover a
+whole namespace (nvcr.io/nvidia/*). Lookup is a dict hit on the image name, then on
+each of its namespace prefixes, longest first; only that image's patterns are tried.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+DATA_PATH = Path(__file__).resolve().parent.parent / "data" / "base_images.json"
+
+_DEFAULT_REGISTRY_PREFIXES = ("docker.io/", "index.docker.io/", "registry-1.docker.io/")
+
+
+def split_image_ref(ref: str) -> tuple[str, str]:
+    """'docker.io/library/Python:3.11-slim@sha256:..' -> ('python', '3.11-slim'); tag defaults to 'latest'."""
+    ref = ref.strip().split("@", 1)[0].lower()
+    for prefix in _DEFAULT_REGISTRY_PREFIXES:
+        if ref.startswith(prefix):
+            ref = ref[len(prefix) :]
+            break
+    if ref.startswith("library/"):
+        ref = ref[len("library/") :]
+    name, sep, tag = ref.rpartition(":")
+    if not sep or "/" in tag:  # "registry:5000/img" has a port, not a tag
+        return ref, "latest"
+    return name, tag or "latest"
+
+
+class BaseImageIndex:
+    """Image name (or namespace prefix) -> ordered (tag regex, facts) list."""
+
+    def __init__(self, table: dict[str, list[dict[str, Any]]]) -> None:
+        self.exact: dict[str, list[tuple[re.Pattern, dict[str, Any]]]] = {}
+        self.prefix: dict[str, list[tuple[re.Pattern, dict[str, Any]]]] = {}
+        for image, entries in table.items():
+            compiled = [(re.compile(e.get("tag", ".*")), e) for e in entries]
+            if image.endswith("/*"):
+                self.prefix[image[:-1]] = compiled
+            else:
+                self.exact[image] = compiled
+
+    @classmethod
+    def from_file(cls, path: Path) -> "BaseImageIndex":
+        return cls(json.loads(Path(path).read_text())["images"])
+
+    def _candidates(self, name: str) -> list[tuple[re.Pattern, dict[str, Any]]]:
+        found = list(self.exact.get(name, ()))
+        cut = name.rfind("/")
+        while cut > 0:
+            found.extend(self.prefix.get(name[: cut + 1], ()))
+            cut = name.rfind("/", 0, cut)
+        return found
+
+    def lookup(self, ref: str) -> dict[str, Any] | None:
+        """{image, tag, python, cuda, archs} for an image reference; None if the index doesn't know it."""
+        name, tag = split_image_ref(ref)
+        for pattern, entry in self._candidates(name):
+            m = pattern.fullmatch(tag)
+            if not m:
+                continue
+            groups = m.groupdict()
+            return {
+                "image": name,
+                "tag": tag,
+                "python": groups.get("python") or entry.get("python"),
+                "cuda": groups.get("cuda") or entry.get("cuda"),
+                "archs": tuple(entry.get("archs", ())),
+            }
+        return None
+
+
+@lru_cache(maxsize=1)
+def default_index() -> BaseImageIndex:
+    """Index for the bundled table (loaded once per process)."""
+    return BaseImageIndex.from_file(DATA_PATH)
+
+
+def lookup_image(ref: str) -> dict[str, Any] | None:
+    """Facts about a base image reference, from the bundled table."""
+    return default_index().lookup(ref)
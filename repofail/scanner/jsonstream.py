@@ -0,0 +1,174 @@
+"""Incremental JSON reader - parse events from a byte stream without building the document.
+
+Lockfiles (package-lock.json) and notebooks run to tens of megabytes; callers only need
+a few fields of each entry. iter_events tokenizes the stream chunk by chunk and yields
+(path, event, value) tuples, where path is the tuple of map keys / array indices leading
+to the item. Memory is the current chunk plus the open-container stack. Values under
+skip_keys (notebook outputs, embedded base64 images) are stepped over at the character
+level: never tokenized, decoded or held beyond the current chunk.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, BinaryIO, Iterator
+
+CHUNK_SIZE = 1 << 16
+
+_TOKEN = re.compile(
+    r'[ \t\r\n]*(?:([{}\[\],:])|("(?:[^"\\]|\\.)*")|(-?[0-9][0-9.eE+-]*|true|false|null))',
+    re.S,
+)
+_LITERALS = {"true": True, "false": False, "null": None}
+_SKIP_STRUCT = re.compile(r'["\[\]{}]')
+_SKIP_STRING = re.compile(r'["\\]')
+
+Event = tuple[tuple, str, Any]  # (path, "start_map" | "end_map" | "start_array" | "end_array" | "value", value)
+
+
+def _string(tok: str) -> str:
+    return json.loads(tok) if "\\" in tok else tok[1:-1]
+
+
+def _scalar(tok: str) -> Any:
+    if tok in _LITERALS:
+        return _LITERALS[tok]
+    return json.loads(tok)
+
+
+def _skip(buf: str, pos: int, state: list) -> tuple[int, bool]:
+    """
+    Step over a skipped value from pos. state is [depth, in_string, started] and carries
+    across chunks. Returns (resume position, done); scalars are left for the tokenizer.
+    """
+    n = len(buf)
+    while pos < n:
+        if state[1]:
+            m = _SKIP_STRING.search(buf, pos)
+            if m is None:
+                return n, False
+            if m.group() == "\\":
+                if m.end() == n:
+                    return m.start(), False  # keep the escape for the next chunk
+                pos = m.end() + 1
+                continue
+            state[1] = False
+            pos = m.end()
+            if state[0] == 0:
+                return pos, True
+        elif not state[2]:
+            while pos < n and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos == n:
+                return n, False
+            state[2] = True
+            if buf[pos] not in '"[{':
+                return pos, True
+        else:
+            m = _SKIP_STRUCT.search(buf, pos)
+            if m is None:
+                return n, False
+            pos = m.end()
+            c = m.group()
+            if c == '"':
+                state[1] = True
+            elif c in "[{":
+                state[0] += 1
+            else:
+                state[0] -= 1
+                if state[0] == 0:
+                    return pos, True
+    return pos, False
+
+
+def iter_events(
+    stream: BinaryIO,
+    max_depth: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    skip_keys: frozenset[str] = frozenset(),
+) -> Iterator[Event]:
+    """
+    Parse events from a UTF-8 JSON byte stream. Events deeper than max_depth (len(path))
+    are parsed but not yielded. Values of map keys in skip_keys yield nothing and are
+    never parsed. Raises ValueError on malformed input.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buf = ""
+    pos = 0
+    eof = False
+    # Open containers: [is_map, key or index, expecting_key]
+    stack: list[list] = []
+    path: list = []
+    skip_next = False
+    skipping: list | None = None  # _skip state while inside a skipped value
+
+    def emit(depth: int) -> bool:
+        return max_depth is None or depth <= max_depth
+
+    while True:
+        m = None
+        if skipping is not None:
+            pos, done = _skip(buf, pos, skipping)
+            if done:
+                skipping = None
+                continue
+        else:
+            m = _TOKEN.match(buf, pos)
+        if m is None or (m.group(3) and m.end() == len(buf) and not eof):
+            # Token incomplete (or a number that may continue) - pull the next chunk
+            if eof:
+                if skipping is not None:
+                    raise ValueError("Unterminated value in JSON")
+                if buf[pos:].strip():
+                    raise ValueError(f"Invalid JSON near: {buf[pos:pos + 40]!r}")
+                break
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                eof = True
+                text = decoder.decode(b"", final=True)
+            else:
+                text = decoder.decode(chunk)
+            buf = buf[pos:] + text
+            pos = 0
+            continue
+        pos = m.end()
+        punct, string, literal = m.groups()
+        top = stack[-1] if stack else None
+
+        if punct == "{" or punct == "[":
+            if emit(len(path)):
+                yield tuple(path), "start_map" if punct == "{" else "start_array", None
+            is_map = punct == "{"
+            stack.append([is_map, None if is_map else 0, is_map])
+            path.append(None if is_map else 0)
+        elif punct == "}" or punct == "]":
+            if not stack or stack[-1][0] != (punct == "}"):
+                raise ValueError(f"Unbalanced {punct!r} in JSON")
+            stack.pop()
+            path.pop()
+            if emit(len(path)):
+                yield tuple(path), "end_map" if punct == "}" else "end_array", None
+        elif punct == ",":
+            if top is None:
+                raise ValueError("Unexpected ',' in JSON")
+            if top[0]:
+                top[2] = True
+            else:
+                top[1] += 1
+                path[-1] = top[1]
+        elif punct == ":":
+            if skip_next:
+                skip_next = False
+                skipping = [0, False, False]
+            continue
+        elif string is not None and top is not None and top[0] and top[2]:
+            # Map key; only decoded when something at this depth can be emitted
+            top[1] = _string(string) if emit(len(path)) else string
+            top[2] = False
+            path[-1] = top[1]
+            skip_next = bool(skip_keys) and _string(string) in skip_keys
+        else:
+            if emit(len(path)):
+                yield tuple(path), "value", _string(string) if string is not None else _scalar(literal)
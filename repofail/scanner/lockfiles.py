@@ -0,0 +1,352 @@
+"""Lockfile readers - the resolved (transitive) dependency set, streamed entry by entry.
+
+Lockfiles are the largest files in a repo, so none of these build the document:
+package-lock.json goes through the incremental JSON reader, yarn.lock,
+pnpm-lock.yaml and Cargo.lock are read line by line, and Python TOML locks are
+parsed one [[package]] table at a time. Node and Cargo readers return the packages
+that compile native code; Python readers return every resolved package with its version.
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator
+
+try:
+    import tomllib
+except ImportError:
+    import tomli as tomllib  # type: ignore
+
+from .jsonstream import iter_events
+from .parsers import NODE_NATIVE_PATTERNS, _classify_dependencies, is_rust_system_crate, parse_requirement
+
+NODE_LOCKFILES = ("package-lock.json", "npm-shrinkwrap.json", "yarn.lock", "pnpm-lock.yaml")
+
+_NATIVE_BUILDER = re.compile("(?:%s)" % "|".join(NODE_NATIVE_PATTERNS), re.I)
+
+
+def _is_builder(dep: str) -> bool:
+    """Dependency that only exists to compile or fetch a native addon (node-gyp-build, nan, ...)."""
+    return bool(_NATIVE_BUILDER.match(dep))
+
+
+def _npm_name(key: str) -> str | None:
+    """'node_modules/a/node_modules/@s/b' -> '@s/b'; None for the root and workspace links."""
+    idx = key.rfind("node_modules/")
+    return key[idx + len("node_modules/") :] if idx >= 0 else None
+
+
+def _npm_entry(path: tuple) -> str | None:
+    """Package name if path is a lock entry: packages[<key>] (v2/v3) or dependencies[.dependencies]* (v1)."""
+    if len(path) == 2 and path[0] == "packages":
+        return _npm_name(path[1])
+    if len(path) % 2 == 0 and path and all(k == "dependencies" for k in path[0::2]):
+        return path[-1]
+    return None
+
+
+def parse_package_lock(path: Path) -> dict[str, Any]:
+    """package-lock.json / npm-shrinkwrap.json: native = gypfile, or an install script plus a native builder dep."""
+    result: dict[str, Any] = {"packages": 0, "native_modules": []}
+    if not path.exists():
+        return result
+    native: set[str] = set()
+    names: set[str] = set()
+    open_entries: dict[tuple, dict[str, Any]] = {}
+    seen_packages = False  # v2 lockfiles repeat everything in the legacy v1 section; skip it
+    try:
+        with path.open("rb") as f:
+            for ev_path, event, value in iter_events(f):
+                if event == "start_map":
+                    if ev_path == ("packages",):
+                        seen_packages = True
+                    if seen_packages and ev_path[:1] == ("dependencies",):
+                        continue
+                    name = _npm_entry(ev_path)
+                    if name:
+                        open_entries[ev_path] = {"name": name, "gyp": False, "script": None, "builder": False}
+                elif event == "value":
+                    entry = open_entries.get(ev_path[:-1])
+                    if entry is not None:
+                        if ev_path[-1] == "gypfile":
+                            entry["gyp"] = value is True
+                        elif ev_path[-1] == "hasInstallScript":
+                            entry["script"] = value is True
+                        continue
+                    entry = open_entries.get(ev_path[:-2])
+                    if entry is not None and ev_path[-2] in ("dependencies", "requires") and _is_builder(ev_path[-1]):
+                        entry["builder"] = True
+                elif event == "end_map":
+                    entry = open_entries.pop(ev_path, None)
+                    if entry is None:
+                        continue
+                    names.add(entry["name"])
+                    # v1 entries carry no install-script flag: a builder dependency alone decides
+                    if entry["gyp"] or (entry["builder"] and entry["script"] is not False):
+                        native.add(entry["name"])
+    except (OSError, ValueError):
+        pass
+    result["packages"] = len(names)
+    result["native_modules"] = sorted(native)
+    return result
+
+
+def _yarn_name(descriptor: str) -> str:
+    """'"@babel/core@^7.0.0"' / 'bcrypt@npm:^5.0.0' -> package name."""
+    d = descriptor.strip().strip('"')
+    at = d.find("@", 1)
+    return d[:at] if at > 0 else d
+
+
+def parse_yarn_lock(path: Path) -> dict[str, Any]:
+    """yarn.lock (classic and berry): native = depends on a native builder (no install-script flag in the lock)."""
+    result: dict[str, Any] = {"packages": 0, "native_modules": []}
+    if not path.exists():
+        return result
+    native: set[str] = set()
+    names: set[str] = set()
+    current: str | None = None
+    in_deps = False
+    try:
+        with path.open("rb") as f:
+            for raw in f:
+                line = raw.decode("utf-8", "replace").rstrip()
+                if not line or line.lstrip().startswith("#"):
+                    continue
+                indent = len(line) - len(line.lstrip(" "))
+                if indent == 0:
+                    current = _yarn_name(line.rstrip(":").split(",")[0])
+                    if current == "__metadata":
+                        current = None
+                    elif current:
+                        names.add(current)
+                    in_deps = False
+                elif indent == 2:
+                    in_deps = line.strip().rstrip(":") in ("dependencies", "optionalDependencies")
+                elif in_deps and current:
+                    dep = re.split(r'[:\s]', line.strip().strip('"'), 1)[0].strip('"')
+                    if _is_builder(dep):
+                        native.add(current)
+    except OSError:
+        pass
+    result["packages"] = len(names)
+    result["native_modules"] = sorted(native)
+    return result
+
+
+def _pnpm_name(key: str) -> str:
+    """'/@scope/pkg@1.2.3(peer@1)' (v6+), '/pkg/1.2.3' (v5) or 'pkg@1.2.3' (v9) -> package name."""
+    k = key.strip().strip("'\"").lstrip("/")
+    k = k.split("(", 1)[0]
+    at = k.find("@", 1)
+    if at > 0:
+        return k[:at]
+    return k.rsplit("/", 1)[0] if "/" in k else k
+
+
+def parse_pnpm_lock(path: Path) -> dict[str, Any]:
+    """pnpm-lock.yaml: native = requiresBuild (when recorded) and a native builder dependency."""
+    result: dict[str, Any] = {"packages": 0, "native_modules": []}
+    if not path.exists():
+        return result
+    builder: set[str] = set()
+    no_build: set[str] = set()
+    names: set[str] = set()
+    section = ""
+    current: str | None = None
+    in_deps = False
+    try:
+        with path.open("rb") as f:
+            for raw in f:
+                line = raw.decode("utf-8", "replace").rstrip()
+                if not line or line.lstrip().startswith("#"):
+                    continue
+                indent = len(line) - len(line.lstrip(" "))
+                stripped = line.strip()
+                if indent == 0:
+                    section = stripped.rstrip(":")
+                    current = None
+                elif section not in ("packages", "snapshots"):
+                    continue
+                elif indent == 2:
+                    current = _pnpm_name(stripped.rstrip(":").rstrip("{}").rstrip(": "))
+                    names.add(current)
+                    in_deps = False
+                elif indent == 4 and current:
+                    key, _, value = stripped.partition(":")
+                    in_deps = key in ("dependencies", "optionalDependencies") and not value.strip()
+                    if key == "requiresBuild" and value.strip() == "false":
+                        no_build.add(current)
+                elif indent >= 6 and in_deps and current:
+                    if _is_builder(stripped.split(":", 1)[0].strip("'\"")):
+                        builder.add(current)
+    except OSError:
+        pass
+    result["packages"] = len(names)
+    result["native_modules"] = sorted(builder - no_build)
+    return result
+
+
+def parse_cargo_lock(path: Path) -> dict[str, Any]:
+    """Cargo.lock: every resolved crate that binds a system library (*-sys), in one line pass."""
+    result: dict[str, Any] = {"packages": 0, "system_crates": []}
+    if not path.exists():
+        return result
+    crates: set[str] = set()
+    in_package = False
+    try:
+        with path.open("rb") as f:
+            for raw in f:
+                line = raw.decode("utf-8", "replace").strip()
+                if line.startswith("["):
+                    in_package = line == "[[package]]"
+                elif in_package and line.startswith("name = "):
+                    crates.add(line[len("name = ") :].strip('"'))
+                    in_package = False  # one name per entry; skip the rest
+    except OSError:
+        pass
+    result["packages"] = len(crates)
+    result["system_crates"] = sorted(c for c in crates if is_rust_system_crate(c))
+    return result
+
+
+NODE_LOCK_PARSERS = {
+    "package-lock.json": parse_package_lock,
+    "npm-shrinkwrap.json": parse_package_lock,
+    "yarn.lock": parse_yarn_lock,
+    "pnpm-lock.yaml": parse_pnpm_lock,
+}
+
+
+# Python locks: one TOML array-of-tables entry per resolved package
+
+PYTHON_LOCKFILES = {"uv.lock": "package", "poetry.lock": "package", "pdm.lock": "package", "pylock.toml": "packages"}
+
+
+def iter_toml_tables(stream: BinaryIO, header: str) -> Iterator[tuple[int, dict[str, Any]]]:
+    """
+    (line, table) for each [[header]] entry, sub-tables included. The file is cut at
+    top-level headers and each entry parsed on its own, so a lock with thousands of
+    packages never becomes one document. Malformed entries are skipped.
+    """
+    entry_header = f"[[{header}]]"
+    sub_prefixes = (f"[{header}.", f"[[{header}.")
+    buf: list[str] = []
+    start = 0
+    in_string: str | None = None  # open multi-line string delimiter
+
+    def flush() -> Iterator[tuple[int, dict[str, Any]]]:
+        if buf:
+            try:
+                doc = tomllib.loads("".join(buf))
+                yield start, doc[header][0]
+            except (tomllib.TOMLDecodeError, KeyError, IndexError):
+                pass
+        buf.clear()
+
+    for lineno, raw in enumerate(stream, 1):
+        line = raw.decode("utf-8", "replace")
+        stripped = line.strip()
+        if in_string is None and stripped.startswith("["):
+            if stripped == entry_header:
+                yield from flush()
+                start = lineno
+                buf.append(line)
+                continue
+            if not stripped.startswith(sub_prefixes):
+                yield from flush()  # [metadata], [manifest], ... end the entry
+                continue
+        if buf:
+            buf.append(line)
+        for delim in ('"""', "'''"):
+            if (in_string is None or in_string == delim) and line.count(delim) % 2:
+                in_string = None if in_string else delim
+    yield from flush()
+
+
+_PLATFORM_MARKER = re.compile(r"sys_platform|platform_system|platform_machine|os_name")
+
+
+def _python_name(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", str(name)).lower()
+
+
+def _any_marker(markers: set[str]) -> str:
+    """Marker that holds when any of markers does ('' = unconditional)."""
+    if "" in markers:
+        return ""
+    if len(markers) == 1:
+        return next(iter(markers))
+    return " or ".join(f"({m})" for m in sorted(markers))
+
+
+def _lock_edges(fmt: str, entry: dict[str, Any]) -> Iterator[tuple[str, str]]:
+    """(dependency name, marker or '') for each dependency edge recorded on a lock entry."""
+    if fmt == "uv.lock":
+        groups = [entry.get("dependencies", [])]
+        for extra in ("optional-dependencies", "dev-dependencies"):
+            groups.extend((entry.get(extra) or {}).values())
+        for group in groups:
+            for dep in group:
+                if isinstance(dep, dict) and dep.get("name"):
+                    yield _python_name(dep["name"]), str(dep.get("marker", ""))
+    elif fmt == "poetry.lock":
+        for name, spec in (entry.get("dependencies") or {}).items():
+            specs = spec if isinstance(spec, list) else [spec]
+            markers = [s.get("markers", "") if isinstance(s, dict) else "" for s in specs]
+            yield _python_name(name), _any_marker(set(markers))
+    elif fmt == "pdm.lock":
+        for dep in entry.get("dependencies", []):
+            req = parse_requirement(str(dep))
+            if req:
+                yield req["name"], req["marker"]
+
+
+def parse_python_lock(path: Path) -> dict[str, Any]:
+    """
+    uv.lock / poetry.lock / pdm.lock / pylock.toml -> resolved packages as dependency
+    records ("==version"), plus the parser flags (torch, CUDA-only, ...) of those not
+    limited to some platforms. A package only reached through markers carries them,
+    so e.g. Linux-only CUDA wheels are not reported for macOS.
+    """
+    result: dict[str, Any] = {
+        "uses_torch": False,
+        "uses_tensorflow": False,
+        "frameworks": [],
+        "requires_libgl": False,
+        "requires_ffmpeg": False,
+        "cuda_mandatory_packages": [],
+        "native_build_backends": [],
+        "dependencies": [],
+        "packages": 0,
+    }
+    fmt = path.name
+    header = PYTHON_LOCKFILES.get(fmt)
+    if header is None or not path.exists():
+        return result
+    packages: list[tuple[str, str, int, str]] = []
+    edges: dict[str, set[str]] = {}
+    try:
+        with path.open("rb") as f:
+            for line, entry in iter_toml_tables(f, header):
+                name = entry.get("name")
+                if not name:
+                    continue
+                own_marker = str(entry.get("marker") or entry.get("markers") or "")
+                packages.append((_python_name(name), str(entry.get("version", "")), line, own_marker))
+                for dep, marker in _lock_edges(fmt, entry):
+                    edges.setdefault(dep, set()).add(marker)
+    except OSError:
+        return result
+    for name, version, line, own_marker in packages:
+        incoming = edges.get(name, {""})
+        marker = own_marker or _any_marker(incoming)
+        result["dependencies"].append(
+            {"name": name, "specifier": f"=={version}" if version else "", "extras": [], "marker": marker, "line": line}
+        )
+    result["packages"] = len(packages)
+    unconditional = {**result, "dependencies": [d for d in result["dependencies"] if not _PLATFORM_MARKER.search(d["marker"])]}
+    _classify_dependencies(unconditional)
+    result.update({k: v for k, v in unconditional.items() if k != "dependencies"})
+    return result
@@ -0,0 +1,82 @@
+"""Content-addressed memo - share results for byte-identical inputs across a run.
+
+Forks, templates and vendored copies put the same pyproject.toml / package.json /
+Dockerfile / .py files in many repos of a fleet. Parse results are keyed by the
+sha256 of the file bytes, so each distinct file is parsed once per process.
+Memoized values are shared between profiles: treat them as read-only.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+MEMO_MAX_ENTRIES = 16384  # per table; LRU beyond that so long runs stay bounded
+
+
+def digest(data: bytes) -> str:
+    """Hex sha256 of data."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_digest(path: Any, chunk_size: int = 1 << 20) -> str:
+    """Hex sha256 of a file (Path or VirtualPath), read in chunks so large lockfiles aren't held in memory."""
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def object_digest(obj: Any, exclude: tuple[str, ...] = ()) -> str:
+    """Stable sha256 of a dataclass / JSON-like value (dict keys sorted), minus excluded top-level fields."""
+    if is_dataclass(obj):
+        obj = asdict(obj)
+    if exclude and isinstance(obj, dict):
+        obj = {k: v for k, v in obj.items() if k not in exclude}
+    blob = json.dumps(obj, sort_keys=True, default=str, separators=(",", ":"))
+    return digest(blob.encode("utf-8"))
+
+
+class ContentMemo:
+    """LRU table of (kind, content digest) -> result, with hit/miss counters."""
+
+    def __init__(self, max_entries: int = MEMO_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._table: OrderedDict[tuple[str, str], Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, kind: str, key: str, compute: Callable[[], T]) -> T:
+        """Cached result for (kind, key), computing and storing it on a miss."""
+        with self._lock:
+            if (kind, key) in self._table:
+                self._table.move_to_end((kind, key))
+                self.hits += 1
+                return self._table[(kind, key)]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._table[(kind, key)] = value
+            if len(self._table) > self.max_entries:
+                self._table.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._table.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+
+# Parsed config / source files, keyed by parser name and file digest
+PARSE_MEMO = ContentMemo()
@@ -0,0 +1,123 @@
+"""Native source scanner - CUDA in C/C++/CUDA sources, CMake and setup.py.
+
+One precompiled bytes regex per file type (an alternation of named patterns) runs
+over the raw file bytes; files that contain none of the trigger substrings are
+rejected with a plain `in` test first, so large C++ trees cost little more than
+reading them. Findings are path-independent and memoized per file content.
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Any
+
+from .memo import PARSE_MEMO, digest
+from .walk import iter_source_files
+
+MAX_FILE_BYTES = 2 * 1024 * 1024
+MAX_USAGES_PER_FILE = 20
+
+CUDA_SUFFIXES = (".cu", ".cuh")
+CXX_SUFFIXES = (".c", ".cc", ".cpp", ".cxx", ".h", ".hh", ".hpp")
+CMAKE_NAMES = ("CMakeLists.txt",)
+CMAKE_SUFFIXES = (".cmake",)
+
+_SOURCE_RE = re.compile(
+    rb'(?P<cuda_include>#[ \t]*include[ \t]*[<"](?:cuda\w*|cublas\w*|cudnn\w*|curand\w*|cufft\w*|cusparse\w*|nccl)\.h[>"])'
+    rb"|(?P<cuda_kernel>__global__[ \t]+void\b)"
+    rb"|(?P<kernel_launch><<<[^;<>]*>>>)"
+)
+_CMAKE_RE = re.compile(
+    rb"(?P<cmake_require_cuda>find_package[ \t]*\([ \t]*(?:CUDA|CUDAToolkit)\b[^)]*\bREQUIRED\b)"
+    rb"|(?P<cmake_find_cuda>find_package[ \t]*\([ \t]*(?:CUDA|CUDAToolkit)\b)"
+    rb"|(?P<cmake_cuda_language>enable_language[ \t]*\([ \t]*CUDA\b|\bLANGUAGES\b[^)]*\bCUDA\b)",
+    re.I,
+)
+_SETUP_RE = re.compile(rb"(?P<cuda_extension>\bCUDAExtension[ \t]*\()")
+
+_SOURCE_TRIGGERS = (b"cuda", b"cublas", b"cudnn", b"curand", b"cufft", b"cusparse", b"nccl", b"__global__", b"<<<")
+
+# file type -> (substrings that must occur for any match, pattern)
+_SCANNERS: dict[str, tuple[tuple[bytes, ...], re.Pattern]] = {
+    "cuda": (_SOURCE_TRIGGERS, _SOURCE_RE),
+    "cxx": (_SOURCE_TRIGGERS, _SOURCE_RE),
+    "cmake": ((b"CUDA", b"cuda"), _CMAKE_RE),
+    "setup_py": ((b"CUDAExtension",), _SETUP_RE),
+}
+
+# Kinds that make CUDA a build requirement rather than an optional backend
+HARD_KINDS = {"cuda_source", "cuda_kernel", "kernel_launch", "cmake_require_cuda", "cmake_cuda_language", "cuda_extension"}
+
+
+def file_type(name: str) -> str | None:
+    if name.endswith(CUDA_SUFFIXES):
+        return "cuda"
+    if name.endswith(CXX_SUFFIXES):
+        return "cxx"
+    if name in CMAKE_NAMES or name.endswith(CMAKE_SUFFIXES):
+        return "cmake"
+    if name == "setup.py":
+        return "setup_py"
+    return None
+
+
+def find_cuda(data: bytes, ftype: str) -> list[tuple[int, str]]:
+    """(line, kind) of CUDA usage in one file's bytes; .cu/.cuh files are CUDA by definition."""
+    triggers, pattern = _SCANNERS[ftype]
+    found: list[tuple[int, str]] = []
+    if any(t in data for t in triggers):
+        line, pos = 1, 0
+        for m in pattern.finditer(data):
+            line += data.count(b"\n", pos, m.start())
+            pos = m.start()
+            found.append((line, m.lastgroup or "cuda"))
+            if len(found) >= MAX_USAGES_PER_FILE:
+                break
+    if ftype == "cuda" and not any(kind in HARD_KINDS for _, kind in found):
+        found.insert(0, (1, "cuda_source"))
+    return found
+
+
+def scan_native_file(path: Path, repo_path: Path) -> list[dict[str, Any]]:
+    """CUDA usages in one native/build file as [{file, line, kind}]."""
+    ftype = file_type(path.name)
+    if ftype is None:
+        return []
+    with path.open("rb") as f:
+        data = f.read(MAX_FILE_BYTES)
+    found = PARSE_MEMO.get(f"native_cuda:{ftype}", digest(data), lambda: find_cuda(data, ftype))
+    if not found:
+        return []
+    try:
+        rel = path.relative_to(repo_path).as_posix()
+    except ValueError:
+        rel = path.name
+    return [{"file": rel, "line": ln, "kind": kind} for ln, kind in found]
+
+
+def scan_native_tree(repo_path: Path, exclude: tuple[str, ...] = (), max_files: int = 5000) -> dict[str, Any]:
+    """
+    Scan C/C++/CUDA sources, CMake files and setup.py. Returns requires_cuda,
+    cuda_mandatory (a hard build dependency: kernels, CUDA language, CUDAExtension),
+    cuda_files and cuda_usages.
+    """
+    result: dict[str, Any] = {"requires_cuda": False, "cuda_mandatory": False, "cuda_files": [], "cuda_usages": []}
+    files = iter_source_files(
+        repo_path,
+        suffixes=CUDA_SUFFIXES + CXX_SUFFIXES + CMAKE_SUFFIXES,
+        names=CMAKE_NAMES + ("setup.py",),
+        exclude=exclude,
+        max_files=max_files,
+    )
+    for path in files:
+        try:
+            usages = scan_native_file(path, repo_path)
+        except OSError:
+            continue
+        if usages:
+            result["requires_cuda"] = True
+            result["cuda_mandatory"] = result["cuda_mandatory"] or any(u["kind"] in HARD_KINDS for u in usages)
+            result["cuda_files"].append(usages[0]["file"])
+            result["cuda_usages"].extend(usages)
+    return result
@@ -0,0 +1,64 @@
+"""Jupyter notebook reader - code-cell sources only, streamed.
+
+Notebooks carry their outputs inline (base64 plots, long tracebacks), often dwarfing
+the code. The file is streamed with jsonstream and outputs/attachments are stepped
+over unparsed; only the source of code cells is collected. IPython magics and shell
+escapes are blanked so each cell parses as plain Python with its line numbers intact.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from .jsonstream import iter_events
+
+SKIP_KEYS = frozenset({"outputs", "attachments", "metadata"})
+
+
+def _cell_path(path: tuple) -> bool:
+    """('cells', i) in nbformat 4, ('worksheets', w, 'cells', i) in nbformat 3."""
+    return (len(path) == 2 and path[0] == "cells") or (len(path) == 4 and path[0] == "worksheets" and path[2] == "cells")
+
+
+def strip_magics(source: str) -> str | None:
+    """Blank %magic / !shell lines (keeping line numbers); None for %%cell magics that aren't Python."""
+    lines = source.split("\n")
+    first = lines[0].lstrip() if lines else ""
+    if first.startswith("%%") and not first.startswith(("%%time", "%%capture")):
+        return None
+    out = []
+    for line in lines:
+        stripped = line.lstrip()
+        out.append("" if stripped.startswith(("%", "!")) else line)
+    return "\n".join(out)
+
+
+def read_code_cells(path: Path) -> list[tuple[int, str]]:
+    """
+    (cell number, source) for each code cell, cell numbers 1-based over all cells.
+    Raises ValueError for a malformed notebook.
+    """
+    cells: list[tuple[int, str]] = []
+    cell_no = 0
+    cell_type = ""
+    parts: list[str] = []
+    with path.open("rb") as f:
+        for ev_path, event, value in iter_events(f, max_depth=6, skip_keys=SKIP_KEYS):
+            if event == "start_map" and _cell_path(ev_path):
+                cell_no += 1
+                cell_type, parts = "", []
+            elif event == "value":
+                if _cell_path(ev_path[:-1]):
+                    key = ev_path[-1]  # "source": "one string"
+                elif _cell_path(ev_path[:-2]):
+                    key = ev_path[-2]  # "source": ["line\n", ...]
+                else:
+                    continue
+                if key == "cell_type":
+                    cell_type = value
+                elif key in ("source", "input") and isinstance(value, str):
+                    parts.append(value)
+            elif event == "end_map" and _cell_path(ev_path):
+                if cell_type == "code" and parts:
+                    cells.append((cell_no, "".join(parts)))
+    return cells
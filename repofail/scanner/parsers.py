@@ -3,7 +3,7 @@
 import json
 import re
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
 try:
     import tomllib
@@ -12,32 +12,15 @@ except ImportError:
 
 import yaml
 
-# ML / GPU packages to detect
-TORCH_PACKAGES = {"torch", "pytorch"}
-TF_PACKAGES = {"tensorflow", "tf-keras"}
-# Packages that require CUDA (no CPU fallback)
-CUDA_MANDATORY_PACKAGES = {"bitsandbytes", "flash-attn", "flash_attn", "xformers"}
-# Native build backends (require compiler/Rust)
-NATIVE_BUILD_PATTERNS = ["maturin", "setuptools-rust", "pybind11"]
-# Apple Silicon: packages with known x86-only or problematic wheels
-ARM64_PROBLEMATIC = {"faiss-gpu", "faiss-cpu", "faiss"}  # faiss-gpu especially
-
-ML_FRAMEWORKS = {
-    "peft": "PEFT",
-    "transformers": "Transformers",
-    "diffusers": "Diffusers",
-    "accelerate": "Accelerate",
-    "torchao": "torchao",
-    "mlx": "MLX",
-}
-
-# Packages that need system libs
-LIBGL_PACKAGES = {"opencv-python", "opencv-contrib-python", "pyopengl", "opencv"}
-FFMPEG_PACKAGES = {"ffmpeg-python", "av", "pyav", "ffmpeg"}
+from .classify import classify
+from .images import lookup_image
 
 # Node native module patterns
 NODE_NATIVE_PATTERNS = [
     r"node-gyp",
+    r"node-pre-gyp",
+    r"@mapbox/node-pre-gyp",
+    r"cmake-js",
     r"nan\b",
     r"node-addon-api",
     r"@napi-rs/",
@@ -48,21 +31,160 @@ NODE_NATIVE_PATTERNS = [
 ]
 
 
-def _extract_version_constraint(s: str, pkg: str) -> str | None:
-    """Extract version constraint for a package from a dep spec (e.g. torch>=2.2,<2.4)."""
-    s = s.split("#")[0].strip()
-    # Strip [extras] e.g. torch[cpu]
-    s = re.sub(r"\[\s*[^\]]+\]\s*", "", s)
-    # Match constraint: >=, <=, ==, ~=, etc.
-    m = re.search(r"([>=<~!]+[\d.*,\s]+)", s)
-    return m.group(1).strip() if m and m.group(1).strip() else None
+_REQUIREMENT_RE = re.compile(
+    r"^\s*([A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)\s*(?:\[([^\]]*)\])?\s*([^;]*?)\s*(?:;\s*(.*?))?\s*$"
+)
+
+
+def parse_requirement(spec: str) -> dict[str, Any] | None:
+    """
+    PEP 508 requirement -> {name, specifier, extras, marker}; None for paths, URLs and options.
+    Names are PEP 503 normalized.
+    """
+    m = _REQUIREMENT_RE.match(spec)
+    if not m:
+        return None
+    name, extras, specifier, marker = m.groups()
+    specifier = specifier.strip()
+    if specifier and specifier[0] not in "<>=!~@(":
+        return None  # "git+https://...", "./pkg", "name+junk"
+    return {
+        "name": re.sub(r"[-_.]+", "-", name).lower(),
+        "specifier": specifier.strip("()").replace(" ", "") if specifier[:1] != "@" else specifier,
+        "extras": [e.strip().lower() for e in (extras or "").split(",") if e.strip()],
+        "marker": (marker or "").strip(),
+    }
+
+
+def _bump(parts: list[str], index: int) -> str:
+    """'1.2.3' bumped at index 1 -> '1.3'."""
+    head = [int(p) for p in parts[: index + 1]]
+    head[-1] += 1
+    return ".".join(map(str, head))
+
+
+def poetry_specifier(constraint: str) -> str:
+    """
+    Poetry version constraint -> PEP 440 specifier: '^1.2' -> '>=1.2,<2', '~2.1' -> '>=2.1,<2.2',
+    '2.1.0' -> '==2.1.0', '2.1.*' -> '==2.1.*', '*' -> ''. Unions ('||') cannot be expressed as
+    one specifier and are left unconstrained.
+    """
+    constraint = constraint.strip()
+    if constraint in ("", "*") or "||" in constraint:
+        return ""
+    out = []
+    for clause in re.split(r"\s*,\s*|\s+(?![\d*])", constraint):
+        clause = clause.replace(" ", "")
+        if not clause:
+            continue
+        if clause[0] in "^~" and clause[:2] != "~=":
+            ver = clause.lstrip("^~")
+            parts = ver.split(".")
+            if not all(p.isdigit() for p in parts):
+                out.append(f">={ver}")
+                continue
+            if clause[0] == "^":
+                index = next((i for i, p in enumerate(parts) if int(p)), len(parts) - 1)
+            else:
+                index = 1 if len(parts) > 1 else 0
+            out.append(f">={ver},<{_bump(parts, index)}")
+        elif clause[0] in "<>=!~":
+            out.append(clause)
+        else:
+            out.append(f"=={clause}")
+    return ",".join(out)
+
+
+def _poetry_marker(spec: dict[str, Any]) -> str:
+    """Environment marker from a Poetry table's python / platform / markers keys."""
+    parts = []
+    python = poetry_specifier(str(spec.get("python", "")))
+    for clause in filter(None, python.split(",")):
+        op, ver = re.match(r"([<>=!~]+)(.*)", clause).groups()
+        parts.append(f'python_version {op} "{ver}"')
+    if spec.get("platform"):
+        parts.append(f'sys_platform == "{spec["platform"]}"')
+    if spec.get("markers"):
+        parts.append(f"({spec['markers']})" if parts else str(spec["markers"]))
+    return " and ".join(parts)
+
+
+def _line_of(text: str, needle: str) -> int:
+    """1-based line of the first occurrence of needle in text, 0 if absent."""
+    i = text.find(needle)
+    return text.count("\n", 0, i) + 1 if i >= 0 else 0
+
+
+def _classify_dependencies(result: dict[str, Any]) -> None:
+    """Fill the ML / system-lib / native-build flags of a parser result from its dependencies."""
+    for dep in result["dependencies"]:
+        pkg = dep["name"]
+        for cls in sorted(classify(pkg)):
+            kind, _, value = cls.partition(":")
+            if kind == "torch":
+                result["uses_torch"] = True
+                if "+cu" in dep["specifier"].lower():
+                    _append_once(result["cuda_mandatory_packages"], "torch+cu")
+            elif kind == "tensorflow":
+                result["uses_tensorflow"] = True
+            elif kind == "cuda_mandatory":
+                _append_once(result["cuda_mandatory_packages"], pkg)
+            elif kind == "libgl":
+                result["requires_libgl"] = True
+            elif kind == "ffmpeg":
+                result["requires_ffmpeg"] = True
+            elif kind == "framework":
+                _append_once(result["frameworks"], value)
+            elif kind == "native_build":
+                _append_once(result["native_build_backends"], value)
+
+
+def _append_once(items: list, value: Any) -> None:
+    if value not in items:
+        items.append(value)
+
+
+_REQ_OPTIONS = {
+    "-r": "include",
+    "--requirement": "include",
+    "-c": "constraint",
+    "--constraint": "constraint",
+    "-e": "editable",
+    "--editable": "editable",
+}
+_REQ_OPTION_RE = re.compile(r"^(-[A-Za-z]|--[A-Za-z-]+)\s*=?\s*(.*)$")
+
+
+def tokenize_requirements(text: str) -> Iterator[tuple[int, str, str]]:
+    """
+    (line, kind, value) per logical line of a requirements file, in one pass. kind is
+    "requirement", "include" (-r), "constraint" (-c), "editable" (-e) or "option".
+    Comments, backslash continuations and per-requirement options (--hash) are consumed here.
+    """
+    logical = ""
+    start = 0
+    for lineno, raw in enumerate(text.splitlines(), 1):
+        if not logical:
+            start = lineno
+        line = re.sub(r"(^|\s)#.*", "", raw).rstrip()
+        if line.endswith("\\"):
+            logical += line[:-1] + " "
+            continue
+        item, logical = (logical + line).strip(), ""
+        if not item:
+            continue
+        if item.startswith("-"):
+            m = _REQ_OPTION_RE.match(item)
+            opt, value = m.groups() if m else (item, "")
+            kind = _REQ_OPTIONS.get(opt, "option")
+            yield start, kind, value.split()[0] if kind != "option" and value else value
+        else:
+            yield start, "requirement", re.split(r"\s--?[A-Za-z]", item, 1)[0].rstrip()
 
 
 def parse_requirements(path: Path) -> dict[str, Any]:
-    """Parse requirements.txt for packages and constraints."""
+    """Parse requirements.txt for packages and constraints; -r / -c targets are returned as written."""
     result: dict[str, Any] = {
-        "packages": [],
-        "package_versions": {},
         "uses_torch": False,
         "uses_tensorflow": False,
         "frameworks": [],
@@ -70,49 +192,28 @@ def parse_requirements(path: Path) -> dict[str, Any]:
         "requires_ffmpeg": False,
         "cuda_mandatory_packages": [],
         "native_build_backends": [],
-        "tensorflow_version": None,
+        "dependencies": [],
+        "includes": [],
+        "constraints": [],
     }
     if not path.exists():
         return result
 
     content = path.read_text(errors="replace")
-    for line in content.splitlines():
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        # Handle -e, -r, -f
-        if line.startswith("-"):
+    for lineno, kind, value in tokenize_requirements(content):
+        if kind == "requirement":
+            req = parse_requirement(value)
+        elif kind == "editable":
+            # Only VCS / URL editables name the package (#egg=name); local paths are projects
+            egg = re.search(r"#egg=([A-Za-z0-9._-]+)", value)
+            req = parse_requirement(egg.group(1)) if egg else None
+        else:
+            if kind in ("include", "constraint") and value:
+                result["includes" if kind == "include" else "constraints"].append(value)
             continue
-        # Extract package name (strip version specifiers)
-        pkg = re.split(r"[\[\]>=<!=~\s]", line)[0].lower().replace("_", "-")
-        if pkg:
-            result["packages"].append(pkg)
-        if any(t in pkg for t in TORCH_PACKAGES):
-            result["uses_torch"] = True
-            if "+cu" in line.lower() or "+cuda" in line.lower():
-                result.setdefault("cuda_mandatory_packages", []).append("torch+cu")
-        if any(t in pkg for t in TF_PACKAGES):
-            result["uses_tensorflow"] = True
-            cv = _extract_version_constraint(line, "tensorflow")
-            if cv:
-                result["tensorflow_version"] = cv
-        if any(c in pkg for c in CUDA_MANDATORY_PACKAGES):
-            result.setdefault("cuda_mandatory_packages", []).append(pkg)
-        for key, name in ML_FRAMEWORKS.items():
-            if key in pkg and name not in result["frameworks"]:
-                result["frameworks"].append(name)
-        if any(l in pkg for l in LIBGL_PACKAGES):
-            result["requires_libgl"] = True
-        if any(f in pkg for f in FFMPEG_PACKAGES):
-            result["requires_ffmpeg"] = True
-        # Version constraints for torch/torchao (for ML compatibility rules)
-        if pkg in ("torch", "torchao"):
-            constraint = _extract_version_constraint(line, pkg)
-            if constraint:
-                result["package_versions"][pkg] = constraint
-        for nb in NATIVE_BUILD_PATTERNS:
-            if nb in pkg:
-                result.setdefault("native_build_backends", []).append(nb)
+        if req is not None:
+            result["dependencies"].append({**req, "line": lineno})
+    _classify_dependencies(result)
     return result
 
 
@@ -124,19 +225,18 @@ def parse_pyproject(path: Path) -> dict[str, Any]:
         "uses_torch": False,
         "uses_tensorflow": False,
         "frameworks": [],
-        "packages": [],
-        "package_versions": {},
         "requires_libgl": False,
         "requires_ffmpeg": False,
         "cuda_mandatory_packages": [],
         "native_build_backends": [],
-        "tensorflow_version": None,
+        "dependencies": [],
     }
     if not path.exists():
         return result
 
     try:
-        data = tomllib.loads(path.read_text())
+        text = path.read_text()
+        data = tomllib.loads(text)
     except Exception:
         return result
 
@@ -151,47 +251,45 @@ def parse_pyproject(path: Path) -> dict[str, Any]:
             deps.extend(opt_deps)
         for dep in deps:
             dep_str = str(dep)
-            pkg = re.split(r"[\[\]>=<!=~\s]", dep_str)[0].lower().replace("_", "-")
-            if pkg and pkg not in result["packages"]:
-                result["packages"].append(pkg)
-            if any(t in pkg for t in TORCH_PACKAGES):
-                result["uses_torch"] = True
-                if "+cu" in dep_str.lower() or "+cuda" in dep_str.lower():
-                    result.setdefault("cuda_mandatory_packages", []).append("torch+cu")
-            if any(t in pkg for t in TF_PACKAGES):
-                result["uses_tensorflow"] = True
-                cv = _extract_version_constraint(dep_str, "tensorflow")
-                if cv:
-                    result["tensorflow_version"] = cv
-            if any(c in pkg for c in CUDA_MANDATORY_PACKAGES):
-                result.setdefault("cuda_mandatory_packages", []).append(pkg)
-            for nb in NATIVE_BUILD_PATTERNS:
-                if nb in pkg:
-                    result.setdefault("native_build_backends", []).append(nb)
-            for key, name in ML_FRAMEWORKS.items():
-                if key in pkg and name not in result["frameworks"]:
-                    result["frameworks"].append(name)
-            if any(l in pkg for l in LIBGL_PACKAGES):
-                result["requires_libgl"] = True
-            if any(f in pkg for f in FFMPEG_PACKAGES):
-                result["requires_ffmpeg"] = True
-            if pkg in ("torch", "torchao"):
-                constraint = _extract_version_constraint(dep_str, pkg)
-                if constraint:
-                    result["package_versions"][pkg] = constraint
+            req = parse_requirement(dep_str)
+            if req is None:
+                continue
+            result["dependencies"].append({**req, "line": _line_of(text, dep_str)})
 
     # Build system (maturin, setuptools-rust, pybind11)
     if "build-system" in data:
         build = data["build-system"]
-        for req in build.get("requires", []):
-            req_str = str(req).lower()
-            for nb in NATIVE_BUILD_PATTERNS:
-                if nb in req_str and nb not in result.get("native_build_backends", []):
-                    result.setdefault("native_build_backends", []).append(nb)
-        backend = str(build.get("build-backend", "")).lower()
-        for nb in NATIVE_BUILD_PATTERNS:
-            if nb in backend and nb not in result.get("native_build_backends", []):
-                result.setdefault("native_build_backends", []).append(nb)
+        for req_str in build.get("requires", []):
+            req = parse_requirement(str(req_str))
+            for cls in classify(req["name"]) if req else ():
+                if cls.startswith("native_build:"):
+                    _append_once(result["native_build_backends"], cls.partition(":")[2])
+        backend = str(build.get("build-backend", "")).split(".")[0].replace("_", "-").lower()
+        for cls in classify(backend):
+            if cls.startswith("native_build:"):
+                _append_once(result["native_build_backends"], cls.partition(":")[2])
+
+    # Poetry dependency tables (main, legacy dev, and [tool.poetry.group.<name>.dependencies])
+    poetry_tool = data.get("tool", {}).get("poetry", {})
+    groups = [g.get("dependencies", {}) for g in poetry_tool.get("group", {}).values() if isinstance(g, dict)]
+    for table in (poetry_tool.get("dependencies", {}), poetry_tool.get("dev-dependencies", {}), *groups):
+        for name, spec in table.items():
+            if name.lower() == "python":
+                continue
+            # One declaration per entry of a multiple-constraints list ([{version, python}, ...])
+            for entry in spec if isinstance(spec, list) else [spec]:
+                entry = entry if isinstance(entry, dict) else {"version": entry}
+                if "version" not in entry and any(k in entry for k in ("git", "path", "url")):
+                    continue
+                req = {
+                    "name": re.sub(r"[-_.]+", "-", name).lower(),
+                    "specifier": poetry_specifier(str(entry.get("version", ""))),
+                    "extras": [str(e).lower() for e in entry.get("extras", [])],
+                    "marker": _poetry_marker(entry),
+                }
+                result["dependencies"].append({**req, "line": _line_of(text, f"{name} =")})
+
+    _classify_dependencies(result)
 
     # Tool.poetry
     if "tool" in data and "poetry" in data:
@@ -208,21 +306,43 @@ def parse_pyproject(path: Path) -> dict[str, Any]:
 
 def parse_package_json(path: Path) -> dict[str, Any]:
     """Parse package.json for name, native modules, and engines."""
-    result: dict[str, Any] = {"name": "", "native_modules": [], "engines_node": None, "has_deps": False}
+    result: dict[str, Any] = {
+        "name": "",
+        "native_modules": [],
+        "engines_node": None,
+        "has_deps": False,
+        "dependencies": [],
+        "workspaces": [],
+    }
     if not path.exists():
         return result
 
     try:
-        data = json.loads(path.read_text())
+        text = path.read_text()
+        data = json.loads(text)
     except Exception:
         return result
 
     result["name"] = data.get("name", "")
+    # npm/yarn: "workspaces": [...] or {"packages": [...]} (yarn classic)
+    workspaces = data.get("workspaces") or []
+    if isinstance(workspaces, dict):
+        workspaces = workspaces.get("packages") or []
+    if isinstance(workspaces, list):
+        result["workspaces"] = [w for w in workspaces if isinstance(w, str)]
     engines = data.get("engines") or {}
     if isinstance(engines, dict) and engines.get("node"):
         result["engines_node"] = engines["node"]
     deps = {**data.get("dependencies", {}), **data.get("devDependencies", {})}
     result["has_deps"] = bool(deps)
+    for key in ("dependencies", "devDependencies", "optionalDependencies", "peerDependencies"):
+        section = data.get(key)
+        if not isinstance(section, dict):
+            continue
+        for pkg, spec in section.items():
+            result["dependencies"].append(
+                {"name": pkg.lower(), "specifier": str(spec), "extras": [], "marker": "", "line": _line_of(text, f'"{pkg}"')}
+            )
     for pkg in deps:
         for pat in NODE_NATIVE_PATTERNS:
             if re.search(pat, pkg, re.I):
@@ -231,9 +351,53 @@ def parse_package_json(path: Path) -> dict[str, Any]:
     return result
 
 
+def parse_pnpm_workspace(path: Path) -> dict[str, Any]:
+    """Parse pnpm-workspace.yaml for member package globs."""
+    result: dict[str, Any] = {"packages": []}
+    if not path.exists():
+        return result
+    try:
+        data = yaml.safe_load(path.read_text()) or {}
+    except Exception:
+        return result
+    packages = data.get("packages") if isinstance(data, dict) else None
+    if isinstance(packages, list):
+        result["packages"] = [p for p in packages if isinstance(p, str)]
+    return result
+
+
+# Crates that bind a system C library without the -sys naming convention
+RUST_SYSTEM_CRATES = {"openssl", "libssh2", "sqlite3", "sodiumoxide", "libgit2"}
+# -sys crates that are pure Rust declarations (OS APIs, JS/wasm bindings, Apple frameworks):
+# nothing is compiled and no C toolchain or pkg-config lookup is involved
+RUST_PURE_SYS_CRATES = {
+    "windows-sys", "linux-raw-sys", "js-sys", "web-sys", "core-foundation-sys", "security-framework-sys",
+    "system-configuration-sys", "io-kit-sys", "fsevent-sys", "inotify-sys", "kqueue-sys",
+}
+
+
+def is_rust_system_crate(name: str) -> bool:
+    """*-sys crates (and a few known bindings) compile or link native C code; pure-Rust -sys crates don't."""
+    name = name.lower()
+    if name in RUST_PURE_SYS_CRATES:
+        return False
+    return name.endswith("-sys") or name in RUST_SYSTEM_CRATES
+
+
 def parse_cargo_toml(path: Path) -> dict[str, Any]:
-    """Parse Cargo.toml for crate name, system libs, rust-version, and target platforms."""
-    result: dict[str, Any] = {"name": "", "system_libs": [], "rust_version": None, "target_platforms": []}
+    """Parse Cargo.toml for crate name, system libs, rust-version, target platforms and [workspace] members."""
+    result: dict[str, Any] = {
+        "name": "",
+        "system_libs": [],
+        "rust_version": None,
+        "rust_version_workspace": False,  # rust-version.workspace = true
+        "links": None,
+        "target_platforms": [],
+        "path_deps": [],
+        "workspace_members": [],
+        "workspace_exclude": [],
+        "workspace_rust_version": None,
+    }
     if not path.exists():
         return result
 
@@ -243,21 +407,39 @@ def parse_cargo_toml(path: Path) -> dict[str, Any]:
         return result
 
     if "package" in data:
-        result["name"] = data["package"].get("name", "")
-        result["rust_version"] = data["package"].get("rust-version")
-
-    SYSTEM_CRATES = {"openssl", "libssh2", "sqlite3", "sodiumoxide", "libgit2"}
-    deps = {**data.get("dependencies", {}), **data.get("build-dependencies", {})}
-    for dep in deps:
-        if dep in SYSTEM_CRATES or "sys" in dep.lower():
-            result["system_libs"].append(dep)
+        package = data["package"]
+        result["name"] = package.get("name", "")
+        rust_version = package.get("rust-version")
+        if isinstance(rust_version, dict):
+            result["rust_version_workspace"] = bool(rust_version.get("workspace"))
+        elif rust_version:
+            result["rust_version"] = str(rust_version)
+        result["links"] = package.get("links")
+
+    workspace = data.get("workspace")
+    if isinstance(workspace, dict):
+        result["workspace_members"] = [m for m in workspace.get("members", []) if isinstance(m, str)]
+        result["workspace_exclude"] = [m for m in workspace.get("exclude", []) if isinstance(m, str)]
+        result["workspace_rust_version"] = (workspace.get("package") or {}).get("rust-version")
 
     # Detect target-specific sections: [target.'cfg(windows)'.dependencies]
     targets = data.get("target", {})
-    for key in targets:
+    sections = [data.get("dependencies", {}), data.get("build-dependencies", {})]
+    for key, target in targets.items():
         # key is like "cfg(windows)" or "x86_64-unknown-linux-gnu"
         if isinstance(key, str):
             result["target_platforms"].append(key)
+        if isinstance(target, dict):
+            sections += [target.get("dependencies", {}), target.get("build-dependencies", {})]
+
+    for section in sections:
+        for dep, spec in section.items():
+            # `package = "..."` renames: the real crate decides whether it is a system crate
+            crate = spec.get("package", dep) if isinstance(spec, dict) else dep
+            if is_rust_system_crate(crate) and crate not in result["system_libs"]:
+                result["system_libs"].append(crate)
+            if isinstance(spec, dict) and "path" in spec and crate not in result["path_deps"]:
+                result["path_deps"].append(crate)
 
     return result
 
@@ -290,40 +472,20 @@ def parse_go_mod(path: Path) -> dict[str, Any]:
     return result
 
 
-def scan_go_build_tags(repo_path: Path) -> list[str]:
-    """Scan .go files for OS-specific build tags."""
-    tags = []
-    try:
-        for go_file in repo_path.rglob("*.go"):
-            # Skip vendor, testdata
-            parts = go_file.relative_to(repo_path).parts
-            if any(p in ("vendor", "testdata", ".git", "node_modules") for p in parts):
-                continue
-            try:
-                head = go_file.read_text(errors="replace")[:500]
-            except Exception:
-                continue
-            for line in head.splitlines():
-                line = line.strip()
-                if not line.startswith("//"):
-                    if line and not line.startswith("package"):
-                        break
-                    continue
-                if "go:build" in line or "+build" in line:
-                    for os_tag in ("linux", "darwin", "windows", "freebsd"):
-                        if os_tag in line:
-                            if os_tag not in tags:
-                                tags.append(os_tag)
-    except Exception:
-        pass
-    return tags
+_ARG_REF = re.compile(r"\$\{?([A-Za-z_][A-Za-z0-9_]*)\}?")
 
 
 def parse_dockerfile(path: Path) -> dict[str, Any]:
-    """Parse Dockerfile for base image, platform, Python."""
+    """
+    Parse Dockerfile for base image, platform, Python. Python, CUDA and architectures
+    the base image ships come from the base-image index when the FROM line doesn't say.
+    """
     result: dict[str, Any] = {
         "has_cuda": False,
         "python_version": None,
+        "python_from_image": False,
+        "cuda_version": None,
+        "image_archs": (),
         "platform_amd64": False,
         "base_image": None,
     }
@@ -332,16 +494,19 @@ def parse_dockerfile(path: Path) -> dict[str, Any]:
 
     content = path.read_text(errors="replace")
     result["has_cuda"] = "cuda" in content.lower() or "nvidia" in content.lower()
+    args: dict[str, str] = {}
     for line in content.splitlines():
         stripped = line.strip()
+        if stripped.upper().startswith("ARG ") and not result["base_image"]:
+            # ARG before FROM parameterizes the base image: ARG PY=3.11 / FROM python:${PY}-slim
+            name, _, default = stripped[4:].strip().partition("=")
+            if default:
+                args[name.strip()] = default.strip().strip("\"'")
         if stripped.upper().startswith("FROM "):
-            # FROM image[:tag] [AS name]; skip --platform= and ARG
-            rest = stripped[5:].strip()
-            if rest and not result.get("base_image"):
-                base = rest.split()[0] if rest.split() else rest
-                if "AS " in base.upper():
-                    base = base.upper().split(" AS ")[0].strip()
-                result["base_image"] = base
+            # FROM [--platform=...] image[:tag] [AS name]
+            tokens = [t for t in stripped[5:].split() if not t.startswith("--")]
+            if tokens and not result.get("base_image"):
+                result["base_image"] = _ARG_REF.sub(lambda m: args.get(m.group(1), m.group(0)), tokens[0])
         if "python:" in line.lower() or "python=" in line.lower():
             m = re.search(r"python[:\s]*([\d.]+)", line, re.I)
             if m:
@@ -349,6 +514,15 @@ def parse_dockerfile(path: Path) -> dict[str, Any]:
         if "--platform=" in line.lower() or "platform=" in line.lower():
             if "amd64" in line.lower() or "x86_64" in line.lower():
                 result["platform_amd64"] = True
+
+    image = lookup_image(result["base_image"]) if result["base_image"] and "$" not in result["base_image"] else None
+    if image:
+        if not result["python_version"] and image["python"]:
+            result["python_version"] = image["python"]
+            result["python_from_image"] = True
+        result["cuda_version"] = image["cuda"]
+        result["has_cuda"] = result["has_cuda"] or bool(image["cuda"])
+        result["image_archs"] = image["archs"]
     return result
 
 
@@ -1,9 +1,30 @@
 """Repo scanner - discovers configs recursively, parses, merges profiles."""
 
+import posixpath
+from collections import deque
 from pathlib import Path
-
-from ..models import RepoProfile
+from typing import Any, Callable
+
+import yaml
+
+from ..models import (
+    Dependency,
+    DependencyIndex,
+    DockerfileInfo,
+    RepoProfile,
+    WorkflowInfo,
+    WorkspaceMember,
+    normalize_name,
+)
+from ..rules.yaml_loader import load_yaml_rules
 from .ast_scan import scan_python_tree
+from .lockfiles import NODE_LOCK_PARSERS, NODE_LOCKFILES, PYTHON_LOCKFILES, parse_cargo_lock, parse_python_lock
+from .gosrc import scan_go_sources
+from .memo import PARSE_MEMO, file_digest, object_digest
+from .binaries import scan_binaries
+from .native_scan import scan_native_tree
+from .vfs import VirtualPath, open_tree
+from .workspaces import expand_members
 from .parsers import (
     parse_cargo_toml,
     parse_docker_compose,
@@ -11,27 +32,58 @@ from .parsers import (
     parse_env,
     parse_go_mod,
     parse_package_json,
+    parse_pnpm_workspace,
     parse_pyproject,
     parse_requirements,
     parse_setup_py,
     parse_workflow,
-    scan_go_build_tags,
 )
 
 SKIP_PARTS = {".git", "__pycache__", ".venv", "venv", "node_modules", ".tox", "build", "dist", "eggs", "tests"}
 MAX_CONFIGS = 20  # Cap discovery to avoid huge monorepos
-
-
-def _should_skip(path: Path, repo_root: Path) -> bool:
-    """Skip paths inside ignored directories."""
+MAX_REQUIREMENT_FILES = 50  # Cap on files reached through -r / -c includes
+
+# Basename patterns for discovered configs (also used to pick archive members to read)
+CONFIG_PATTERNS = [
+    ("pyproject.toml", "pyproject"),
+    ("requirements*.txt", "requirements"),
+    ("setup.py", "setup_py"),
+    ("package.json", "package_json"),
+    ("Cargo.toml", "cargo"),
+    ("go.mod", "go_mod"),
+    ("Dockerfile", "dockerfile"),
+    ("docker-compose*.yml", "docker_compose"),
+    ("docker-compose*.yaml", "docker_compose"),
+    (".env", "env"),
+]
+
+
+def _should_skip(path: Path, repo_root: Path, exclude: tuple[str, ...] = ()) -> bool:
+    """Skip paths inside ignored directories (and excluded repo-relative subtrees)."""
     try:
         rel = path.relative_to(repo_root)
     except ValueError:
         return True
+    if exclude and _in_subtree(rel.as_posix(), exclude):
+        return True
     return any(part in rel.parts for part in SKIP_PARTS)
 
 
-def _discover_configs(repo_path: Path) -> dict[str, list[Path]]:
+def _in_subtree(rel: str, dirs: tuple[str, ...]) -> bool:
+    """True if repo-relative POSIX path rel is one of dirs or lies below one."""
+    return any(rel == d or rel.startswith(d + "/") for d in dirs)
+
+
+def _parse(parser: Callable[[Path], dict[str, Any]], path: Path) -> dict[str, Any]:
+    """parser(path), shared across byte-identical files through the content memo."""
+    try:
+        key = file_digest(path)
+    except OSError:
+        return parser(path)
+    return PARSE_MEMO.get(parser.__name__, key, lambda: parser(path))
+
+
+def _discover_configs(repo_path: Path, exclude: tuple[str, ...] = ()) -> dict[str, list[Path]]:
     """Recursively discover config files. Returns {type: [paths]}."""
     found: dict[str, list[Path]] = {
         "pyproject": [],
@@ -45,22 +97,11 @@ def _discover_configs(repo_path: Path) -> dict[str, list[Path]]:
         "env": [],
     }
     count = 0
-    for pattern, key in [
-        ("pyproject.toml", "pyproject"),
-        ("requirements*.txt", "requirements"),
-        ("setup.py", "setup_py"),
-        ("package.json", "package_json"),
-        ("Cargo.toml", "cargo"),
-        ("go.mod", "go_mod"),
-        ("Dockerfile", "dockerfile"),
-        ("docker-compose*.yml", "docker_compose"),
-        ("docker-compose*.yaml", "docker_compose"),
-        (".env", "env"),
-    ]:
+    for pattern, key in CONFIG_PATTERNS:
         for p in repo_path.rglob(pattern):
             if count >= MAX_CONFIGS:
                 return found
-            if _should_skip(p, repo_path):
+            if _should_skip(p, repo_path, exclude):
                 continue
             found[key].append(p)
             count += 1
@@ -86,6 +127,93 @@ def _is_root(path: Path, repo_root: Path) -> bool:
         return False
 
 
+def _resolve_include(including: Path, target: str, repo_path: Path) -> Path | None:
+    """-r / -c target relative to the including file; None for URLs and paths leaving the repo."""
+    if "://" in target:
+        return None
+    try:
+        base = including.parent.relative_to(repo_path).as_posix()
+    except ValueError:
+        return None
+    rel = posixpath.normpath(posixpath.join(base, target))
+    if rel == ".." or rel.startswith("../") or posixpath.isabs(rel):
+        return None
+    return repo_path / rel
+
+
+def _requirements_graph(roots: list[Path], repo_path: Path) -> dict[str, Any]:
+    """
+    Follow -r / -c includes from the discovered requirements files. Each file is a node
+    parsed once, however many variants include it. Returns the parsed nodes, the files
+    pip would install from (reachable through -r), the constraint-only files, and
+    include cycles as file chains.
+    """
+    nodes: dict[Path, dict[str, Any]] = {}
+    edges: dict[Path, list[tuple[Path, str]]] = {}
+    pending = deque(roots)
+    while pending and len(nodes) < MAX_REQUIREMENT_FILES:
+        p = pending.popleft()
+        if p in nodes:
+            continue
+        nodes[p] = data = _parse(parse_requirements, p)
+        edges[p] = []
+        for kind, targets in (("include", data.get("includes", [])), ("constraint", data.get("constraints", []))):
+            for target in targets:
+                q = _resolve_include(p, target, repo_path)
+                if q is not None and q.is_file():
+                    edges[p].append((q, kind))
+                    pending.append(q)
+
+    installed = list(dict.fromkeys(roots))
+    for p in installed:  # grows while iterating: breadth-first over -r edges
+        for q, kind in edges.get(p, ()):
+            if kind == "include" and q in nodes and q not in installed:
+                installed.append(q)
+
+    cycles: list[list[Path]] = []
+    state: dict[Path, int] = {}  # 1 = on the DFS stack, 2 = done
+    for root in roots:
+        if root in state:
+            continue
+        stack: list[tuple[Path, Any]] = [(root, iter(edges.get(root, ())))]
+        state[root] = 1
+        while stack:
+            p, it = stack[-1]
+            nxt = next(it, None)
+            if nxt is None:
+                state[p] = 2
+                stack.pop()
+                continue
+            q = nxt[0]
+            if state.get(q) == 1:
+                chain = [n for n, _ in stack]
+                cycles.append(chain[chain.index(q) :] + [q])
+            elif q not in state and q in nodes:
+                state[q] = 1
+                stack.append((q, iter(edges.get(q, ()))))
+
+    return {
+        "nodes": nodes,
+        "installed": installed,
+        "constraints": [p for p in nodes if p not in installed],
+        "cycles": cycles,
+    }
+
+
+def _go_import_path(rel_dir: str, modules: list[tuple[str, str]]) -> str:
+    """Import path of a repo-relative package dir, from the innermost go.mod above it."""
+    best = max(
+        (m for m in modules if m[0] == "." or rel_dir == m[0] or rel_dir.startswith(m[0] + "/")),
+        key=lambda m: len(m[0]) if m[0] != "." else 0,
+        default=None,
+    )
+    if best is None:
+        return rel_dir
+    root, module = best
+    sub = rel_dir if root == "." else rel_dir[len(root) + 1 :]
+    return f"{module}/{sub}" if sub and sub != "." else module
+
+
 def _is_generic_name(name: str) -> bool:
     """True if name looks like a template/default (my-app, t3-app, etc.)."""
     if not name:
@@ -109,18 +237,69 @@ def _rel_path(path: Path, repo_root: Path) -> str:
         return str(path)
 
 
-def scan_repo(path: str | Path) -> RepoProfile:
-    """Scan a repository recursively; discover subprojects, merge profiles."""
-    repo_path = Path(path).resolve()
+def scan_repo(path: str | Path | VirtualPath, ref: str | None = None, exclude: tuple[str, ...] = ()) -> RepoProfile:
+    """
+    Scan a repository recursively; discover subprojects, merge profiles.
+    path may be a checkout, a bare git mirror (read at ref, default HEAD), a source
+    archive (.tar, .tar.gz, .zip, sdist; streamed, never extracted), or a VirtualPath.
+    exclude lists subdirectories (relative to path) to leave out, e.g. nested
+    subprojects that are scanned on their own.
+    """
+    repo_path = open_tree(path, ref)
     if not repo_path.is_dir():
         raise NotADirectoryError(f"Not a directory: {repo_path}")
 
     profile = RepoProfile(path=str(repo_path), name="")
-    configs = _discover_configs(repo_path)
+    exclude = tuple(e.strip("/") for e in exclude if e.strip("/") not in ("", "."))
+    configs = _discover_configs(repo_path, exclude)
 
     # Track project roots we've seen (avoid duplicate subprojects)
     seen_roots: set[Path] = set()
     python_versions: list[str] = []
+    dependencies: list[Dependency] = []
+
+    def add_dependencies(config: Path, data: dict[str, Any], ecosystem: str) -> None:
+        source = _rel_path(config, repo_path)
+        for d in data.get("dependencies", []):
+            dependencies.append(
+                Dependency(
+                    name=normalize_name(d["name"], ecosystem),
+                    specifier=d.get("specifier", ""),
+                    extras=tuple(d.get("extras", ())),
+                    marker=d.get("marker", ""),
+                    ecosystem=ecosystem,
+                    source=source,
+                    line=d.get("line", 0),
+                )
+            )
+
+    def merge_python_flags(data: dict[str, Any]) -> None:
+        profile.uses_torch = profile.uses_torch or data["uses_torch"]
+        profile.uses_tensorflow = profile.uses_tensorflow or data["uses_tensorflow"]
+        for fw in data["frameworks"]:
+            if fw not in profile.frameworks:
+                profile.frameworks.append(fw)
+        profile.requires_libgl = profile.requires_libgl or data.get("requires_libgl", False)
+        profile.requires_ffmpeg = profile.requires_ffmpeg or data.get("requires_ffmpeg", False)
+        for pkg in data.get("cuda_mandatory_packages", []):
+            if pkg not in profile.cuda_mandatory_packages:
+                profile.cuda_mandatory_packages.append(pkg)
+        for nb in data.get("native_build_backends", []):
+            if nb not in profile.native_build_backends:
+                profile.native_build_backends.append(nb)
+
+    lock_roots: set[Path] = set()
+
+    def add_python_lock(root: Path) -> None:
+        """Resolved (transitive) packages from the project's lockfile, once per root."""
+        if root in lock_roots:
+            return
+        lock_roots.add(root)
+        lock = next((root / n for n in PYTHON_LOCKFILES if (root / n).is_file()), None)
+        if lock is not None:
+            data = _parse(parse_python_lock, lock)
+            merge_python_flags(data)
+            add_dependencies(lock, data, "python")
 
     def add_subproject(root: Path, ptype: str, **kwargs) -> None:
         rel = _rel_path(root, repo_path)
@@ -131,131 +310,208 @@ def scan_repo(path: str | Path) -> RepoProfile:
     # Pyproject
     for p in configs["pyproject"]:
         root = _project_root(p)
-        data = parse_pyproject(p)
+        data = _parse(parse_pyproject, p)
         if data["name"] and not profile.name:
             profile.name = data["name"]
         if data["python_version"]:
             profile.python_version = profile.python_version or data["python_version"]
             python_versions.append(data["python_version"])
-        profile.uses_torch = profile.uses_torch or data["uses_torch"]
-        profile.uses_tensorflow = profile.uses_tensorflow or data["uses_tensorflow"]
-        for fw in data["frameworks"]:
-            if fw not in profile.frameworks:
-                profile.frameworks.append(fw)
-        profile.requires_libgl = profile.requires_libgl or data.get("requires_libgl", False)
-        profile.requires_ffmpeg = profile.requires_ffmpeg or data.get("requires_ffmpeg", False)
-        for pkg in data.get("cuda_mandatory_packages", []):
-            if pkg not in profile.cuda_mandatory_packages:
-                profile.cuda_mandatory_packages.append(pkg)
-        for nb in data.get("native_build_backends", []):
-            profile.raw.setdefault("native_build_backends", [])
-            if nb not in profile.raw["native_build_backends"]:
-                profile.raw["native_build_backends"].append(nb)
+        merge_python_flags(data)
         profile.has_pyproject = True
         add_subproject(root, "python", python_version=data.get("python_version"))
-        profile.raw.setdefault("pyproject", {})  # keep first/merged; subprojects in raw
-        if "pyproject" not in profile.raw or not profile.raw["pyproject"]:
-            profile.raw["pyproject"] = data
-
-    # Requirements
+        add_dependencies(p, data, "python")
+        add_python_lock(root)
+
+    # Requirements: discovered files are roots; -r / -c includes are followed as a graph
+    graph = _requirements_graph(configs["requirements"], repo_path)
+    pins = {
+        d["name"]: d["specifier"]
+        for c in graph["constraints"]
+        for d in graph["nodes"][c]["dependencies"]
+        if d["specifier"]
+    }
+    for p in graph["installed"]:
+        data = graph["nodes"][p]
+        merge_python_flags(data)
+        if pins:
+            # -c files only pin versions; they never add packages
+            data = {
+                **data,
+                "dependencies": [
+                    {**d, "specifier": d["specifier"] or pins.get(d["name"], "")} for d in data["dependencies"]
+                ],
+            }
+        add_dependencies(p, data, "python")
+    profile.requirements_cycles = [[_rel_path(p, repo_path) for p in chain] for chain in graph["cycles"]]
     for p in configs["requirements"]:
         root = _project_root(p)
-        data = parse_requirements(p)
-        profile.uses_torch = profile.uses_torch or data["uses_torch"]
-        profile.uses_tensorflow = profile.uses_tensorflow or data["uses_tensorflow"]
-        for fw in data["frameworks"]:
-            if fw not in profile.frameworks:
-                profile.frameworks.append(fw)
-        profile.requires_libgl = profile.requires_libgl or data.get("requires_libgl", False)
-        profile.requires_ffmpeg = profile.requires_ffmpeg or data.get("requires_ffmpeg", False)
-        for pkg in data.get("cuda_mandatory_packages", []):
-            if pkg not in profile.cuda_mandatory_packages:
-                profile.cuda_mandatory_packages.append(pkg)
-        for nb in data.get("native_build_backends", []):
-            profile.raw.setdefault("native_build_backends", [])
-            if nb not in profile.raw["native_build_backends"]:
-                profile.raw["native_build_backends"].append(nb)
         profile.has_requirements_txt = True
         if root not in seen_roots:
             add_subproject(root, "python")
-        profile.raw.setdefault("requirements", data)
+        add_python_lock(root)
 
     # Setup.py
     for p in configs["setup_py"]:
         root = _project_root(p)
-        data = parse_setup_py(p)
+        data = _parse(parse_setup_py, p)
         if data["python_version"] and not profile.python_version:
             profile.python_version = data["python_version"]
             python_versions.append(data["python_version"])
         profile.has_setup_py = True
         add_subproject(root, "python", python_version=data.get("python_version"))
-        profile.raw.setdefault("setup_py", data)
 
-    # Package.json (skip generic names like my-t3-app - prefer folder name)
+    # Node workspaces: members come from the root's globs (npm/yarn "workspaces",
+    # pnpm-workspace.yaml), not the capped discovery; each resolves to the root's lock
+    package_jsons = list(configs["package_json"])
+    workspace_of: dict[Path, Path] = {}  # member package.json -> workspace root
     for p in configs["package_json"]:
         root = _project_root(p)
-        data = parse_package_json(p)
+        patterns = list(_parse(parse_package_json, p).get("workspaces", []))
+        if (root / "pnpm-workspace.yaml").is_file():
+            patterns += _parse(parse_pnpm_workspace, root / "pnpm-workspace.yaml")["packages"]
+        for member in expand_members(root, patterns, "package.json") if patterns else ():
+            mp = member / "package.json"
+            if _should_skip(mp, repo_path, exclude) or mp in workspace_of:
+                continue
+            workspace_of[mp] = root
+            if mp not in package_jsons:
+                package_jsons.append(mp)
+
+    # Package.json (skip generic names like my-t3-app - prefer folder name)
+    node_members: list[tuple[Path, dict[str, Any], list[str]]] = []
+    for p in package_jsons:
+        root = _project_root(p)
+        data = _parse(parse_package_json, p)
         if data["name"] and not profile.name and not _is_generic_name(data["name"]):
             profile.name = data["name"]
-        profile.node_native_modules = list(
-            dict.fromkeys(profile.node_native_modules + data.get("native_modules", []))
-        )
+        native = list(data.get("native_modules", []))
         if data.get("engines_node") and not profile.node_engine_spec:
             profile.node_engine_spec = data["engines_node"]
-        if data.get("has_deps") and not (root / "package-lock.json").exists() and not (root / "yarn.lock").exists():
+        lock_root = workspace_of.get(p, root)
+        lock = next((lock_root / n for n in NODE_LOCKFILES if (lock_root / n).is_file()), None)
+        if lock is not None:
+            # Transitive addons: the lock knows what actually compiles on install
+            # (a workspace lock is attributed to its root, not to every member)
+            if p not in workspace_of:
+                native += _parse(NODE_LOCK_PARSERS[lock.name], lock).get("native_modules", [])
+        elif data.get("has_deps"):
             profile.node_lock_file_missing = True
+        profile.node_native_modules = list(dict.fromkeys(profile.node_native_modules + native))
         profile.has_package_json = True
         add_subproject(root, "node")
-        profile.raw.setdefault("package_json", data)
+        add_dependencies(p, data, "node")
+        if p in workspace_of:
+            node_members.append((root, data, native))
+    member_names = {data["name"] for _, data, _ in node_members if data["name"]}
+    for root, data, native in node_members:
+        profile.workspace_members.append(
+            WorkspaceMember(
+                path=_rel_path(root, repo_path),
+                name=data["name"],
+                ecosystem="node",
+                version_req=data.get("engines_node"),
+                native=tuple(native),
+                depends_on=tuple(sorted({d["name"] for d in data["dependencies"]} & member_names - {data["name"]})),
+            )
+        )
 
-    # Cargo
+    # Cargo workspaces: members come from the root manifest's globs, not the capped discovery
+    cargo_tomls = list(configs["cargo"])
+    crate_workspace: dict[Path, Path] = {}  # member Cargo.toml -> workspace root Cargo.toml
     for p in configs["cargo"]:
+        data = _parse(parse_cargo_toml, p)
+        if not data.get("workspace_members"):
+            continue
+        members = expand_members(
+            _project_root(p), data["workspace_members"], "Cargo.toml", tuple(data["workspace_exclude"])
+        )
+        for member in members:
+            mp = member / "Cargo.toml"
+            if _should_skip(mp, repo_path, exclude) or mp in crate_workspace:
+                continue
+            crate_workspace[mp] = p
+            if mp not in cargo_tomls:
+                cargo_tomls.append(mp)
+
+    # Cargo
+    rust_members: list[tuple[Path, dict[str, Any], str | None, list[str]]] = []
+    cargo_locks: set[Path] = set()
+    for p in cargo_tomls:
         root = _project_root(p)
-        data = parse_cargo_toml(p)
+        data = _parse(parse_cargo_toml, p)
+        workspace = crate_workspace.get(p)
         if data["name"] and not profile.name:
             profile.name = data["name"]
-        profile.rust_system_libs = list(
-            dict.fromkeys(profile.rust_system_libs + data.get("system_libs", []))
-        )
+        rust_version = data["rust_version"]
+        if rust_version is None and data.get("rust_version_workspace") and workspace is not None:
+            rust_version = _parse(parse_cargo_toml, workspace)["workspace_rust_version"]
+        system_libs = list(data.get("system_libs", []))
+        if data.get("links") and data["name"]:
+            system_libs.append(data["name"])  # `links = "..."`: the crate itself binds a native library
+        profile.rust_system_libs = list(dict.fromkeys(profile.rust_system_libs + system_libs))
+        lock = _project_root(workspace or p) / "Cargo.lock"
+        if lock not in cargo_locks and lock.is_file():
+            # Transitive -sys crates: only the lock sees what the whole crate graph pulls in
+            cargo_locks.add(lock)
+            locked = _parse(parse_cargo_lock, lock).get("system_crates", [])
+            profile.rust_system_libs = list(dict.fromkeys(profile.rust_system_libs + locked))
         profile.has_cargo_toml = True
         add_subproject(root, "rust")
-        profile.raw.setdefault("cargo", data)
-        if data.get("rust_version") and not profile.rust_version_req:
-            profile.rust_version_req = data["rust_version"]
+        if rust_version and not profile.rust_version_req:
+            profile.rust_version_req = rust_version
         profile.rust_target_platforms = list(
             dict.fromkeys(profile.rust_target_platforms + data.get("target_platforms", []))
         )
+        if workspace is not None:
+            rust_members.append((root, data, rust_version, system_libs))
+    crate_names = {data["name"] for _, data, _, _ in rust_members if data["name"]}
+    for root, data, rust_version, system_libs in rust_members:
+        profile.workspace_members.append(
+            WorkspaceMember(
+                path=_rel_path(root, repo_path),
+                name=data["name"],
+                ecosystem="rust",
+                version_req=rust_version,
+                native=tuple(dict.fromkeys(system_libs)),
+                depends_on=tuple(sorted(set(data.get("path_deps", [])) & crate_names - {data["name"]})),
+            )
+        )
 
     # Go
+    go_modules: list[tuple[str, str]] = []  # (repo-relative module root, module path)
     for p in configs["go_mod"]:
         root = _project_root(p)
-        data = parse_go_mod(p)
+        data = _parse(parse_go_mod, p)
         profile.has_go_mod = True
         if data["go_version"]:
             profile.go_version = data["go_version"]
         profile.go_cgo_deps = list(dict.fromkeys(profile.go_cgo_deps + data.get("cgo_deps", [])))
         if data["module"] and not profile.name:
             profile.name = data["module"].rsplit("/", 1)[-1]
+        if data["module"]:
+            go_modules.append((_rel_path(root, repo_path), data["module"]))
         add_subproject(root, "go")
-        profile.raw.setdefault("go_mod", data)
 
-    # Go build tags
+    # Go sources: build constraints and `import "C"` from file headers
     if profile.has_go_mod:
-        profile.go_os_specific_tags = scan_go_build_tags(repo_path)
+        go_src = scan_go_sources(repo_path, exclude)
+        profile.go_os_specific_tags = go_src["os_tags"]
+        cgo_packages = [_go_import_path(d, go_modules) for d in go_src["cgo_dirs"]]
+        profile.go_cgo_deps = list(dict.fromkeys(profile.go_cgo_deps + cgo_packages))
 
     # Dockerfile (only root-level Dockerfiles define canonical Python for spec drift)
     for p in configs["dockerfile"]:
         root = _project_root(p)
-        data = parse_dockerfile(p)
+        data = _parse(parse_dockerfile, p)
         is_root_docker = _is_root(root, repo_path)
         profile.has_dockerfile = True
         profile.dockerfile_has_cuda = profile.dockerfile_has_cuda or data.get("has_cuda", False)
         profile.docker_platform_amd64 = profile.docker_platform_amd64 or data.get("platform_amd64", False)
-        if is_root_docker and data["python_version"] and not profile.python_version:
+        if is_root_docker and data["python_version"] and not data["python_from_image"] and not profile.python_version:
             profile.python_version = data["python_version"]
         add_subproject(root, "docker")
-        if is_root_docker:
-            profile.raw.setdefault("dockerfile", data)
+        if is_root_docker and profile.dockerfile is None:
+            profile.dockerfile = DockerfileInfo.from_parsed(data)
 
     # Devcontainer
     profile.has_devcontainer = (
@@ -266,14 +522,14 @@ def scan_repo(path: str | Path) -> RepoProfile:
     # Docker Compose and .env (root only for ports)
     for p in (repo_path / "docker-compose.yml", repo_path / "docker-compose.yaml"):
         if p.exists():
-            data = parse_docker_compose(p)
+            data = _parse(parse_docker_compose, p)
             for port in data.get("ports", []):
                 if port not in profile.required_ports:
                     profile.required_ports.append(port)
             break
     env_path = repo_path / ".env"
     if env_path.exists():
-        data = parse_env(env_path)
+        data = _parse(parse_env, env_path)
         for port in data.get("ports", []):
             if port not in profile.required_ports:
                 profile.required_ports.append(port)
@@ -283,14 +539,16 @@ def scan_repo(path: str | Path) -> RepoProfile:
     if workflows_path.is_dir():
         for wf in workflows_path.glob("*.yml"):
             profile.github_workflows.append(wf.stem)
-            profile.raw.setdefault("workflows", {})[wf.stem] = parse_workflow(wf)
+            profile.workflows[wf.stem] = WorkflowInfo.from_parsed(_parse(parse_workflow, wf))
         for wf in workflows_path.glob("*.yaml"):
             if wf.stem not in profile.github_workflows:
                 profile.github_workflows.append(wf.stem)
-                profile.raw.setdefault("workflows", {})[wf.stem] = parse_workflow(wf)
+                profile.workflows[wf.stem] = WorkflowInfo.from_parsed(_parse(parse_workflow, wf))
+
+    profile.dependencies = DependencyIndex(tuple(dependencies))
 
     # Python AST scan
-    ast_data = scan_python_tree(repo_path)
+    ast_data = scan_python_tree(repo_path, exclude=exclude)
     profile.uses_torch = profile.uses_torch or ast_data["uses_torch"]
     profile.uses_tensorflow = profile.uses_tensorflow or ast_data["uses_tensorflow"]
     if ast_data["requires_cuda"]:
@@ -298,23 +556,55 @@ def scan_repo(path: str | Path) -> RepoProfile:
         profile.cuda_optional = ast_data.get("cuda_optional", False)
         profile.cuda_files = list(dict.fromkeys(ast_data.get("cuda_files", [])))
         profile.cuda_usages = ast_data.get("cuda_usages", [])
+
+    # C/C++/CUDA sources and build files (CMake, setup.py CUDAExtension)
+    native_data = scan_native_tree(repo_path, exclude=exclude)
+    if native_data["requires_cuda"]:
+        profile.requires_cuda = True
+        if not ast_data["requires_cuda"]:
+            profile.cuda_optional = True
+        if native_data["cuda_mandatory"]:
+            profile.cuda_optional = False  # kernels / CUDA language: nvcc needed to build at all
+        profile.cuda_files = list(dict.fromkeys(profile.cuda_files + native_data["cuda_files"]))
+        profile.cuda_usages = profile.cuda_usages + native_data["cuda_usages"]
     if profile.cuda_mandatory_packages:
         profile.requires_cuda = True
         profile.cuda_optional = False  # bitsandbytes etc have no CPU fallback
 
-    if profile.raw.get("workflows"):
-        for wf_data in profile.raw["workflows"].values():
-            runs = wf_data.get("runs_on", [])
-            if any("windows" in str(r).lower() for r in runs):
+    # Prebuilt libraries and vendored wheels: target OS / arch from headers and wheel tags
+    profile.binary_artifacts = scan_binaries(repo_path, exclude=exclude)
+
+    if profile.workflows:
+        for wf in profile.workflows.values():
+            if any("windows" in r.lower() for r in wf.runs_on):
                 profile.os_specific = True
                 break
 
+    # Repo-local engine config, read here so rules never touch the filesystem
+    profile.repofail_config = _read_yaml(repo_path / ".repofail.yaml") or {}
+    profile.yaml_rules = load_yaml_rules(repo_path)
+    profile.has_native_install = any(
+        (repo_path / f).exists() for f in ("Makefile", "makefile", "pyproject.toml", "requirements.txt")
+    )
+
     if not profile.name:
         profile.name = _derive_repo_name(repo_path)
 
+    # Everything rules can see (path and name never reach a rule), for result reuse
+    profile.content_digest = object_digest(profile, exclude=("path", "name", "content_digest"))
     return profile
 
 
+def _read_yaml(path) -> Any:
+    """Parse a YAML file, or None if missing/invalid."""
+    if not path.exists():
+        return None
+    try:
+        return yaml.safe_load(path.read_text())
+    except Exception:
+        return None
+
+
 def _derive_repo_name(repo_path: Path) -> str:
     """
     Fallback repo name: directory name, humanized.
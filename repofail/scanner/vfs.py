@@ -0,0 +1,186 @@
+"""Virtual filesystem - lets scan_repo read trees that are not checked out on disk.
+
+A VirtualTree maps repo-relative POSIX paths to file contents (bytes, or a loader
+called on first read). VirtualPath implements the subset of pathlib.Path the
+scanner uses (/, exists, is_dir, read_text, rglob, glob, relative_to, ...), so
+parsers and detectors run unchanged against git objects or archive members.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import io
+from pathlib import Path, PurePosixPath
+from typing import Callable, Iterator, Union
+
+FileSource = Union[bytes, Callable[[], bytes], None]  # None = present but content not retained
+
+
+class VirtualTree:
+    """Immutable file listing with lazily loaded contents."""
+
+    def __init__(self, label: str, files: dict[str, FileSource], name: str | None = None) -> None:
+        self.label = label  # shown as the repo path, e.g. /mirrors/app.git
+        self.name = name or PurePosixPath(label).name
+        self._files = files
+        self._sorted = tuple(sorted(files))
+        self._children: dict[tuple[str, ...], set[str]] = {(): set()}
+        for rel in files:
+            parts = tuple(PurePosixPath(rel).parts)
+            for i in range(len(parts)):
+                self._children.setdefault(parts[:i], set()).add(parts[i])
+
+    def root(self) -> "VirtualPath":
+        return VirtualPath(self, ())
+
+    def is_file(self, parts: tuple[str, ...]) -> bool:
+        return "/".join(parts) in self._files
+
+    def is_dir(self, parts: tuple[str, ...]) -> bool:
+        return parts in self._children
+
+    def children(self, parts: tuple[str, ...]) -> list[str]:
+        return sorted(self._children.get(parts, ()))
+
+    def files(self) -> tuple[str, ...]:
+        return self._sorted
+
+    def read(self, parts: tuple[str, ...]) -> bytes:
+        key = "/".join(parts)
+        if key not in self._files:
+            raise FileNotFoundError(f"{self.label}/{key}")
+        src = self._files[key]
+        if callable(src):
+            src = src()
+        return src or b""
+
+
+class VirtualPath:
+    """Path-like handle into a VirtualTree. Only what the scanner needs."""
+
+    __slots__ = ("_tree", "_parts")
+
+    def __init__(self, tree: VirtualTree, parts: tuple[str, ...]) -> None:
+        self._tree = tree
+        self._parts = parts
+
+    # Identity and display
+    def __str__(self) -> str:
+        return "/".join((self._tree.label, *self._parts))
+
+    def __repr__(self) -> str:
+        return f"VirtualPath({str(self)!r})"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, VirtualPath) and other._tree is self._tree and other._parts == self._parts
+
+    def __hash__(self) -> int:
+        return hash((id(self._tree), self._parts))
+
+    def __lt__(self, other: "VirtualPath") -> bool:
+        return self._parts < other._parts
+
+    def __truediv__(self, other: str) -> "VirtualPath":
+        return VirtualPath(self._tree, self._parts + tuple(PurePosixPath(str(other)).parts))
+
+    def as_posix(self) -> str:
+        return str(self)
+
+    @property
+    def tree(self) -> VirtualTree:
+        return self._tree
+
+    @property
+    def name(self) -> str:
+        return self._parts[-1] if self._parts else self._tree.name
+
+    @property
+    def stem(self) -> str:
+        return PurePosixPath(self.name).stem
+
+    @property
+    def suffix(self) -> str:
+        return PurePosixPath(self.name).suffix
+
+    @property
+    def parent(self) -> "VirtualPath":
+        return VirtualPath(self._tree, self._parts[:-1]) if self._parts else self
+
+    @property
+    def parts(self) -> tuple[str, ...]:
+        return (self._tree.label, *self._parts)
+
+    def resolve(self) -> "VirtualPath":
+        return self
+
+    def relative_to(self, other: "VirtualPath") -> PurePosixPath:
+        if not isinstance(other, VirtualPath) or other._tree is not self._tree:
+            raise ValueError(f"{self} is not in the subpath of {other}")
+        n = len(other._parts)
+        if self._parts[:n] != other._parts:
+            raise ValueError(f"{self} is not in the subpath of {other}")
+        return PurePosixPath(*self._parts[n:]) if len(self._parts) > n else PurePosixPath(".")
+
+    # Queries
+    def exists(self) -> bool:
+        return self._tree.is_file(self._parts) or self._tree.is_dir(self._parts)
+
+    def is_file(self) -> bool:
+        return self._tree.is_file(self._parts)
+
+    def is_dir(self) -> bool:
+        return self._tree.is_dir(self._parts)
+
+    def iterdir(self) -> Iterator["VirtualPath"]:
+        for child in self._tree.children(self._parts):
+            yield VirtualPath(self._tree, self._parts + (child,))
+
+    def glob(self, pattern: str) -> Iterator["VirtualPath"]:
+        for child in self.iterdir():
+            if fnmatch.fnmatchcase(child.name, pattern):
+                yield child
+
+    def rglob(self, pattern: str) -> Iterator["VirtualPath"]:
+        """Recursive match on basename, like Path.rglob for simple patterns. Files only."""
+        n = len(self._parts)
+        for rel in self._tree.files():
+            parts = tuple(rel.split("/"))
+            if parts[:n] == self._parts and len(parts) > n and fnmatch.fnmatchcase(parts[-1], pattern):
+                yield VirtualPath(self._tree, parts)
+
+    # Reading
+    def read_bytes(self) -> bytes:
+        return self._tree.read(self._parts)
+
+    def read_text(self, encoding: str = "utf-8", errors: str = "strict") -> str:
+        return self.read_bytes().decode(encoding, errors)
+
+    def open(self, mode: str = "r", encoding: str = "utf-8", errors: str = "strict"):
+        data = self.read_bytes()
+        if "b" in mode:
+            return io.BytesIO(data)
+        return io.StringIO(data.decode(encoding, errors))
+
+
+def open_tree(path: "str | Path | VirtualPath", ref: str | None = None) -> "Path | VirtualPath":
+    """
+    Resolve a scan target: a directory on disk, or a virtual tree for sources
+    that are not checked out (bare git mirrors at ref or HEAD, source archives).
+    A ref on a checkout is read from its .git object store, not the working tree;
+    ValueError if ref is given for a target that has no object store.
+    """
+    if isinstance(path, VirtualPath):
+        return path
+    p = Path(path).resolve()
+    from .archive import is_archive, open_archive
+    from .gitstore import is_bare_repo, open_git_tree
+
+    if is_bare_repo(p):
+        return open_git_tree(p, ref or "HEAD")
+    if ref is not None:
+        if (p / ".git").is_dir():
+            return open_git_tree(p, ref)
+        raise ValueError(f"Cannot read ref {ref!r} from {p}: not a bare mirror or a checkout with a .git directory")
+    if is_archive(p):
+        return open_archive(p)
+    return p
@@ -0,0 +1,70 @@
+"""Source tree walk - one pruned pass yielding files by suffix or name.
+
+Source scanners (Go, C++/CUDA) only want a few file types; this walks the tree
+once with os.scandir, never descending into vendored or generated directories,
+instead of an rglob per pattern. Virtual trees (git objects, archives) are already
+file listings and are filtered directly.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+from typing import Iterator
+
+from .vfs import VirtualPath
+
+MAX_FILES = 5000
+PRUNE_DIRS = {".git", "node_modules", "vendor", "third_party", "testdata", "__pycache__", ".venv", "venv"}
+
+
+def iter_source_files(
+    repo_path: Path | VirtualPath,
+    suffixes: tuple[str, ...] = (),
+    names: tuple[str, ...] = (),
+    exclude: tuple[str, ...] = (),
+    prune: set[str] = PRUNE_DIRS,
+    max_files: int | None = MAX_FILES,
+    pattern: re.Pattern | None = None,
+) -> Iterator[Path | VirtualPath]:
+    """
+    Files under repo_path whose name ends with one of suffixes, equals one of names, or
+    matches pattern; at most max_files (None: no cap).
+    """
+    count = 0
+
+    def wanted(name: str) -> bool:
+        return (
+            name in names
+            or (bool(suffixes) and name.endswith(suffixes))
+            or (pattern is not None and pattern.search(name) is not None)
+        )
+
+    def skipped(rel_dirs: tuple[str, ...]) -> bool:
+        if any(d in prune for d in rel_dirs):
+            return True
+        return bool(exclude) and any("/".join(rel_dirs[: i + 1]) in exclude for i in range(len(rel_dirs)))
+
+    if isinstance(repo_path, VirtualPath):
+        base = repo_path.parts[1:]  # parts[0] is the tree label
+        for rel in repo_path.tree.files():
+            parts = tuple(rel.split("/"))
+            if parts[: len(base)] != base or not wanted(parts[-1]) or skipped(parts[len(base) : -1]):
+                continue
+            yield repo_path.tree.root() / rel
+            count += 1
+            if max_files is not None and count >= max_files:
+                return
+        return
+
+    root = str(repo_path)
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dirs = tuple(Path(os.path.relpath(dirpath, root)).parts) if dirpath != root else ()
+        dirnames[:] = sorted(d for d in dirnames if d not in prune and not skipped((*rel_dirs, d)))
+        for name in sorted(filenames):
+            if wanted(name):
+                yield Path(dirpath) / name
+                count += 1
+                if max_files is not None and count >= max_files:
+                    return
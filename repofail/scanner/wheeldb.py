@@ -0,0 +1,313 @@
+"""Wheel availability index - which platforms x Python versions a package version ships wheels for.
+
+The source of truth is a small JSON table (repofail/data/wheels.json): per package, version
+ranges and the wheel tags published for them ("macos-arm64:3.9-3.13"). It is compiled into
+a flat binary file - sorted fixed-size name records, range records, and a string pool -
+that is memory-mapped and searched by bisection, so looking up every dependency of a large
+lockfile touches a few pages and allocates almost nothing. The compiled form of the bundled
+table ships next to it (repofail/data/wheels.db; regenerate it with compile_db when editing
+the JSON), and `repofail db update --from FILE` installs a newer table under ~/.repofail
+without any network access at scan time.
+
+Layout (little-endian):
+  header  "RFWH", format u16, first Python minor u8, Python minor count u8,
+          data version u32, name count u32, names offset u32, ranges offset u32, strings offset u32
+  names   (string offset u32, length u16, range count u16, first range u32), sorted by name
+  ranges  (min offset u32, min length u16, max offset u32, max length u16, availability u64),
+          newest first; availability bit = platform index * Python count + (minor - first minor)
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import re
+import struct
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from ..models import normalize_name
+
+DATA_PATH = Path(__file__).resolve().parent.parent / "data" / "wheels.json"
+BUNDLED_PATH = DATA_PATH.with_suffix(".db")
+DB_PATH = Path.home() / ".repofail" / "wheels.db"
+
+MAGIC = b"RFWH"
+FORMAT_VERSION = 1
+PLATFORMS = ("linux-x86_64", "linux-arm64", "macos-x86_64", "macos-arm64", "windows-x86_64", "windows-arm64")
+FIRST_MINOR = 6  # Python 3.6
+PYTHON_MINORS = 10  # 3.6 .. 3.15
+
+_HEADER = struct.Struct("<4sHBBIIIII")
+_NAME = struct.Struct("<IHHI")
+_RANGE = struct.Struct("<IHIHQ")
+_PYTHONS = re.compile(r"^(?:\*|3\.(\d+)(?:(\+)|-3\.(\d+))?)$")
+
+
+def _version_key(version: str) -> tuple[int, ...]:
+    """Release tuple for ordering ('2.4.1' -> (2, 4, 1)); pre/post/local suffixes are ignored."""
+    release = re.match(r"[\d.]*", version.strip().lstrip("v")).group(0)
+    return tuple(int(p) for p in release.split(".") if p)
+
+
+def _python_bits(spec: str) -> int:
+    """'3.9-3.13' / '3.8+' / '3.12' / '*' -> bitmask over PYTHON_MINORS."""
+    m = _PYTHONS.match(spec.strip())
+    if not m:
+        raise ValueError(f"Bad Python range {spec!r} (expected 3.X, 3.X-3.Y, 3.X+ or *)")
+    if spec.strip() == "*":
+        lo, hi = FIRST_MINOR, FIRST_MINOR + PYTHON_MINORS - 1
+    else:
+        lo = int(m.group(1))
+        hi = FIRST_MINOR + PYTHON_MINORS - 1 if m.group(2) else int(m.group(3) or lo)
+    bits = 0
+    for minor in range(max(lo, FIRST_MINOR), min(hi, FIRST_MINOR + PYTHON_MINORS - 1) + 1):
+        bits |= 1 << (minor - FIRST_MINOR)
+    return bits
+
+
+def _availability(wheels: list[str]) -> int:
+    """['linux-x86_64:3.9-3.13', '*:*'] -> availability mask."""
+    mask = 0
+    for w in wheels:
+        platform, _, pythons = w.partition(":")
+        bits = _python_bits(pythons or "*")
+        if platform == "*":
+            targets = range(len(PLATFORMS))
+        elif platform in PLATFORMS:
+            targets = [PLATFORMS.index(platform)]
+        else:
+            raise ValueError(f"Unknown wheel platform {platform!r} (one of {', '.join(PLATFORMS)} or *)")
+        for i in targets:
+            mask |= bits << (i * PYTHON_MINORS)
+    return mask
+
+
+def _range_bounds(spec: str) -> tuple[str, str]:
+    """'>=2.2,<2.5' -> ('2.2', '2.5'); '*' -> ('', '')."""
+    lo = hi = ""
+    for clause in (c.strip() for c in spec.split(",")):
+        if clause in ("", "*"):
+            continue
+        if clause.startswith(">="):
+            lo = clause[2:].strip()
+        elif clause.startswith("<") and not clause.startswith("<="):
+            hi = clause[1:].strip()
+        else:
+            raise ValueError(f"Bad version range {spec!r} (use >=A, <B or both)")
+    return lo, hi
+
+
+def compile_db(source: dict[str, Any]) -> bytes:
+    """Binary index from a {"version": N, "packages": {name: [{"versions", "wheels"}]}} table."""
+    version = source.get("version")
+    packages = source.get("packages")
+    if not isinstance(version, int) or not isinstance(packages, dict):
+        raise ValueError('Wheel table needs an integer "version" and a "packages" map')
+    strings = bytearray()
+    pool: dict[str, tuple[int, int]] = {}
+
+    def ref(s: str) -> tuple[int, int]:
+        if s not in pool:
+            data = s.encode()
+            pool[s] = (len(strings), len(data))
+            strings.extend(data)
+        return pool[s]
+
+    names = bytearray()
+    ranges = bytearray()
+    n_ranges = 0
+    table = {normalize_name(name): entries for name, entries in packages.items()}
+    for name in sorted(table, key=lambda n: n.encode()):
+        entries = []
+        for entry in table[name]:
+            lo, hi = _range_bounds(entry.get("versions", "*"))
+            entries.append((lo, hi, _availability(entry.get("wheels", []))))
+        entries.sort(key=lambda e: _version_key(e[0]), reverse=True)
+        off, length = ref(name)
+        names += _NAME.pack(off, length, len(entries), n_ranges)
+        for lo, hi, mask in entries:
+            lo_ref, hi_ref = ref(lo), ref(hi)
+            ranges += _RANGE.pack(*lo_ref, *hi_ref, mask)
+            n_ranges += 1
+    names_off = _HEADER.size
+    ranges_off = names_off + len(names)
+    strings_off = ranges_off + len(ranges)
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, FIRST_MINOR, PYTHON_MINORS, version, len(table), names_off, ranges_off, strings_off
+    )
+    return header + bytes(names) + bytes(ranges) + bytes(strings)
+
+
+class WheelDB:
+    """Read-only view over a compiled index (bytes or a memory map)."""
+
+    def __init__(self, buf: Any) -> None:
+        if len(buf) < _HEADER.size:
+            raise ValueError("Wheel index is truncated")
+        magic, fmt, first, count, version, n_names, names_off, ranges_off, strings_off = _HEADER.unpack_from(buf, 0)
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            raise ValueError("Not a repofail wheel index (or an unsupported format version)")
+        if strings_off > len(buf) or names_off + n_names * _NAME.size > ranges_off:
+            raise ValueError("Wheel index is truncated")
+        self.buf = buf
+        self.version = version
+        self.first_minor = first
+        self.minors = count
+        self.count = n_names
+        self._names = names_off
+        self._ranges = ranges_off
+        self._strings = strings_off
+
+    @classmethod
+    def open(cls, path: Path) -> "WheelDB":
+        """Memory-map a compiled index file."""
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def _str(self, off: int, length: int) -> bytes:
+        start = self._strings + off
+        return bytes(self.buf[start : start + length])
+
+    def _find(self, name: str) -> tuple[int, int] | None:
+        """(first range, range count) for name, by bisection over the sorted name records."""
+        key = name.encode()
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            off, length, n, first = _NAME.unpack_from(self.buf, self._names + mid * _NAME.size)
+            probe = self._str(off, length)
+            if probe == key:
+                return first, n
+            if probe < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def __contains__(self, name: str) -> bool:
+        return self._find(name) is not None
+
+    def ranges(self, name: str) -> list[tuple[str, str, int]]:
+        """(min version, max version, availability) for name, newest first; [] if unknown."""
+        found = self._find(name)
+        if found is None:
+            return []
+        first, n = found
+        out = []
+        for i in range(first, first + n):
+            lo_off, lo_len, hi_off, hi_len, mask = _RANGE.unpack_from(self.buf, self._ranges + i * _RANGE.size)
+            out.append((self._str(lo_off, lo_len).decode(), self._str(hi_off, hi_len).decode(), mask))
+        return out
+
+    def allowed(self, name: str, specifier: str = "") -> list[tuple[str, int]]:
+        """
+        (version range label, availability mask) of every range the specifier allows, newest
+        first (a pin selects the range containing it); [] if the package or range is unknown.
+        """
+        lower, upper, pinned = _spec_bounds(specifier)
+        out = []
+        for lo, hi, mask in self.ranges(name):
+            lo_key = _version_key(lo) if lo else None
+            hi_key = _version_key(hi) if hi else None
+            if pinned is not None:
+                fits = (lo_key is None or lo_key <= pinned) and (hi_key is None or pinned < hi_key)
+            else:
+                fits = (upper is None or lo_key is None or lo_key < upper) and (
+                    lower is None or hi_key is None or hi_key > lower
+                )
+            if fits:
+                label = ",".join(p for p in (f">={lo}" if lo else "", f"<{hi}" if hi else "") if p) or "*"
+                out.append((label, mask))
+        return out
+
+    def availability(self, name: str, specifier: str = "") -> tuple[str, int] | None:
+        """The newest allowed range (see allowed); None if there is none."""
+        found = self.allowed(name, specifier)
+        return found[0] if found else None
+
+    def installable(
+        self, name: str, specifier: str, platform: str, python: tuple[int, int] | None = None
+    ) -> tuple[str, int] | None:
+        """
+        Newest allowed range with a wheel for platform (and for python, if given) - the
+        release pip would fall back to; None if no allowed range has one.
+        """
+        for label, mask in self.allowed(name, specifier):
+            if self.has_wheel(mask, platform, python) if python else self.platform_wheels(mask, platform):
+                return label, mask
+        return None
+
+    def has_wheel(self, mask: int, platform: str, python: tuple[int, int]) -> bool:
+        """Whether mask includes a wheel for platform ("macos-arm64") and Python (3, 12)."""
+        if platform not in PLATFORMS or python[0] != 3:
+            return False
+        slot = python[1] - self.first_minor
+        if not 0 <= slot < self.minors:
+            return False
+        return bool(mask >> (PLATFORMS.index(platform) * self.minors + slot) & 1)
+
+    def platform_wheels(self, mask: int, platform: str) -> bool:
+        """Whether mask includes a wheel for platform on any Python."""
+        if platform not in PLATFORMS:
+            return False
+        return bool(mask >> (PLATFORMS.index(platform) * self.minors) & ((1 << self.minors) - 1))
+
+
+def _spec_bounds(specifier: str) -> tuple[tuple[int, ...] | None, tuple[int, ...] | None, tuple[int, ...] | None]:
+    """(lower, upper, pinned) release tuples from a PEP 440 specifier; bounds are approximate."""
+    lower = upper = pinned = None
+    for clause in (c.strip() for c in specifier.split(",")):
+        m = re.match(r"(===|==|~=|>=|<=|!=|>|<)\s*([\w.*+!-]+)", clause)
+        if not m:
+            continue
+        op, ver = m.groups()
+        key = _version_key(ver)
+        if not key:
+            continue
+        if op in ("==", "===") and "*" not in ver:
+            pinned = key
+        elif op == "==":  # wildcard: ==2.1.* -> [2.1, 2.2)
+            lower = key
+            upper = key[:-1] + (key[-1] + 1,)
+        elif op in (">=", ">"):
+            lower = key
+        elif op in ("<", "<="):
+            upper = key if op == "<" else key + (1,)
+        elif op == "~=":
+            lower = key
+            upper = key[:-2] + (key[-2] + 1,) if len(key) >= 2 else None
+    return lower, upper, pinned
+
+
+def install_db(source: Path, dest: Path = DB_PATH) -> WheelDB:
+    """Validate a wheel table (JSON) or compiled index and install it atomically at dest."""
+    data = Path(source).read_bytes()
+    if not data.startswith(MAGIC):
+        try:
+            data = compile_db(json.loads(data))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{source}: neither a wheel index nor JSON ({e})") from e
+    db = WheelDB(data)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(dest.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, dest)
+    default_db.cache_clear()
+    return db
+
+
+@lru_cache(maxsize=1)
+def default_db() -> WheelDB:
+    """The installed index (~/.repofail/wheels.db) if valid and not older than the bundled one, else the bundled one."""
+    bundled = WheelDB.open(BUNDLED_PATH)
+    if DB_PATH.is_file():
+        try:
+            installed = WheelDB.open(DB_PATH)
+        except (OSError, ValueError):
+            return bundled
+        if installed.version >= bundled.version:
+            return installed
+    return bundled
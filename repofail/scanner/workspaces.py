@@ -0,0 +1,98 @@
+"""Workspace expansion - member packages of npm/yarn/pnpm and Cargo workspaces.
+
+A workspace root lists its members as globs ("packages/*", "apps/**", "!**/test/**").
+They are expanded here against the directory tree, one path segment at a time, so a
+wildcard only lists the directories it has to and node_modules / target are never
+entered. This bypasses the capped rglob discovery: every member is found, however
+many there are.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import re
+from pathlib import Path
+
+PRUNE_DIRS = {"node_modules", ".git", "target", "__pycache__", ".venv", "venv"}
+MAX_MEMBERS = 2000
+
+
+def _glob_regex(pattern: str) -> re.Pattern:
+    """Whole-path regex for a workspace glob ('**' spans directories, '*' does not)."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(out) + "$")
+
+
+def _clean(pattern: str) -> str:
+    p = pattern.strip().strip("/")
+    while p.startswith("./"):
+        p = p[2:]
+    return p
+
+
+def _subdirs(d: Path) -> list[Path]:
+    try:
+        return sorted(c for c in d.iterdir() if c.is_dir() and c.name not in PRUNE_DIRS)
+    except OSError:
+        return []
+
+
+def _expand(d: Path, segments: list[str]) -> list[Path]:
+    """Directories under d matching the glob segments."""
+    if not segments:
+        return [d]
+    head, rest = segments[0], segments[1:]
+    if head == "**":
+        found = _expand(d, rest)
+        for c in _subdirs(d):
+            found.extend(_expand(c, segments))
+        return found
+    if not any(ch in head for ch in "*?["):
+        child = d / head
+        return _expand(child, rest) if head not in PRUNE_DIRS and child.is_dir() else []
+    found = []
+    for c in _subdirs(d):
+        if fnmatch.fnmatchcase(c.name, head):
+            found.extend(_expand(c, rest))
+    return found
+
+
+def expand_members(root: Path, patterns: list[str], manifest: str, exclude: tuple[str, ...] = ()) -> list[Path]:
+    """
+    Member directories under root that match patterns and contain manifest
+    (package.json, Cargo.toml). '!pattern' entries and exclude drop members.
+    """
+    negated = [_glob_regex(_clean(p[1:])) for p in patterns if p.startswith("!")]
+    negated += [_glob_regex(_clean(p)) for p in exclude]
+    members: dict[Path, None] = {}
+    for pattern in patterns:
+        if pattern.startswith("!"):
+            continue
+        p = _clean(pattern)
+        for d in _expand(root, [s for s in p.split("/") if s] if p else []):
+            if d == root or d in members or not (d / manifest).is_file():
+                continue
+            rel = d.relative_to(root).as_posix()
+            if any(n.match(rel) for n in negated):
+                continue
+            members[d] = None
+            if len(members) >= MAX_MEMBERS:
+                return list(members)
+    return list(members)
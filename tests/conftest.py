@@ -0,0 +1,20 @@
+"""Shared test fixtures."""
+
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def make_fleet():
+    """Factory: make_fleet(base, n, sizes=None) creates Node repos repo0..repo{n-1} under base (optional blob sizes)."""
+
+    def make(base: Path, n: int, sizes: list[int] | None = None) -> None:
+        for i in range(n):
+            d = base / f"repo{i}"
+            d.mkdir()
+            (d / "package.json").write_text('{"dependencies": {"lodash": "^4.0.0"}}')
+            if sizes:
+                (d / "blob.bin").write_bytes(b"x" * sizes[i])
+
+    return make
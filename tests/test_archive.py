@@ -0,0 +1,152 @@
+"""Tests for scanning source archives without extraction."""
+
+import io
+import tarfile
+import tempfile
+import zipfile
+from dataclasses import asdict
+from pathlib import Path
+
+from repofail.engine import run_rules
+from repofail.fleet import _find_repos
+from repofail.models import HostProfile
+from repofail.scanner import archive, scan_repo
+from repofail.scanner.archive import open_archive
+
+FILES = {
+    "pyproject.toml": '[project]\nname = "snap"\nrequires-python = ">=3.12"\ndependencies = ["torch"]\n',
+    "requirements-dev.txt": "pytest\n",
+    "src/train.py": "import torch\nx = torch.zeros(1).cuda()\n",
+    "tests/test_x.py": "import tensorflow\n",
+    "web/package.json": '{"name": "web", "dependencies": {"left-pad": "1"}}',
+    "web/yarn.lock": "# lock\n",
+    ".github/workflows/ci.yml": "on: push\njobs:\n  t:\n    runs-on: windows-latest\n",
+    "Makefile": "all:\n",
+    "docs/big.bin": "x" * 10000,
+}
+
+
+def _write_tree(root: Path) -> None:
+    for rel, content in FILES.items():
+        p = root / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(content)
+
+
+def _comparable(profile) -> dict:
+    d = asdict(profile)
+    d.pop("path")
+    return d
+
+
+def _host() -> HostProfile:
+    return HostProfile(os="linux", arch="x86_64", python_version="3.10")
+
+
+def test_tar_and_zip_match_extracted_tree():
+    with tempfile.TemporaryDirectory() as d:
+        base = Path(d)
+        tree = base / "snap-1.0"
+        _write_tree(tree)
+        expected = _comparable(scan_repo(tree))
+        expected_rules = sorted(r.rule_id for r in run_rules(scan_repo(tree), _host()))
+
+        tgz = base / "snap-1.0.tar.gz"
+        with tarfile.open(tgz, "w:gz") as tf:
+            tf.add(tree, arcname="snap-1.0")
+        zp = base / "snap-1.0.zip"
+        with zipfile.ZipFile(zp, "w") as zf:
+            for rel in FILES:
+                zf.write(tree / rel, f"snap-1.0/{rel}")
+
+        for archive in (tgz, zp):
+            profile = scan_repo(archive)
+            assert profile.path == str(archive)
+            assert _comparable(profile) == expected
+            assert sorted(r.rule_id for r in run_rules(profile, _host())) == expected_rules
+
+
+def _assert_archive_parity(root: Path, files: dict[str, str]) -> dict:
+    """Scan files as a directory and as a .tar.gz; the profiles must match. Returns the profile."""
+    tree = root / "proj"
+    for rel, content in files.items():
+        p = tree / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(content)
+    archive = root / "proj.tar.gz"
+    with tarfile.open(archive, "w:gz") as tf:
+        tf.add(tree, arcname="proj")
+    expected = _comparable(scan_repo(tree))
+    assert _comparable(scan_repo(archive)) == expected
+    return expected
+
+
+def test_archive_keeps_requirements_include_targets(tmp_path):
+    profile = _assert_archive_parity(tmp_path, {
+        "requirements.txt": "-r base.txt\n-c pins.txt\nrequests\n",
+        "base.txt": "torch\n",
+        "pins.txt": "torch==2.2.0\n",
+    })
+    assert profile["uses_torch"]
+
+
+def test_archive_keeps_cxx_sources(tmp_path):
+    profile = _assert_archive_parity(tmp_path, {
+        "CMakeLists.txt": "project(x CXX)\n",
+        "src/kernel.cpp": "#include <cuda_runtime.h>\nint main() { return 0; }\n",
+        "include/util.hpp": "#pragma once\n",
+    })
+    assert profile["requires_cuda"]
+
+
+def test_only_scanned_members_are_read():
+    with tempfile.TemporaryDirectory() as d:
+        tar_path = Path(d) / "flat.tar"
+        with tarfile.open(tar_path, "w") as tf:
+            for rel, content in FILES.items():
+                data = content.encode()
+                info = tarfile.TarInfo(rel)
+                info.size = len(data)
+                tf.addfile(info, io.BytesIO(data))
+            evil = tarfile.TarInfo("../escape.py")
+            evil.size = 1
+            tf.addfile(evil, io.BytesIO(b"x"))
+        root = open_archive(tar_path)
+        tree = root.tree
+        assert root.name == "flat"  # no common top-level dir: archive stem
+        assert tree._files["docs/big.bin"] is None
+        assert tree._files["Makefile"] is None
+        assert tree._files["web/yarn.lock"] is not None  # lockfiles are scanned for native addons
+        assert tree._files["src/train.py"] is not None
+        assert tree._files[".github/workflows/ci.yml"] is not None
+        assert "escape.py" not in tree._files and "../escape.py" not in tree._files
+        assert (root / "web" / "yarn.lock").exists()
+
+
+def test_python_sources_are_capped_in_size_and_number(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive, "MAX_SOURCE_BYTES", 64)
+    monkeypatch.setattr(archive, "MAX_NOTEBOOK_BYTES", 128)
+    monkeypatch.setattr(archive, "MAX_FILES", 3)
+    zip_path = tmp_path / "src.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr("big.py", "x = 1\n" * 20)
+        zf.writestr("big.ipynb", '{"cells": [], "outputs": "' + "A" * 200 + '"}')
+        for i in range(5):
+            zf.writestr(f"m{i}.py", "import torch\n")
+    files = open_archive(zip_path).tree._files
+    assert files["big.py"] is None and files["big.ipynb"] is None  # still present, content not kept
+    assert [files[f"m{i}.py"] is not None for i in range(5)] == [True, True, True, False, False]
+
+
+def test_fleet_discovers_archives():
+    with tempfile.TemporaryDirectory() as d:
+        base = Path(d)
+        src = base / "src" / "app"
+        _write_tree(src)
+        snaps = base / "snapshots"
+        snaps.mkdir()
+        with tarfile.open(snaps / "app.tgz", "w:gz") as tf:
+            tf.add(src, arcname="app")
+        (snaps / "notes.txt").write_text("not an archive")
+        found = _find_repos(snaps)
+        assert found == [snaps / "app.tgz"]
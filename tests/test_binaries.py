@@ -0,0 +1,99 @@
+"""Tests for the prebuilt binary / vendored wheel scanner and its rule."""
+
+import struct
+import tarfile
+
+from repofail.engine import run_rules
+from repofail.models import BinaryArtifact, HostProfile, RepoProfile
+from repofail.rules import prebuilt_binaries
+from repofail.rules.base import Severity
+from repofail.scanner import scan_repo
+from repofail.scanner.binaries import read_binary_header, wheel_tags
+
+
+def _elf(machine: int) -> bytes:
+    header = b"\x7fELF" + bytes([2, 1, 1, 0]) + b"\0" * 8 + struct.pack("<HH", 3, machine)
+    return header.ljust(128, b"\0")
+
+
+def _macho_fat(*cpus: int) -> bytes:
+    data = struct.pack(">II", 0xCAFEBABE, len(cpus))
+    for cpu in cpus:
+        data += struct.pack(">IIIII", cpu, 0, 0, 0, 0)
+    return data.ljust(128, b"\0")
+
+
+def _pe(machine: int) -> bytes:
+    data = bytearray(256)
+    data[:2] = b"MZ"
+    struct.pack_into("<I", data, 0x3C, 0x80)
+    data[0x80:0x86] = b"PE\0\0" + struct.pack("<H", machine)
+    return bytes(data)
+
+
+def test_headers_and_wheel_tags():
+    assert read_binary_header(_elf(183)) == ("elf", "linux", ("arm64",))
+    assert read_binary_header(_macho_fat(0x01000007, 0x0100000C)) == ("macho", "macos", ("x86_64", "arm64"))
+    assert read_binary_header(_pe(0x8664)) == ("pe", "windows", ("x86_64",))
+    assert read_binary_header(struct.pack(">II", 0xCAFEBABE, 52).ljust(64, b"\0")) is None  # Java class file
+    assert read_binary_header(b"not a binary".ljust(64)) is None
+    tags = wheel_tags("Pillow_SIMD-9.0.0-cp311-cp311-manylinux_2_17_x86_64.manylinux2014_x86_64.whl")
+    assert tags == {"name": "pillow-simd", "python": "cp311", "abi": "cp311", "os": "linux", "archs": ("x86_64",)}
+    assert wheel_tags("six-1.16.0-py2.py3-none-any.whl")["os"] == "any"
+    assert wheel_tags("x-1.0-cp38-abi3-macosx_11_0_universal2.whl")["archs"] == ("x86_64", "arm64")
+
+
+def test_prebuilt_rule_groups_builds_and_grades_severity():
+    host = HostProfile(os="macos", arch="arm64", python_version="3.12.1")
+
+    def result(*artifacts):
+        return prebuilt_binaries.check(RepoProfile(path=".", binary_artifacts=list(artifacts)), host)
+
+    linux = BinaryArtifact(path="lib/libfoo.so", name="libfoo", format="elf", os="linux", archs=("x86_64",))
+    mac_x86 = BinaryArtifact(path="lib/libfoo.dylib", name="libfoo", format="macho", os="macos", archs=("x86_64",))
+    mac_arm = BinaryArtifact(path="lib/arm/libfoo.dylib", name="libfoo", format="macho", os="macos", archs=("arm64",))
+    assert result(linux).severity == Severity.MEDIUM
+    assert "not a mach-o file" in result(linux).evidence["likely_error"]
+    assert result(linux, mac_x86).severity == Severity.HIGH
+    assert "(have 'x86_64', need 'arm64')" in result(linux, mac_x86).evidence["likely_error"]
+    assert result(linux, mac_x86, mac_arm) is None
+    wheel = BinaryArtifact(path="vendor/x.whl", name="x", format="wheel", os="macos", archs=("arm64",), python="cp311", abi="cp311")
+    assert result(wheel).evidence["binaries"][0]["mismatch"] == "python"
+    assert result(wheel).evidence["likely_error"] == "ERROR: x.whl is not a supported wheel on this platform."
+    abi3 = BinaryArtifact(path="vendor/y.whl", name="y", format="wheel", os="macos", archs=("arm64",), python="cp38", abi="abi3")
+    assert result(abi3) is None
+
+
+def test_scan_repo_reads_prebuilt_binaries(tmp_path):
+    (tmp_path / "requirements.txt").write_text("numpy\n")
+    (tmp_path / "libs").mkdir()
+    (tmp_path / "libs" / "libfast.so").write_bytes(_elf(62))
+    (tmp_path / "libs" / "empty.so").write_bytes(b"")
+    (tmp_path / "vendor").mkdir()
+    (tmp_path / "vendor" / "fastlib-1.0-cp312-cp312-manylinux2014_x86_64.whl").write_bytes(b"PK")
+    profile = scan_repo(tmp_path)
+    assert [(a.path, a.os, a.archs) for a in profile.binary_artifacts] == [
+        ("libs/libfast.so", "linux", ("x86_64",)),
+        ("vendor/fastlib-1.0-cp312-cp312-manylinux2014_x86_64.whl", "linux", ("x86_64",)),
+    ]
+    linux_arm = HostProfile(os="linux", arch="arm64", python_version="3.12.0")
+    hit = [r for r in run_rules(profile, linux_arm) if r.rule_id == "prebuilt_binary_mismatch"]
+    assert hit and hit[0].severity == Severity.HIGH
+    assert hit[0].evidence["likely_error"] == "OSError: libfast.so: wrong ELF machine (built for x86_64, host is arm64)"
+    linux_x86 = HostProfile(os="linux", arch="x86_64", python_version="3.12.0")
+    assert not [r for r in run_rules(profile, linux_x86) if r.rule_id == "prebuilt_binary_mismatch"]
+
+
+def test_versioned_sonames_fixtures_and_archives(tmp_path):
+    tree = tmp_path / "proj"
+    (tree / "libs").mkdir(parents=True)
+    (tree / "libs" / "libfast.so.1.2").write_bytes(_elf(62))
+    (tree / "tests" / "fixtures").mkdir(parents=True)
+    (tree / "tests" / "fixtures" / "foreign.dll").write_bytes(_pe(0xAA64))
+    (tree / "requirements.txt").write_text("numpy\n")
+    profile = scan_repo(tree)
+    assert [(a.path, a.name, a.archs) for a in profile.binary_artifacts] == [("libs/libfast.so.1.2", "libfast", ("x86_64",))]
+    archive = tmp_path / "proj.tar.gz"
+    with tarfile.open(archive, "w:gz") as tf:
+        tf.add(tree, arcname="proj")
+    assert scan_repo(archive).binary_artifacts == profile.binary_artifacts
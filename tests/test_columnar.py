@@ -0,0 +1,124 @@
+"""Tests for columnar (repo x host matrix) rule evaluation."""
+
+import itertools
+
+import pytest
+
+from repofail import columnar
+from repofail.columnar import evaluate_matrix
+from repofail.engine import run_rules
+from repofail.models import Dependency, DependencyIndex, DockerfileInfo, HostProfile, RepoProfile
+
+
+def _repos(tmp_path) -> list[RepoProfile]:
+    common = {"path": str(tmp_path), "repofail_config": {}, "yaml_rules": []}
+    return [
+        RepoProfile(name="empty", **common),
+        RepoProfile(
+            name="ml",
+            python_version=">=3.10,<3.12",
+            uses_torch=True,
+            requires_cuda=True,
+            cuda_optional=False,
+            frameworks=["Transformers", "PEFT", "torchao"],
+            dependencies=DependencyIndex(
+                (
+                    Dependency("torch", specifier="<2.1"),
+                    Dependency("torchao", specifier=">=0.5"),
+                    Dependency("bitsandbytes"),
+                    Dependency("faiss-gpu"),
+                )
+            ),
+            requires_libgl=True,
+            **common,
+        ),
+        RepoProfile(
+            name="web",
+            has_package_json=True,
+            node_engine_spec=">=20",
+            node_lock_file_missing=True,
+            node_native_modules=["bcrypt"],
+            has_dockerfile=True,
+            has_devcontainer=True,
+            has_native_install=False,
+            dockerfile=DockerfileInfo(python_version="3.9", platform_amd64=True),
+            python_version="==3.8.*",
+            subprojects=[{"type": "python", "path": "api"}, {"type": "python", "path": "ml"}, {"type": "node", "path": "ui"}],
+            **common,
+        ),
+        RepoProfile(
+            name="systems",
+            has_cargo_toml=True,
+            rust_version_req="1.80",
+            rust_target_platforms=["cfg(windows)"],
+            has_go_mod=True,
+            go_version="1.22",
+            go_cgo_deps=["github.com/mattn/go-sqlite3"],
+            go_os_specific_tags=["linux"],
+            node_engine_spec="16.x",
+            requires_ffmpeg=True,
+            **common,
+        ),
+        RepoProfile(
+            name="rules",
+            python_version="^3.11",
+            **{**common, "repofail_config": {"rules": {"disable": ["python_minor_mismatch"]}}},
+        ),
+    ]
+
+
+def _hosts() -> list[HostProfile]:
+    hosts = []
+    for (os_, arch), py, extra in itertools.product(
+        [("macos", "arm64"), ("linux", "x86_64"), ("windows", "x86_64")],
+        [None, "3.9.6", "3.11.4", "3.12.1"],
+        [
+            {},
+            {"cuda_available": True, "has_compiler": True, "has_libgl": True, "has_ffmpeg": True, "ram_gb": 64.0},
+            {"node_version": "18.19.0", "rust_version": "1.75.0", "go_version": "1.21.5", "has_metal": True, "ram_gb": 8.0},
+        ],
+    ):
+        hosts.append(HostProfile(os=os_, arch=arch, python_version=py, **extra))
+    return hosts
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_matrix_matches_scalar_engine(tmp_path, monkeypatch, use_numpy):
+    """Every cell equals run_rules(repo, host), with and without numpy."""
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(columnar, "np", None)
+    repos, hosts = _repos(tmp_path), _hosts()
+    matrix = evaluate_matrix(repos, hosts)
+    assert len(matrix) == len(repos)
+    fired = 0
+    for repo, row in zip(repos, matrix):
+        assert len(row) == len(hosts)
+        for host, cell in zip(hosts, row):
+            assert cell == run_rules(repo, host)
+            fired += len(cell)
+    assert fired > 0
+
+
+def test_matrix_evaluates_identical_digests_once(tmp_path, monkeypatch):
+    """Repos with the same content digest share one evaluation."""
+    calls = []
+    real = columnar.run_rules
+    monkeypatch.setattr(columnar, "run_rules", lambda r, h, checks=None: calls.append(r.name) or real(r, h, checks))
+    a = RepoProfile(path=str(tmp_path), name="a", requires_cuda=True, content_digest="d1", repofail_config={}, yaml_rules=[])
+    b = RepoProfile(path=str(tmp_path), name="b", requires_cuda=True, content_digest="d1", repofail_config={}, yaml_rules=[])
+    host = HostProfile(os="linux", arch="x86_64")
+    matrix = evaluate_matrix([a, b], [host])
+    assert matrix[0][0] == matrix[1][0] == run_rules(a, host)
+    assert calls == ["a"]
+
+
+def test_matrix_skips_cells_no_guard_admits(tmp_path, monkeypatch):
+    """A repo that can't trigger any check on a host never reaches the scalar engine."""
+    calls = []
+    monkeypatch.setattr(columnar, "run_rules", lambda r, h, checks=None: calls.append(h.os) or [])
+    repo = RepoProfile(path=str(tmp_path), node_native_modules=["bcrypt"], repofail_config={}, yaml_rules=[])
+    hosts = [HostProfile(os="linux", arch="x86_64", has_compiler=True, rust_version="1.80"), HostProfile(os="windows", arch="x86_64")]
+    evaluate_matrix([repo], hosts)
+    assert calls == ["windows"]
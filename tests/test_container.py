@@ -0,0 +1,122 @@
+"""Tests for reading saved container images (docker save / OCI layout) as a host profile."""
+
+import hashlib
+import io
+import json
+import tarfile
+
+import pytest
+
+from repofail.engine import run_rules
+from repofail.models import RepoProfile
+from repofail.scanner.container import inspect_image
+
+
+def _layer(files: dict[str, bytes | None], compression: str = "gz") -> bytes:
+    """Layer tarball; None content makes a symlink to 'target'."""
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode=f"w:{compression}") as tf:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            if data is None:
+                info.type = tarfile.SYMTYPE
+                info.linkname = "target"
+                tf.addfile(info)
+            else:
+                info.size = len(data)
+                tf.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def _add(tf: tarfile.TarFile, name: str, data: bytes) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    tf.addfile(info, io.BytesIO(data))
+
+
+_CONFIG = {
+    "architecture": "arm64",
+    "os": "linux",
+    "config": {"Env": ["PATH=/usr/local/bin:/usr/bin", "PYTHON_VERSION=3.11.9", "NODE_VERSION=20.11.1"]},
+}
+_BASE = {
+    "usr/bin/python3.9": None,
+    "usr/local/bin/python3.11": b"",
+    "usr/local/bin/node": b"",
+    "usr/lib/python3/dist-packages/six-1.16.0.dist-info/METADATA": b"",
+    "usr/local/lib/python3.11/site-packages/numpy-1.26.4.dist-info/METADATA": b"",
+    "usr/local/lib/python3.11/site-packages/torch-2.2.0.dist-info/METADATA": b"",
+    "usr/local/cuda/version.json": json.dumps({"cuda": {"version": "12.1.1"}}).encode(),
+    "usr/lib/x86_64-linux-gnu/libcudart.so.12": b"",
+    "etc/ld.so.cache": b"glibc-ld.so.cache1.1\0libGL.so.1\0/usr/lib/libGL.so.1\0",
+    "usr/bin/gcc": None,
+}
+_TOP = {
+    "usr/local/lib/python3.11/site-packages/.wh.torch-2.2.0.dist-info": b"",
+    "usr/local/cuda/.wh..wh..opq": b"",
+    "usr/local/lib/python3.11/site-packages/torch-2.3.1.dist-info/METADATA": b"",
+    "usr/bin/.wh.gcc": b"",
+}
+
+
+def _docker_save(path, layers):
+    config = json.dumps(_CONFIG).encode()
+    with tarfile.open(path, "w") as tf:
+        _add(tf, "cfg.json", config)
+        names = []
+        for i, layer in enumerate(layers):
+            names.append(f"l{i}/layer.tar")
+            _add(tf, names[-1], layer)
+        _add(tf, "manifest.json", json.dumps([{"Config": "cfg.json", "RepoTags": ["app:1"], "Layers": names}]).encode())
+    return path
+
+
+def _oci_layout(path, layers):
+    blobs = {}
+
+    def blob(data: bytes) -> dict:
+        digest = "sha256:" + hashlib.sha256(data).hexdigest()
+        blobs[digest] = data
+        return {"digest": digest, "size": len(data)}
+
+    config = blob(json.dumps(_CONFIG).encode())
+    manifest = json.dumps({"config": config, "layers": [blob(layer) for layer in layers]}).encode()
+    desc = {"mediaType": "application/vnd.oci.image.manifest.v1+json", **blob(manifest)}
+    desc["annotations"] = {"org.opencontainers.image.ref.name": "app:oci"}
+    with tarfile.open(path, "w") as tf:
+        _add(tf, "oci-layout", b'{"imageLayoutVersion": "1.0.0"}')
+        _add(tf, "index.json", json.dumps({"manifests": [desc]}).encode())
+        for digest, data in blobs.items():
+            _add(tf, "blobs/sha256/" + digest.split(":")[1], data)
+    return path
+
+
+def test_docker_save_layers_and_whiteouts(tmp_path):
+    facts = inspect_image(_docker_save(tmp_path / "app.tar", [_layer(_BASE), _layer(_TOP, "")]))
+    host = facts["host"]
+    assert facts["image"] == "app:1" and facts["layers"] == 2 and facts["skipped_layers"] == []
+    assert (host.os, host.arch) == ("linux", "arm64")
+    assert host.python_version == "3.11.9"  # /usr/local/bin wins over the distro python3.9
+    assert host.node_version == "v20.11.1"
+    assert facts["packages"] == {"six": "1.16.0", "numpy": "1.26.4", "torch": "2.3.1"}
+    # CUDA toolkit dir was made opaque, but the runtime library is still there
+    assert host.cuda_available and host.cuda_version is None
+    assert host.has_libgl and not host.has_compiler and not host.has_ffmpeg
+
+
+def test_oci_layout_and_rules(tmp_path):
+    facts = inspect_image(_oci_layout(tmp_path / "app-oci.tar", [_layer(_BASE)]))
+    host = facts["host"]
+    assert facts["image"] == "app:oci"
+    assert host.cuda_available and host.cuda_version == "12.1.1" and host.has_compiler
+    repo = RepoProfile(path=".", requires_libgl=True, requires_ffmpeg=True)
+    missing = [r for r in run_rules(repo, host) if r.rule_id == "missing_system_libs"]
+    assert missing and "ffmpeg" in missing[0].reason and "libGL" not in missing[0].reason
+
+
+def test_not_an_image(tmp_path):
+    path = tmp_path / "src.tar"
+    with tarfile.open(path, "w") as tf:
+        _add(tf, "README.md", b"hi")
+    with pytest.raises(ValueError):
+        inspect_image(path)
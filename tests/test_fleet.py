@@ -1,12 +1,15 @@
 """Tests for Stage 5 - audit, simulate."""
 
 import json
+import shutil
 import tempfile
+from dataclasses import asdict
 from pathlib import Path
 
 import pytest
 
-from repofail.fleet import audit, simulate, host_from_dict
+from repofail.fleet import audit, simulate, host_from_dict, fleet_scan, merge_fleet_results, parse_shard
+from repofail.models import HostProfile
 
 
 def test_audit_empty_dir():
@@ -40,6 +43,16 @@ def test_host_from_dict():
     assert h.os == "linux"
     assert h.arch == "x86_64"
     assert h.cuda_available is True
+    assert h.has_compiler is True  # assumed unless the host file says otherwise
+
+
+def test_host_from_dict_reads_every_field():
+    full = HostProfile(
+        os="linux", arch="arm64", cuda_available=True, cuda_version="12.4", python_version="3.12.3",
+        node_version="v20.11.1", rust_version="1.79.0", go_version="go1.22.4", has_compiler=False,
+        has_metal=False, has_libgl=True, has_ffmpeg=True, ram_gb=64.0,
+    )
+    assert host_from_dict(json.loads(json.dumps(asdict(full)))) == full
 
 
 def test_simulate():
@@ -59,3 +72,99 @@ def test_simulate():
         assert repo.uses_torch
         assert host.os == "linux"
         assert any(r.rule_id == "torch_cuda_mismatch" for r in results)
+
+
+def test_parse_shard():
+    """Shard spec is 1-based K/N."""
+    assert parse_shard("2/4") == (2, 4)
+    with pytest.raises(ValueError):
+        parse_shard("0/4")
+    with pytest.raises(ValueError):
+        parse_shard("5/4")
+    with pytest.raises(ValueError):
+        parse_shard("x")
+
+
+def test_fleet_shards_partition_and_merge(make_fleet):
+    """Shards are disjoint, cover every repo, and merge back to the unsharded report."""
+    with tempfile.TemporaryDirectory() as base:
+        base_p = Path(base)
+        make_fleet(base_p, 9)
+        full = fleet_scan(base_p)
+        shards = [fleet_scan(base_p, shard=(k, 3)) for k in (1, 2, 3)]
+        paths = [r["path"] for s in shards for r in s["repos"]]
+        assert len(paths) == len(set(paths)) == full["total_repos_scanned"] == 9
+        assert fleet_scan(base_p, shard=(2, 3))["repos"] == shards[1]["repos"]  # deterministic
+        merged = merge_fleet_results(shards)
+        assert merged["total_repos_scanned"] == 9
+        assert merged["violations"] == full["violations"]
+        assert merged["most_common_drift"] == full["most_common_drift"]
+        assert merged["risk_clusters"] == full["risk_clusters"]
+        # Overlapping inputs are not double counted
+        assert merge_fleet_results(shards + [shards[0]])["total_repos_scanned"] == 9
+
+
+def test_shard_cap_and_merge_across_mounts(tmp_path, make_fleet):
+    """max_repos caps each shard, not the fleet; merge dedupes on the path relative to the root."""
+    from repofail.pipeline import discover
+
+    a, b = tmp_path / "a", tmp_path / "b"
+    a.mkdir()
+    make_fleet(a, 12)
+    per_shard = [list(discover(a, max_repos=3, shard=(k, 2))) for k in (1, 2)]
+    assert all(len(s) == 3 for s in per_shard)
+    assert len(list(discover(a, max_repos=3))) == 3
+    shutil.copytree(a, b)
+    shard_a, shard_b = fleet_scan(a, shard=(1, 2)), fleet_scan(b, shard=(1, 2))
+    assert {r["rel_path"] for r in shard_a["repos"]} == {r["rel_path"] for r in shard_b["repos"]}
+    assert merge_fleet_results([shard_a, shard_b])["total_repos_scanned"] == shard_a["total_repos_scanned"]
+
+
+def test_simulate_matrix_scans_once_per_repo(monkeypatch):
+    """Host library from a dir and a list file; each repo is scanned once for all hosts."""
+    import repofail.fleet as fleet
+
+    with tempfile.TemporaryDirectory() as d:
+        repo = Path(d) / "repo"
+        repo.mkdir()
+        (repo / "x.py").write_text("import torch\ntorch.cuda.synchronize()\n")
+        (repo / "requirements.txt").write_text("torch")
+        lib = Path(d) / "hosts"
+        lib.mkdir()
+        (lib / "gpu.json").write_text(json.dumps({"host": {"os": "linux", "arch": "x86_64", "cuda_available": True}}))
+        (lib / "laptops.json").write_text(json.dumps([
+            {"name": "mac", "os": "macos", "arch": "arm64"},
+            {"name": "linux-cpu", "os": "linux", "arch": "x86_64"},
+        ]))
+        hosts = fleet.load_hosts(lib)
+        assert [name for name, _ in hosts] == ["gpu", "mac", "linux-cpu"]
+
+        calls = []
+        real_scan = fleet.scan_repo
+        monkeypatch.setattr(fleet, "scan_repo", lambda p: calls.append(p) or real_scan(p))
+        matrix = fleet.simulate_matrix([repo], hosts)
+        assert len(calls) == 1
+        cells = matrix["repos"][0]["cells"]
+        assert matrix["hosts"] == ["gpu", "mac", "linux-cpu"]
+        assert "torch_cuda_mismatch" not in cells["gpu"]["rules"]
+        assert "torch_cuda_mismatch" in cells["linux-cpu"]["rules"]
+        assert cells["gpu"]["score"] > cells["linux-cpu"]["score"]
+        with pytest.raises(ValueError):
+            fleet.load_hosts(Path(d) / "repo")  # no host JSON files
+
+
+def test_fleet_matrix_evaluates_every_repo_on_every_host(tmp_path, make_fleet):
+    import repofail.fleet as fleet
+
+    make_fleet(tmp_path, 3)
+    gpu = tmp_path / "repo0"
+    (gpu / "train.py").write_text("import torch\ntorch.cuda.synchronize()\n")
+    (gpu / "requirements.txt").write_text("torch")
+    hosts = [("gpu", HostProfile(os="linux", arch="x86_64", cuda_available=True)), ("cpu", HostProfile(os="linux", arch="x86_64"))]
+    matrix = fleet.fleet_matrix(tmp_path, hosts)
+    assert matrix["total_repos_scanned"] == 3 and matrix["hosts"] == ["gpu", "cpu"]
+    row = next(r for r in matrix["repos"] if r["rel_path"] == "repo0")
+    assert "torch_cuda_mismatch" in row["cells"]["cpu"]["rules"]
+    assert "torch_cuda_mismatch" not in row["cells"]["gpu"]["rules"]
+    assert matrix["by_host"]["cpu"]["most_common_drift"].get("torch_cuda_mismatch") == 1
+    assert "torch_cuda_mismatch" not in matrix["by_host"]["gpu"]["most_common_drift"]
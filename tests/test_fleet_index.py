@@ -0,0 +1,84 @@
+"""Tests for the queryable fleet results index."""
+
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from repofail.fleet_index import index_summary, query, score_bucket
+
+
+def _summary() -> dict:
+    def row(path, host, score, rules, sevs):
+        return {"path": path, "name": Path(path).name, "host": host, "score": score,
+                "rule_count": len(rules), "rules": rules, "severities": sevs,
+                "high_count": sevs.count("HIGH"), "medium_count": sevs.count("MEDIUM")}
+    return {"repos": [
+        row("/org/a", "linux x86_64", 10, ["node_engine_mismatch", "lock_file_missing"], ["HIGH", "HIGH"]),
+        row("/org/b", "linux x86_64", 55, ["torch_cuda_mismatch"], ["HIGH"]),
+        row("/org/c", "macos arm64", 80, ["torch_cuda_mismatch"], ["MEDIUM"]),
+        row("/org/d", "macos arm64", 100, [], []),
+    ]}
+
+
+def test_score_bucket():
+    assert score_bucket(0) == 0
+    assert score_bucket(55) == 50
+    assert score_bucket(100) == 90
+
+
+def test_index_and_query_filters():
+    with tempfile.TemporaryDirectory() as d:
+        db = Path(d) / "idx.db"
+        assert index_summary(_summary(), db) == 4
+        assert index_summary(_summary(), db) == 4  # re-index replaces rows
+        assert query(db)["count"] == 4
+        r = query(db, rule="node_engine_mismatch")
+        assert [x["path"] for x in r["repos"]] == ["/org/a"]
+        assert query(db, category="ML/CUDA")["count"] == 2
+        # Finding filters apply to the same finding
+        assert query(db, category="ML/CUDA", severity="high")["count"] == 1
+        assert query(db, host="macos arm64", max_score=90)["count"] == 1
+
+
+def test_query_group_by_and_percentiles():
+    with tempfile.TemporaryDirectory() as d:
+        db = Path(d) / "idx.db"
+        index_summary(_summary(), db)
+        assert query(db, group_by="severity")["groups"] == {"HIGH": 2, "MEDIUM": 1}
+        assert query(db, group_by="host")["groups"] == {"linux x86_64": 2, "macos arm64": 2}
+        r = query(db, category="ML/CUDA", percentiles=[50, 100])
+        assert r["percentiles"] == {"p50": 55, "p100": 80}
+        with pytest.raises(ValueError):
+            query(db, group_by="nope")
+
+
+def test_same_repo_from_two_mounts_is_one_row():
+    def row(path, score):
+        return {"path": path, "rel_path": "team/a", "name": "a", "host": "linux x86_64", "score": score,
+                "rules": ["lock_file_missing"], "severities": ["HIGH"], "rule_count": 1, "high_count": 1}
+    with tempfile.TemporaryDirectory() as d:
+        db = Path(d) / "idx.db"
+        index_summary({"repos": [row("/mnt/w1/team/a", 40)]}, db)
+        index_summary({"repos": [row("/data/w2/team/a", 60)]}, db)
+        r = query(db, percentiles=[50])
+        assert r["count"] == 1 and r["percentiles"] == {"p50": 60}
+        assert r["repos"][0]["path"] == "/data/w2/team/a" and r["repos"][0]["rel_path"] == "team/a"
+        assert query(db, group_by="severity")["groups"] == {"HIGH": 1}
+
+
+def test_index_written_before_rel_path_is_migrated():
+    with tempfile.TemporaryDirectory() as d:
+        db = Path(d) / "idx.db"
+        conn = sqlite3.connect(db)
+        conn.execute(
+            "CREATE TABLE repos (id INTEGER PRIMARY KEY, path TEXT NOT NULL, name TEXT, host TEXT NOT NULL DEFAULT '',"
+            " score INTEGER NOT NULL, score_bucket INTEGER NOT NULL, rule_count INTEGER NOT NULL,"
+            " high_count INTEGER NOT NULL, medium_count INTEGER NOT NULL, UNIQUE (path, host))"
+        )
+        conn.execute("INSERT INTO repos VALUES (1, '/org/old', 'old', '', 70, 70, 0, 0, 0)")
+        conn.commit()
+        conn.close()
+        assert index_summary(_summary(), db) == 4
+        assert [x["rel_path"] for x in query(db, min_score=70)["repos"]] == ["/org/old", "/org/c", "/org/d"]
@@ -0,0 +1,106 @@
+"""Tests for the lease-based fleet work queue."""
+
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from repofail import fleet_queue
+from repofail.fleet import fleet_scan
+from repofail.fleet_queue import _connect, claim, complete, enqueue, queue_status, queue_summary, renew, run_worker
+from repofail.models import HostProfile
+
+SIZES = [10, 5000, 300]  # blob bytes per repo: claims go largest first
+
+
+def test_enqueue_is_idempotent_and_claims_largest_first(make_fleet):
+    with tempfile.TemporaryDirectory() as base:
+        base_p = Path(base)
+        make_fleet(base_p, 3, sizes=SIZES)
+        db = base_p / "q.db"
+        assert enqueue(db, base_p) == 3
+        assert enqueue(db, base_p) == 0
+        conn = _connect(db)
+        try:
+            assert claim(conn, "w1") == "repo1"
+            assert claim(conn, "w1") == "repo2"
+        finally:
+            conn.close()
+
+
+def test_expired_lease_is_reclaimed(make_fleet):
+    """A repo leased by a crashed worker is picked up once the lease expires."""
+    with tempfile.TemporaryDirectory() as base:
+        base_p = Path(base)
+        make_fleet(base_p, 3, sizes=SIZES)
+        db = base_p / "q.db"
+        enqueue(db, base_p)
+        conn = _connect(db)
+        try:
+            crashed = claim(conn, "crashed", lease_seconds=0.01)
+        finally:
+            conn.close()
+        time.sleep(0.05)
+        host = HostProfile(os="linux", arch="x86_64")
+        assert run_worker(db, host=host, worker_id="w2") == 3
+        assert queue_status(db) == {"done": 3}
+        assert crashed in {r["rel_path"] for r in queue_summary(db)["repos"]}
+
+
+def test_queue_summary_matches_fleet_scan(make_fleet):
+    with tempfile.TemporaryDirectory() as base:
+        base_p = Path(base)
+        make_fleet(base_p, 3, sizes=SIZES)
+        db = base_p / "q.db"
+        enqueue(db, base_p)
+        run_worker(db, worker_id="a")
+        summary = queue_summary(db)
+        full = fleet_scan(base_p)
+        assert summary["total_repos_scanned"] == full["total_repos_scanned"] == 3
+        assert summary["most_common_drift"] == full["most_common_drift"]
+
+
+def test_workers_resolve_tasks_against_their_own_mount(tmp_path, make_fleet):
+    """Tasks are stored relative to the fleet root; a worker with another mount still finds them."""
+    a, b = tmp_path / "a", tmp_path / "b"
+    a.mkdir()
+    make_fleet(a, 3, sizes=SIZES)
+    db = tmp_path / "q.db"
+    enqueue(db, a)
+    shutil.copytree(a, b)
+    shutil.rmtree(a)
+    host = HostProfile(os="linux", arch="x86_64")
+    assert run_worker(db, host=host, worker_id="w", base_path=b) == 3
+    assert {Path(r["path"]).parent for r in queue_summary(db)["repos"]} == {b.resolve()}
+
+
+def test_lease_ownership_and_renewal(tmp_path, make_fleet):
+    make_fleet(tmp_path, 3, sizes=SIZES)
+    db = tmp_path / "q.db"
+    enqueue(db, tmp_path)
+    conn = _connect(db)
+    try:
+        path = claim(conn, "w1", lease_seconds=60)
+        assert not complete(conn, path, "w2", {"path": path})  # not the lease holder
+        assert renew(conn, path, "w1", lease_seconds=60) and not renew(conn, path, "w2")
+        assert complete(conn, path, "w1", None)
+        assert not renew(conn, path, "w1")  # no longer leased
+    finally:
+        conn.close()
+
+
+def test_heartbeat_keeps_slow_scans_leased(tmp_path, monkeypatch):
+    """A scan longer than the lease is not lost: the worker renews while it runs."""
+    scan_one = fleet_queue.scan_one
+
+    def slow_scan(*args, **kwargs):
+        time.sleep(0.3)
+        return scan_one(*args, **kwargs)
+
+    monkeypatch.setattr(fleet_queue, "scan_one", slow_scan)
+    (tmp_path / "repo").mkdir()
+    (tmp_path / "repo" / "package.json").write_text("{}")
+    db = tmp_path / "q.db"
+    enqueue(db, tmp_path)
+    assert run_worker(db, host=HostProfile(os="linux", arch="x86_64"), worker_id="w", lease_seconds=0.1) == 1
+    assert queue_status(db) == {"done": 1}
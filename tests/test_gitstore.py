@@ -0,0 +1,99 @@
+"""Tests for scanning bare git mirrors straight from the object store."""
+
+import shutil
+import subprocess
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+from repofail.scanner import scan_repo
+from repofail.scanner.gitstore import ObjectStore, apply_delta, is_bare_repo
+
+pytestmark = pytest.mark.skipif(not shutil.which("git"), reason="git binary needed to build fixtures")
+
+
+def _git(cwd: Path, *args: str) -> str:
+    env = {"GIT_AUTHOR_NAME": "t", "GIT_AUTHOR_EMAIL": "t@t", "GIT_COMMITTER_NAME": "t",
+           "GIT_COMMITTER_EMAIL": "t@t", "HOME": str(cwd), "PATH": "/usr/bin:/bin:/usr/local/bin"}
+    return subprocess.run(["git", *args], cwd=cwd, env=env, check=True, capture_output=True, text=True).stdout
+
+
+def _make_repo(work: Path) -> None:
+    work.mkdir()
+    _git(work, "init", "-q", "-b", "main")
+    (work / "pyproject.toml").write_text('[project]\nname = "mirror-app"\nrequires-python = ">=3.10,<3.12"\ndependencies = ["torch"]\n')
+    (work / "svc").mkdir()
+    (work / "svc" / "package.json").write_text('{"engines": {"node": ">=18"}, "dependencies": {"node-gyp": "1"}}')
+    (work / "train.py").write_text("import torch\n" + "x = 1\n" * 200)
+    (work / "Dockerfile").write_text("FROM python:3.11-slim\n")
+    _git(work, "add", "-A")
+    _git(work, "commit", "-qm", "one")
+    _git(work, "tag", "-a", "v1", "-m", "v1")
+    # Second commit: small edit to a large file so repack stores a delta
+    (work / "train.py").write_text("import torch\n" + "x = 1\n" * 200 + "torch.cuda.synchronize()\n")
+    _git(work, "commit", "-qam", "two")
+
+
+def _comparable(profile) -> dict:
+    d = asdict(profile)
+    d.pop("path")
+    return d
+
+
+def test_bare_mirror_scan_matches_checkout_loose_and_packed():
+    with tempfile.TemporaryDirectory() as d:
+        base = Path(d)
+        work = base / "work"
+        _make_repo(work)
+        bare = base / "app.git"
+        _git(base, "clone", "-q", "--bare", "--no-local", str(work), str(bare))
+        assert is_bare_repo(bare)
+        expected = _comparable(scan_repo(work))
+        expected["name"] = "mirror-app"
+        assert _comparable(scan_repo(bare)) == expected
+        # Fully packed with deltas (OFS_DELTA) and packed refs
+        _git(bare, "repack", "-a", "-d", "-f", "--depth=50", "--window=50")
+        _git(bare, "pack-refs", "--all")
+        assert not any((bare / "objects").glob("??/*"))
+        assert _comparable(scan_repo(bare)) == expected
+        profile = scan_repo(bare)
+        assert profile.path == str(bare)
+        assert profile.requires_cuda and "train.py" in profile.cuda_files
+
+
+def test_bare_mirror_scan_at_ref():
+    with tempfile.TemporaryDirectory() as d:
+        base = Path(d)
+        work = base / "work"
+        _make_repo(work)
+        bare = base / "app.git"
+        _git(base, "clone", "-q", "--mirror", str(work), str(bare))
+        _git(bare, "repack", "-a", "-d")
+        assert scan_repo(bare).requires_cuda
+        old = scan_repo(bare, ref="v1")  # annotated tag, peeled to commit one
+        assert old.uses_torch and not old.requires_cuda
+        store = ObjectStore(bare)
+        assert store.resolve_ref("refs/heads/main") == _git(work, "rev-parse", "HEAD").strip()
+
+
+def test_checkout_scan_at_ref_reads_object_store(tmp_path):
+    """--ref on a normal checkout reads the commit, not the working tree."""
+    work = tmp_path / "work"
+    _make_repo(work)
+    (work / "train.py").write_text("import torch\n")  # uncommitted: drops the CUDA call
+    assert not scan_repo(work).requires_cuda
+    assert scan_repo(work, ref="HEAD").requires_cuda
+    assert not scan_repo(work, ref="v1").requires_cuda
+    plain = tmp_path / "plain"
+    plain.mkdir()
+    with pytest.raises(ValueError, match="Cannot read ref"):
+        scan_repo(plain, ref="main")
+
+
+def test_apply_delta_copy_and_insert():
+    base = b"hello world"
+    # src=11, dst=11; copy offset 0 size 6 ("hello "), insert "WORLD"
+    delta = bytes([11, 11, 0x90, 6, 5]) + b"WORLD"
+    assert apply_delta(base, delta) == b"hello WORLD"
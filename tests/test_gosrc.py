@@ -0,0 +1,55 @@
+"""Tests for the Go source (build constraint / cgo) scanner."""
+
+from pathlib import Path
+
+import pytest
+
+from repofail.scanner import scan_repo
+from repofail.scanner.gosrc import (
+    allowed_goos,
+    eval_build_expr,
+    filename_constraint,
+    parse_build_expr,
+    plus_build_expr,
+    read_go_header,
+)
+
+
+def test_build_expressions():
+    expr = parse_build_expr("(linux || darwin) && !arm64 && go1.21")
+    assert expr == ("&&", ("&&", ("||", "linux", "darwin"), ("!", "arm64")), "go1.21")
+    assert eval_build_expr(expr, {"linux", "amd64"}) and not eval_build_expr(expr, {"linux", "arm64"})
+    assert allowed_goos(parse_build_expr("!windows")) == {"linux", "darwin", "freebsd"}
+    assert allowed_goos(parse_build_expr("unix && cgo")) == {"linux", "darwin", "freebsd"}
+    assert allowed_goos(parse_build_expr("ignore")) == set()
+    assert allowed_goos(plus_build_expr(["linux,amd64 darwin", "!cgo"])) == set()
+    assert filename_constraint("conn_windows_amd64_test.go") == ("&&", "windows", "amd64")
+    assert filename_constraint("linux.go") is None and filename_constraint("x_arm64.go") == "arm64"
+    with pytest.raises(ValueError):
+        parse_build_expr("linux &&")
+
+
+def test_header_reader_cgo_preamble_and_stop(tmp_path):
+    """import "C" after a long block-comment preamble is found; scanning stops at the first declaration."""
+    src = tmp_path / "sqlite.go"
+    preamble = "/*\n#cgo LDFLAGS: -lsqlite3\n" + "int f(void) { return 0; }\n" * 400 + "*/\n"
+    src.write_text(f'//go:build linux || darwin\n\npackage db\n\n{preamble}import "C"\n\nfunc F() {{}}\nimport "C"\n')
+    header = read_go_header(src)
+    assert header["cgo"] and allowed_goos(header["constraint"]) == {"linux", "darwin"}
+    plain = tmp_path / "plain.go"
+    plain.write_text('package db\n\nimport (\n\t"fmt"\n)\n\nfunc G() {}\n\n// import "C"\n')
+    assert read_go_header(plain) == {"constraint": None, "cgo": False}
+
+
+def test_scan_repo_go_tags_and_cgo_from_source(tmp_path):
+    (tmp_path / "go.mod").write_text("module example.com/svc\n\ngo 1.22\n")
+    (tmp_path / "main.go").write_text("package main\n\nfunc main() {}\n")
+    (tmp_path / "notify_windows.go").write_text("package main\n")
+    (tmp_path / "notify_other.go").write_text("//go:build !windows && !plan9\n\npackage main\n")
+    (tmp_path / "internal" / "img").mkdir(parents=True)
+    (tmp_path / "internal" / "img" / "img.go").write_text('package img\n\n// #include <png.h>\nimport "C"\n')
+    (tmp_path / "vendor" / "x").mkdir(parents=True)
+    (tmp_path / "vendor" / "x" / "x_linux.go").write_text('package x\nimport "C"\n')
+    profile = scan_repo(tmp_path)
+    assert profile.go_os_specific_tags == ["linux", "darwin", "windows", "freebsd"]
+    assert profile.go_cgo_deps == ["example.com/svc/internal/img"]
@@ -0,0 +1,40 @@
+"""Tests for the base-image index and its use by Dockerfile rules."""
+
+from repofail.models import HostProfile
+from repofail.rules import apple_silicon, spec_drift
+from repofail.scanner import scan_repo
+from repofail.scanner.images import BaseImageIndex, lookup_image, split_image_ref
+from repofail.scanner.parsers import parse_dockerfile
+
+
+def test_image_refs_and_lookup():
+    assert split_image_ref("docker.io/library/Python:3.12.1-bookworm@sha256:ab") == ("python", "3.12.1-bookworm")
+    assert split_image_ref("localhost:5000/app") == ("localhost:5000/app", "latest")
+    cuda = lookup_image("nvidia/cuda:12.1.0-cudnn8-devel-ubuntu22.04")
+    assert cuda["cuda"] == "12.1" and cuda["python"] is None and "arm64" in cuda["archs"]
+    torch = lookup_image("pytorch/pytorch:2.1.0-cuda12.1-cudnn8-runtime")
+    assert (torch["python"], torch["cuda"], torch["archs"]) == ("3.10", "12.1", ("x86_64",))
+    assert lookup_image("nvcr.io/nvidia/pytorch:24.01-py3")["python"] == "3.10"  # namespace prefix entry
+    assert lookup_image("example/unknown:1.0") is None
+    index = BaseImageIndex({"acme/*": [{"tag": "v(?P<python>3\\.\\d+)", "archs": ["arm64"]}]})
+    assert index.lookup("acme/tools/ml:v3.9")["python"] == "3.9" and index.lookup("acme/x:latest") is None
+
+
+def test_parse_dockerfile_resolves_args_platform_and_image_facts(tmp_path):
+    df = tmp_path / "Dockerfile"
+    df.write_text("ARG TORCH=2.1.0\nFROM --platform=linux/amd64 pytorch/pytorch:${TORCH}-cuda12.1-cudnn8-runtime AS base\n")
+    data = parse_dockerfile(df)
+    assert data["base_image"] == "pytorch/pytorch:2.1.0-cuda12.1-cudnn8-runtime"
+    assert data["python_version"] == "3.10" and data["python_from_image"] and data["cuda_version"] == "12.1"
+    assert data["platform_amd64"] and data["image_archs"] == ("x86_64",)
+
+
+def test_rules_consult_base_image_index(tmp_path):
+    (tmp_path / "pyproject.toml").write_text('[project]\nname = "m"\nrequires-python = ">=3.12"\n')
+    (tmp_path / "Dockerfile").write_text("FROM pytorch/pytorch:2.2.2-cuda12.1-cudnn8-runtime\n")
+    profile = scan_repo(tmp_path)
+    assert profile.python_version == ">=3.12" and profile.dockerfile_has_cuda
+    drift = spec_drift.check(profile, HostProfile(os="linux", arch="x86_64"))
+    assert drift is not None and "shipped by pytorch/pytorch" in " ".join(drift.evidence["sources"])
+    mac = apple_silicon.check(profile, HostProfile(os="macos", arch="arm64"))
+    assert mac is not None and mac.evidence["image_archs"] == ["x86_64"] and mac.severity.value == "HIGH"
@@ -0,0 +1,188 @@
+"""Tests for streaming lockfile readers."""
+
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from repofail.scanner import scan_repo
+from repofail.scanner.jsonstream import iter_events
+from repofail.models import Dependency, HostProfile
+from repofail.rules.abi_wheel_mismatch import check as abi_check
+from repofail.scanner.lockfiles import iter_toml_tables, parse_package_lock, parse_pnpm_lock, parse_python_lock, parse_yarn_lock
+
+PACKAGE_LOCK_V3 = {
+    "name": "app",
+    "lockfileVersion": 3,
+    "packages": {
+        "": {"name": "app", "dependencies": {"bcrypt": "^5.1.0"}},
+        "node_modules/bcrypt": {
+            "version": "5.1.1",
+            "hasInstallScript": True,
+            "dependencies": {"@mapbox/node-pre-gyp": "^1.0.11", "node-addon-api": "^5.0.0"},
+        },
+        "node_modules/core-js": {"version": "3.36.0", "hasInstallScript": True},
+        "node_modules/a/node_modules/fsevents": {"version": "2.3.3", "gypfile": True},
+        "node_modules/node-addon-api": {"version": "5.1.0"},
+    },
+}
+
+
+def test_iter_events_across_chunk_boundaries():
+    """Tokens split between chunks (strings, escapes, numbers) parse the same as json.loads."""
+    doc = {"a": [1, 2.5e3, -7, True, None], "kéy": 'q"uo\\te', "nested": {"x": [{"y": "z" * 50}]}}
+    raw = json.dumps(doc).encode()
+    for chunk in (1, 3, 7, 64):
+        values = {path: v for path, ev, v in iter_events(io.BytesIO(raw), chunk_size=chunk) if ev == "value"}
+        assert values[("a", 1)] == 2.5e3
+        assert values[("a", 2)] == -7
+        assert values[("kéy",)] == 'q"uo\\te'
+        assert values[("nested", "x", 0, "y")] == "z" * 50
+    shallow = [path for path, ev, _ in iter_events(io.BytesIO(raw), max_depth=1)]
+    assert all(len(p) <= 1 for p in shallow)
+
+
+def test_package_lock_native_from_flags_and_builder_deps():
+    """gypfile, or install script + native builder dependency; a bare postinstall is not native."""
+    with tempfile.TemporaryDirectory() as d:
+        lock = Path(d) / "package-lock.json"
+        lock.write_text(json.dumps(PACKAGE_LOCK_V3, indent=2))
+        result = parse_package_lock(lock)
+        assert result["packages"] == 4
+        assert result["native_modules"] == ["bcrypt", "fsevents"]
+        v1 = {"lockfileVersion": 1, "dependencies": {"a": {"dependencies": {"sharp": {"requires": {"prebuild-install": "^7"}}}}}}
+        lock.write_text(json.dumps(v1))
+        assert parse_package_lock(lock)["native_modules"] == ["sharp"]
+
+
+def test_yarn_and_pnpm_locks():
+    with tempfile.TemporaryDirectory() as d:
+        yarn = Path(d) / "yarn.lock"
+        yarn.write_text(
+            '# yarn lockfile v1\n\n"@scope/addon@^1.0.0", "@scope/addon@^1.1.0":\n  version "1.1.0"\n'
+            '  dependencies:\n    nan "^2.17.0"\n\nleft-pad@^1.3.0:\n  version "1.3.0"\n'
+        )
+        assert parse_yarn_lock(yarn) == {"packages": 2, "native_modules": ["@scope/addon"]}
+        pnpm = Path(d) / "pnpm-lock.yaml"
+        pnpm.write_text(
+            "lockfileVersion: '6.0'\n\npackages:\n\n  /bcrypt@5.1.1:\n    resolution: {integrity: sha512-x}\n"
+            "    requiresBuild: true\n    dependencies:\n      node-addon-api: 5.1.0\n\n"
+            "  /node-addon-api@5.1.0:\n    resolution: {integrity: sha512-y}\n    dev: false\n"
+        )
+        assert parse_pnpm_lock(pnpm) == {"packages": 2, "native_modules": ["bcrypt"]}
+
+
+def test_scan_repo_uses_lockfile_for_transitive_native_modules():
+    with tempfile.TemporaryDirectory() as d:
+        (Path(d) / "package.json").write_text('{"dependencies": {"bcrypt": "^5.1.0"}}')
+        (Path(d) / "package-lock.json").write_text(json.dumps(PACKAGE_LOCK_V3))
+        profile = scan_repo(d)
+        assert profile.node_native_modules == ["bcrypt", "fsevents"]
+        assert not profile.node_lock_file_missing
+    with tempfile.TemporaryDirectory() as d:
+        (Path(d) / "package.json").write_text('{"dependencies": {"left-pad": "^1.3.0"}}')
+        (Path(d) / "pnpm-lock.yaml").write_text("lockfileVersion: '9.0'\n")
+        assert not scan_repo(d).node_lock_file_missing
+
+
+UV_LOCK = """version = 1
+requires-python = ">=3.10"
+
+[[package]]
+name = "app"
+version = "0.1.0"
+source = { editable = "." }
+dependencies = [
+    { name = "peft" },
+    { name = "nvidia-cublas-cu12", marker = "sys_platform == 'linux'" },
+]
+
+[package.metadata]
+requires-dist = [{ name = "peft" }]
+
+[[package]]
+name = "bitsandbytes"
+version = "0.43.1"
+description = \"\"\"
+[[package]] inside a string
+\"\"\"
+
+[[package]]
+name = "nvidia-cublas-cu12"
+version = "12.1.3.1"
+
+[[package]]
+name = "opencv-python"
+version = "4.9.0.80"
+
+[[package]]
+name = "peft"
+version = "0.11.1"
+dependencies = [{ name = "bitsandbytes" }, { name = "opencv-python" }]
+"""
+
+
+def test_iter_toml_tables_one_entry_at_a_time():
+    entries = list(iter_toml_tables(io.BytesIO(UV_LOCK.encode()), "package"))
+    assert [e["name"] for _, e in entries] == ["app", "bitsandbytes", "nvidia-cublas-cu12", "opencv-python", "peft"]
+    assert entries[0][0] == 4
+    assert entries[0][1]["metadata"]["requires-dist"] == [{"name": "peft"}]
+    assert "[[package]]" in entries[1][1]["description"]
+
+
+def test_uv_lock_transitive_packages_and_markers():
+    """Transitive CUDA-only wheels count; ones reached only under a platform marker do not."""
+    with tempfile.TemporaryDirectory() as d:
+        lock = Path(d) / "uv.lock"
+        lock.write_text(UV_LOCK)
+        result = parse_python_lock(lock)
+        assert result["packages"] == 5
+        by_name = {dep["name"]: dep for dep in result["dependencies"]}
+        assert by_name["bitsandbytes"]["specifier"] == "==0.43.1"
+        assert by_name["nvidia-cublas-cu12"]["marker"] == "sys_platform == 'linux'"
+        assert result["cuda_mandatory_packages"] == ["bitsandbytes"]
+        assert result["frameworks"] == ["PEFT"]
+        assert result["requires_libgl"]
+
+
+def test_poetry_pdm_and_pylock():
+    with tempfile.TemporaryDirectory() as d:
+        poetry = Path(d) / "poetry.lock"
+        poetry.write_text(
+            '[[package]]\nname = "torch"\nversion = "2.0.1"\n\n[package.dependencies]\n'
+            'triton = {version = "2.0.0", markers = "platform_system == \\"Linux\\""}\n\n'
+            '[[package]]\nname = "triton"\nversion = "2.0.0"\n\n[metadata]\nlock-version = "2.0"\n'
+        )
+        result = parse_python_lock(poetry)
+        assert result["uses_torch"]
+        assert [dep["marker"] for dep in result["dependencies"]] == ["", 'platform_system == "Linux"']
+        pdm = Path(d) / "pdm.lock"
+        pdm.write_text(
+            '[metadata]\ngroups = ["default"]\n\n[[package]]\nname = "tensorflow"\nversion = "2.15.0"\n'
+            'dependencies = ["tensorflow-io-gcs-filesystem>=0.23.1; sys_platform != \'win32\'"]\n'
+        )
+        assert parse_python_lock(pdm)["uses_tensorflow"]
+        pylock = Path(d) / "pylock.toml"
+        pylock.write_text('lock-version = "1.0"\n\n[[packages]]\nname = "XFormers"\nversion = "1.7.2"\n')
+        result = parse_python_lock(pylock)
+        assert result["dependencies"][0]["name"] == "xformers"
+        assert result["cuda_mandatory_packages"] == ["xformers"]
+
+
+def test_dependency_excludes_os():
+    assert Dependency("a", marker="sys_platform == 'linux'").excludes_os("macos")
+    assert not Dependency("a", marker="sys_platform == 'darwin' or sys_platform == 'linux'").excludes_os("macos")
+    assert not Dependency("a", marker="sys_platform != 'win32'").excludes_os("macos")
+    assert not Dependency("a", marker="python_version < '3.12'").excludes_os("macos")
+
+
+def test_scan_repo_reads_python_lock():
+    with tempfile.TemporaryDirectory() as d:
+        (Path(d) / "pyproject.toml").write_text('[project]\nname = "app"\ndependencies = ["peft"]\n')
+        (Path(d) / "uv.lock").write_text(UV_LOCK)
+        profile = scan_repo(d)
+        assert profile.cuda_mandatory_packages == ["bitsandbytes"]
+        assert profile.dependencies.specifier("peft") == "==0.11.1"
+        assert profile.dependencies.all("bitsandbytes")[0].source == "uv.lock"
+        result = abi_check(profile, HostProfile(os="macos", arch="arm64", python_version="3.12.1"))
+        assert result is not None and "opencv-python" in result.evidence["problematic_packages"]
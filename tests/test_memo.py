@@ -0,0 +1,60 @@
+"""Tests for content-addressed dedup of parse and rule results."""
+
+import tempfile
+from pathlib import Path
+
+from repofail.fleet import RULE_MEMO, fleet_scan
+from repofail.scanner import scan_repo
+from repofail.scanner.memo import PARSE_MEMO, ContentMemo
+
+PYPROJECT = '[project]\nname = "tmpl"\nrequires-python = ">=3.99"\ndependencies = ["torch"]\n'
+
+
+def _write(root: Path, extra: str = "") -> None:
+    root.mkdir(parents=True)
+    (root / "pyproject.toml").write_text(PYPROJECT)
+    (root / "Dockerfile").write_text("FROM python:3.11\n")
+    (root / "train.py").write_text("import torch\nx = torch.ones(1).to('cuda')\n" + extra)
+
+
+def test_identical_files_parse_once_and_profiles_share_digest():
+    with tempfile.TemporaryDirectory() as d:
+        base = Path(d)
+        _write(base / "fork-a")
+        _write(base / "fork-b")
+        _write(base / "other", extra="y = 2\n")
+        PARSE_MEMO.clear()
+        a = scan_repo(base / "fork-a")
+        misses = PARSE_MEMO.misses
+        b = scan_repo(base / "fork-b")
+        assert PARSE_MEMO.misses == misses  # every file of the fork was a memo hit
+        assert a.content_digest == b.content_digest
+        assert a.path != b.path
+        # A different source file is parsed; the profile is still equivalent for rules
+        c = scan_repo(base / "other")
+        assert PARSE_MEMO.misses == misses + 1
+        assert c.content_digest == a.content_digest
+        (base / "other" / "pyproject.toml").write_text(PYPROJECT.replace("3.99", "3.8"))
+        assert scan_repo(base / "other").content_digest != a.content_digest
+
+
+def test_fleet_reuses_rule_results_for_identical_repos():
+    with tempfile.TemporaryDirectory() as d:
+        base = Path(d)
+        for i in range(4):
+            _write(base / f"fork{i}")
+        RULE_MEMO.clear()
+        summary = fleet_scan(base)
+        assert summary["total_repos_scanned"] == 4
+        assert RULE_MEMO.misses == 1 and RULE_MEMO.hits == 3
+        rules = {tuple(r["rules"]) for r in summary["repos"]}
+        assert len(rules) == 1 and rules.pop()
+
+
+def test_content_memo_is_bounded():
+    memo = ContentMemo(max_entries=2)
+    for key in "abc":
+        memo.get("k", key, lambda key=key: key.upper())
+    assert len(memo) == 2
+    assert memo.get("k", "c", lambda: "miss") == "C"
+    assert memo.get("k", "a", lambda: "recomputed") == "recomputed"
@@ -5,7 +5,7 @@ from pathlib import Path
 
 import pytest
 
-from repofail.models import HostProfile, RepoProfile
+from repofail.models import Dependency, DependencyIndex, HostProfile, RepoProfile
 from repofail.rules.ml_niche import check_lora_mlx_scaling, check_torchao_incompatible
 from repofail.risk import estimate_success_probability
 from repofail.rules.base import RuleResult, Severity
@@ -17,7 +17,6 @@ def _make_repo(**kwargs) -> RepoProfile:
         "name": "test",
         "uses_torch": False,
         "frameworks": [],
-        "raw": {},
     }
     return RepoProfile(**{**defaults, **kwargs})
 
@@ -63,7 +62,7 @@ def test_torchao_incompatible_fires_when_torch_pinned_low():
     repo = _make_repo(
         uses_torch=True,
         frameworks=["torchao"],
-        raw={"requirements": {"package_versions": {"torch": "==2.1.*"}, "packages": []}, "pyproject": {}},
+        dependencies=DependencyIndex((Dependency("torch", specifier="==2.1.*"),)),
     )
     host = _make_host()
     r = check_torchao_incompatible(repo, host)
@@ -74,7 +73,7 @@ def test_torchao_incompatible_fires_when_torch_pinned_low():
 
 def test_torchao_incompatible_does_not_fire_without_torchao():
     """torchao rule does not fire when torchao not in repo."""
-    repo = _make_repo(uses_torch=True, frameworks=["Transformers"], raw={"requirements": {"package_versions": {"torch": "==2.1.*"}}})
+    repo = _make_repo(uses_torch=True, frameworks=["Transformers"], dependencies=DependencyIndex((Dependency("torch", specifier="==2.1.*"),)))
     host = _make_host()
     r = check_torchao_incompatible(repo, host)
     assert r is None
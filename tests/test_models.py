@@ -0,0 +1,54 @@
+"""Tests for compact profile / result representations."""
+
+import dataclasses
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from repofail.fleet import compact_row
+from repofail.models import Dependency, DependencyIndex, DockerfileInfo, HostProfile, RepoProfile, WorkflowInfo
+from repofail.rules.base import RuleResult, Severity
+from repofail.scanner import scan_repo
+
+
+def test_profiles_and_results_are_slotted_and_frozen():
+    repo = RepoProfile(path="/x")
+    host = HostProfile(os="linux", arch="x86_64")
+    result = RuleResult("r", Severity.LOW, "m", "why")
+    for obj in (repo, host, result, Dependency("x"), DependencyIndex(), DockerfileInfo(), WorkflowInfo()):
+        assert not hasattr(obj, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        host.os = "macos"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        result.severity = Severity.HIGH
+
+
+def test_scan_fills_typed_records_with_interned_strings():
+    with tempfile.TemporaryDirectory() as d:
+        roots = []
+        for name in ("a", "b"):
+            root = Path(d) / name
+            (root / ".github" / "workflows").mkdir(parents=True)
+            (root / "requirements.txt").write_text("tensorflow<2.10\nnumpy\n")
+            (root / "Dockerfile").write_text("FROM python:3.11-slim\n")
+            (root / ".github" / "workflows" / "ci.yml").write_text(
+                "jobs:\n  t:\n    runs-on: ubuntu-latest\n    strategy:\n      matrix:\n        python-version: ['3.10']\n"
+            )
+            roots.append(scan_repo(root))
+        a, b = roots
+        assert a.dependencies.names() == ["numpy", "tensorflow"]
+        assert a.dependencies.specifier("tensorflow") == "<2.10"
+        assert a.dockerfile == DockerfileInfo(
+            python_version="3.11", base_image="python:3.11-slim", image_archs=("x86_64", "arm64")
+        )
+        assert a.workflows["ci"] == WorkflowInfo(runs_on=("ubuntu-latest",), python_versions=("3.10",))
+        assert a.dependencies.names()[0] is b.dependencies.names()[0]
+
+
+def test_compact_row_interns_strings_from_json():
+    row = json.loads(json.dumps({"path": "p", "rules": ["node_eol"], "severities": ["LOW"], "host": "linux x86_64"}))
+    other = json.loads(json.dumps({"rules": ["node_eol"], "severities": ["LOW"], "host": "linux x86_64"}))
+    assert compact_row(row)["rules"][0] is compact_row(other)["rules"][0]
+    assert row["host"] is other["host"]
@@ -0,0 +1,54 @@
+"""Tests for per-subproject (monorepo) scanning."""
+
+from pathlib import Path
+
+from repofail.models import HostProfile
+from repofail.monorepo import scan_monorepo
+from repofail.scanner import scan_repo
+
+
+def _monorepo(root: Path) -> None:
+    (root / "pyproject.toml").write_text('[project]\nname = "mono"\nrequires-python = ">=3.9"\n')
+    (root / "services" / "train").mkdir(parents=True)
+    (root / "services" / "train" / "requirements.txt").write_text("torch\nbitsandbytes\n")
+    (root / "services" / "train" / "model.py").write_text("import torch\nx = torch.zeros(1).cuda()\n")
+    (root / "web").mkdir()
+    (root / "web" / "package.json").write_text('{"engines": {"node": ">=22"}, "dependencies": {"left-pad": "1"}}')
+
+
+def test_scan_repo_exclude_leaves_out_subtrees(tmp_path):
+    _monorepo(tmp_path)
+    profile = scan_repo(tmp_path, exclude=("services/train", "web"))
+    assert not profile.uses_torch and not profile.requires_cuda and not profile.has_package_json
+    assert [sp["path"] for sp in profile.subprojects] == ["."]
+
+
+def test_findings_attributed_per_subproject(tmp_path):
+    """Each subproject gets its own profile and results; the repo score is the worst one."""
+    _monorepo(tmp_path)
+    host = HostProfile(os="macos", arch="arm64", python_version="3.11.4", node_version="18.19.0")
+    serial = scan_monorepo(tmp_path, host)
+    parallel = scan_monorepo(tmp_path, host, workers=3)
+    by_path = {sp["path"]: sp for sp in parallel["subprojects"]}
+    assert list(by_path) == [".", "services/train", "web"]
+    assert by_path["services/train"]["types"] == ["python"]
+    rules = {p: {r.rule_id for r in sp["results"]} for p, sp in by_path.items()}
+    assert rules["."] == set()
+    assert "torch_cuda_mismatch" in rules["services/train"] and "node_engine_mismatch" not in rules["services/train"]
+    assert "node_engine_mismatch" in rules["web"] and "torch_cuda_mismatch" not in rules["web"]
+    assert parallel["score"] == min(sp["score"] for sp in parallel["subprojects"]) < 100
+    assert [(sp["path"], sp["score"]) for sp in serial["subprojects"]] == [(p, sp["score"]) for p, sp in by_path.items()]
+
+
+def test_every_subproject_is_found_beyond_the_config_cap(tmp_path):
+    """Discovery isn't capped at scan_repo's MAX_CONFIGS, and the order is deterministic."""
+    for i in range(40):
+        pkg = tmp_path / "packages" / f"pkg{i:02d}"
+        pkg.mkdir(parents=True)
+        (pkg / "package.json").write_text('{"name": "p%d"}' % i)
+    (tmp_path / "node_modules" / "dep").mkdir(parents=True)
+    (tmp_path / "node_modules" / "dep" / "package.json").write_text("{}")
+    result = scan_monorepo(tmp_path, HostProfile(os="linux", arch="x86_64"), workers=4)
+    paths = [sp["path"] for sp in result["subprojects"]]
+    assert paths == [f"packages/pkg{i:02d}" for i in range(40)]
+    assert all(sp["types"] == ["node"] for sp in result["subprojects"])
@@ -0,0 +1,34 @@
+"""Tests for the C++/CUDA source and build-file scanner."""
+
+from repofail.models import HostProfile
+from repofail.rules import torch_cuda
+from repofail.rules.base import Severity
+from repofail.scanner import scan_repo
+from repofail.scanner.native_scan import find_cuda
+
+
+def test_find_cuda_kinds_and_lines():
+    src = b'#include <cstdio>\n#include <cuda_runtime.h>\n\n__global__ void add(float* x) {}\n\nvoid f() { add<<<1, 32>>>(x); }\n'
+    assert find_cuda(src, "cuda") == [(2, "cuda_include"), (4, "cuda_kernel"), (6, "kernel_launch")]
+    assert find_cuda(b"// device helpers\n", "cuda") == [(1, "cuda_source")]
+    assert find_cuda(b"#include <vector>\nint main() { return 1 << 3; }\n", "cxx") == []
+    cmake = b"cmake_minimum_required(VERSION 3.18)\nproject(ext LANGUAGES CXX CUDA)\nfind_package(CUDAToolkit)\n"
+    assert find_cuda(cmake, "cmake") == [(2, "cmake_cuda_language"), (3, "cmake_find_cuda")]
+    setup = b"from torch.utils.cpp_extension import CUDAExtension\nsetup(ext_modules=[CUDAExtension('k', ['k.cu'])])\n"
+    assert find_cuda(setup, "setup_py") == [(2, "cuda_extension")]
+
+
+def test_scan_repo_native_cuda(tmp_path):
+    (tmp_path / "requirements.txt").write_text("torch\n")
+    (tmp_path / "csrc").mkdir()
+    (tmp_path / "csrc" / "ops.cpp").write_text('#include "cublas_v2.h"\n')
+    (tmp_path / "csrc" / "kernel.cu").write_text("\n__global__ void k() {}\n")
+    (tmp_path / "third_party" / "cub").mkdir(parents=True)
+    (tmp_path / "third_party" / "cub" / "x.cu").write_text("__global__ void v() {}\n")
+    profile = scan_repo(tmp_path)
+    assert profile.requires_cuda and not profile.cuda_optional
+    assert profile.cuda_files == ["csrc/kernel.cu", "csrc/ops.cpp"]
+    assert {"file": "csrc/kernel.cu", "line": 2, "kind": "cuda_kernel"} in profile.cuda_usages
+    host = HostProfile(os="linux", arch="x86_64", cuda_available=False)
+    result = torch_cuda.check(profile, host)
+    assert result is not None and result.severity == Severity.HIGH
@@ -0,0 +1,47 @@
+"""Tests for streamed notebook scanning."""
+
+import io
+import json
+
+from repofail.scanner import scan_repo
+from repofail.scanner.jsonstream import iter_events
+from repofail.scanner.notebook import read_code_cells, strip_magics
+
+
+def _notebook(cells):
+    return {"cells": cells, "metadata": {"kernelspec": {"name": "python3"}}, "nbformat": 4, "nbformat_minor": 5}
+
+
+def test_skip_keys_step_over_values_across_chunks():
+    raw = json.dumps({"a": {"outputs": [{"png": "QUJD" * 5000, "t": 'x\\"]}'}], "n": 1}, "b": [True]}).encode()
+    for chunk in (5, 64, 1 << 16):
+        events = list(iter_events(io.BytesIO(raw), chunk_size=chunk, skip_keys=frozenset({"outputs"})))
+        assert [(p, v) for p, ev, v in events if ev == "value"] == [(("a", "n"), 1), (("b", 0), True)]
+
+
+def test_read_code_cells_and_magics(tmp_path):
+    nb = tmp_path / "train.ipynb"
+    nb.write_text(json.dumps(_notebook([
+        {"cell_type": "markdown", "metadata": {}, "source": ["# model.to('cuda')\n"]},
+        {"cell_type": "code", "execution_count": 1, "metadata": {}, "outputs": [
+            {"output_type": "display_data", "data": {"image/png": "iVBOR" * 10000}}
+        ], "source": ["!pip install torch\n", "import torch\n"]},
+        {"cell_type": "code", "metadata": {}, "outputs": [], "source": "%%bash\nnvidia-smi\n"},
+    ])))
+    assert read_code_cells(nb) == [(2, "!pip install torch\nimport torch\n"), (3, "%%bash\nnvidia-smi\n")]
+    assert strip_magics("%matplotlib inline\nx = 1") == "\nx = 1"
+    assert strip_magics("%%bash\nls") is None
+
+
+def test_scan_repo_notebook_cuda_usage_with_cell_lines(tmp_path):
+    (tmp_path / "requirements.txt").write_text("torch\n")
+    (tmp_path / "notebooks").mkdir()
+    (tmp_path / "notebooks" / "demo.ipynb").write_text(json.dumps(_notebook([
+        {"cell_type": "code", "metadata": {}, "outputs": [], "source": ["%pip install -q torch\n", "import torch\n"]},
+        {"cell_type": "code", "metadata": {}, "outputs": [], "source": ["x = torch.ones(3)\n", "x = x.to('cuda')\n"]},
+    ])))
+    (tmp_path / "notebooks" / ".ipynb_checkpoints").mkdir()
+    (tmp_path / "notebooks" / ".ipynb_checkpoints" / "demo-checkpoint.ipynb").write_text("{not json")
+    profile = scan_repo(tmp_path)
+    assert profile.uses_torch and profile.requires_cuda
+    assert profile.cuda_usages == [{"file": "notebooks/demo.ipynb", "cell": 2, "line": 2, "kind": '.to("cuda")'}]
@@ -0,0 +1,58 @@
+"""Tests for the staged fleet pipeline."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from repofail.fleet import fleet_scan
+from repofail.models import HostProfile
+from repofail.pipeline import bounded_map, discover, evaluate, run_fleet, scan
+
+
+def test_bounded_map_keeps_order_and_applies_backpressure():
+    pulled = []
+
+    def source():
+        for i in range(50):
+            pulled.append(i)
+            yield i
+
+    def work(i):
+        return i * i
+
+    out = []
+    for value in bounded_map(work, source(), workers=4, mode="thread", max_in_flight=3):
+        out.append(value)
+        # Upstream never runs more than max_in_flight ahead of the consumer
+        assert len(pulled) - len(out) <= 3
+    assert out == [i * i for i in range(50)]
+    with pytest.raises(ValueError):
+        list(bounded_map(work, [1, 2], workers=2, mode="gpu"))
+
+
+def test_stages_are_lazy(make_fleet):
+    with tempfile.TemporaryDirectory() as d:
+        base = Path(d)
+        make_fleet(base, 5)
+        host = HostProfile(os="linux", arch="x86_64")
+        rows = evaluate(scan(discover(base)), host)
+        first = next(rows)
+        assert first["path"].endswith("repo0")
+        assert len(list(rows)) == 4
+
+
+def test_run_fleet_taps_and_process_workers_match_fleet_scan(make_fleet):
+    with tempfile.TemporaryDirectory() as d:
+        base = Path(d)
+        make_fleet(base, 6)
+        seen = {"discover": [], "scan": [], "evaluate": []}
+        taps = {stage: seen[stage].append for stage in seen}
+        host = HostProfile(os="linux", arch="x86_64")
+        serial = run_fleet(base, host, taps=taps)
+        assert len(seen["discover"]) == len(seen["scan"]) == len(seen["evaluate"]) == 6
+        parallel = run_fleet(base, host, workers=2, mode="process")
+        assert parallel == serial
+        assert fleet_scan(base)["total_repos_scanned"] == 6
+        with pytest.raises(ValueError):
+            run_fleet(base, host, taps={"export": print})
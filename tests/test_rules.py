@@ -6,7 +6,7 @@ from pathlib import Path
 
 import pytest
 
-from repofail.models import HostProfile, RepoProfile
+from repofail.models import Dependency, DependencyIndex, HostProfile, RepoProfile
 from repofail.rules.torch_cuda import check as check_torch_cuda
 from repofail.rules.python_version import check as check_python_version
 from repofail.rules.apple_silicon import check as check_apple_silicon
@@ -28,7 +28,6 @@ def _make_repo(**kwargs) -> RepoProfile:
         "rust_system_libs": [],
         "requires_libgl": False,
         "requires_ffmpeg": False,
-        "raw": {},
     }
     return RepoProfile(**{**defaults, **kwargs})
 
@@ -97,7 +96,7 @@ def test_python_version_does_not_fire_when_match():
 
 def test_apple_silicon_fires_on_macos_arm_with_x86_packages():
     """Rule 2: Fires when arm64 macOS + x86-only packages."""
-    repo = _make_repo(raw={"requirements": {"packages": ["nvidia-cuda-runtime-cu11", "torch"]}})
+    repo = _make_repo(dependencies=DependencyIndex((Dependency("nvidia-cuda-runtime-cu11"), Dependency("torch"))))
     host = _make_host(os="macos", arch="arm64")
     r = check_apple_silicon(repo, host)
     assert r is not None
@@ -106,7 +105,7 @@ def test_apple_silicon_fires_on_macos_arm_with_x86_packages():
 
 def test_apple_silicon_does_not_fire_on_linux():
     """Rule 2: Does not fire on Linux."""
-    repo = _make_repo(raw={"requirements": {"packages": ["nvidia-cuda-runtime-cu11"]}})
+    repo = _make_repo(dependencies=DependencyIndex((Dependency("nvidia-cuda-runtime-cu11"),)))
     host = _make_host(os="linux", arch="x86_64")
     r = check_apple_silicon(repo, host)
     assert r is None
@@ -188,7 +187,7 @@ def test_system_libs_fires():
 def test_abi_wheel_mismatch_fires_on_arm64_py312():
     """ABI wheel rule fires when macOS arm64 + Python 3.12 + lagging packages."""
     from repofail.rules.abi_wheel_mismatch import check as check_abi
-    repo = _make_repo(raw={"requirements": {"packages": ["bitsandbytes", "torch"]}})
+    repo = _make_repo(dependencies=DependencyIndex((Dependency("bitsandbytes"), Dependency("torch"))))
     host = _make_host(os="macos", arch="arm64", python_version="3.12.1")
     r = check_abi(repo, host)
     assert r is not None
@@ -197,10 +196,22 @@ def test_abi_wheel_mismatch_fires_on_arm64_py312():
     assert "bitsandbytes" in str(r.evidence.get("problematic_packages", []))
 
 
+def test_wheel_package_lists_match_names_not_prefixes():
+    """tritonclient is not triton, faiss-node is not faiss; explicit prefixes still match."""
+    from repofail.rules.abi_wheel_mismatch import check as check_abi
+    mac = _make_host(os="macos", arch="arm64", python_version="3.12.1")
+    client = _make_repo(dependencies=DependencyIndex((Dependency("tritonclient"), Dependency("faiss-node"))))
+    assert check_abi(client, mac) is None
+    assert check_apple_silicon(client, mac) is None
+    repo = _make_repo(dependencies=DependencyIndex((Dependency("opencv-python-headless"), Dependency("faiss-gpu-cu12"))))
+    assert check_abi(repo, mac).evidence["problematic_packages"] == ["opencv-python-headless"]
+    assert "faiss-gpu-cu12" in check_apple_silicon(repo, mac).reason
+
+
 def test_abi_wheel_mismatch_does_not_fire_on_py311():
     """ABI wheel rule does not fire when Python < 3.12."""
     from repofail.rules.abi_wheel_mismatch import check as check_abi
-    repo = _make_repo(raw={"requirements": {"packages": ["bitsandbytes"]}})
+    repo = _make_repo(dependencies=DependencyIndex((Dependency("bitsandbytes"),)))
     host = _make_host(os="macos", arch="arm64", python_version="3.11.5")
     r = check_abi(repo, host)
     assert r is None
@@ -209,7 +220,7 @@ def test_abi_wheel_mismatch_does_not_fire_on_py311():
 def test_abi_wheel_mismatch_does_not_fire_on_linux():
     """ABI wheel rule does not fire when host is not macOS arm64."""
     from repofail.rules.abi_wheel_mismatch import check as check_abi
-    repo = _make_repo(raw={"requirements": {"packages": ["bitsandbytes"]}})
+    repo = _make_repo(dependencies=DependencyIndex((Dependency("bitsandbytes"),)))
     host = _make_host(os="linux", arch="x86_64", python_version="3.12.1")
     r = check_abi(repo, host)
     assert r is None
@@ -2,10 +2,16 @@
 
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
-from repofail.scanner import scan_repo, inspect_host
+import repofail.scanner.repo as repo_mod
+from repofail.models import HostProfile
+from repofail.rules.abi_wheel_mismatch import wheel_gaps
+from repofail.scanner import parsers, scan_repo, inspect_host
+from repofail.scanner.classify import PackageClassifier, classify
+from repofail.scanner.parsers import tokenize_requirements
 
 
 def test_scan_repo_empty_dir():
@@ -85,6 +91,87 @@ def test_scan_repo_name_prefers_folder_over_generic_package_json():
         assert profile.name == folder_name
 
 
+def test_scan_repo_builds_dependency_index():
+    """Every Python and Node source lands in one index with normalized names and provenance."""
+    with tempfile.TemporaryDirectory() as d:
+        (Path(d) / "pyproject.toml").write_text(
+            '[project]\nname = "x"\ndependencies = [\n  "Torch[cpu]>=2.2, <2.4",\n  "pywin32; sys_platform == \'win32\'",\n]\n'
+        )
+        (Path(d) / "requirements.txt").write_text("# pinned\nnvidia_cudnn_cu12==9.1  # gpu\n-e .\n")
+        (Path(d) / "requirements-dev.txt").write_text("pytest\n")
+        (Path(d) / "package.json").write_text('{\n  "dependencies": {"left-pad": "^1.3.0"}\n}')
+        deps = scan_repo(d).dependencies
+        torch = deps.get("torch")
+        assert (torch.specifier, torch.extras, torch.source, torch.line) == (">=2.2,<2.4", ("cpu",), "pyproject.toml", 4)
+        assert deps.get("pywin32").marker == "sys_platform == 'win32'"
+        assert deps.get("nvidia-cudnn-cu12").line == 2
+        assert deps.with_prefix("nvidia-cudnn-cu") == ["nvidia-cudnn-cu12"]
+        assert "pytest" in deps
+        assert deps.get("left-pad", "node").specifier == "^1.3.0"
+        assert deps.names("python") == ["nvidia-cudnn-cu12", "pytest", "pywin32", "torch"]
+
+
+def test_dependency_index_includes_poetry_groups(tmp_path):
+    (tmp_path / "pyproject.toml").write_text(
+        '[tool.poetry]\nname = "p"\n\n[tool.poetry.dependencies]\npython = "^3.11"\nrequests = "^2.31"\n\n'
+        '[tool.poetry.group.ml.dependencies]\ntorch = {version = "2.2.0", extras = ["cuda"]}\n\n'
+        '[tool.poetry.group.dev.dependencies]\npytest = "*"\n'
+    )
+    profile = scan_repo(tmp_path)
+    deps = profile.dependencies
+    assert deps.names("python") == ["pytest", "requests", "torch"]
+    torch = deps.get("torch")
+    assert (torch.specifier, torch.extras, torch.line) == ("==2.2.0", ("cuda",), 9)
+    assert deps.get("requests").specifier == ">=2.31,<3"
+    assert profile.uses_torch
+
+
+def test_poetry_constraints_convert_to_pep440():
+    assert parsers.poetry_specifier("^1.2.3") == ">=1.2.3,<2"
+    assert parsers.poetry_specifier("^0.2.3") == ">=0.2.3,<0.3"
+    assert parsers.poetry_specifier("~2.1") == ">=2.1,<2.2"
+    assert parsers.poetry_specifier("~1.2.3") == ">=1.2.3,<1.3"
+    assert parsers.poetry_specifier("2.1.0") == "==2.1.0"
+    assert parsers.poetry_specifier("2.1.*") == "==2.1.*"
+    assert parsers.poetry_specifier(">= 1.2 < 2") == ">=1.2,<2"
+    assert parsers.poetry_specifier("~=2.1") == "~=2.1"
+    assert parsers.poetry_specifier("*") == ""
+
+
+def test_poetry_multiple_constraints_one_dependency_per_entry(tmp_path):
+    (tmp_path / "pyproject.toml").write_text(
+        '[tool.poetry.dependencies]\npython = "^3.8"\nnumpy = [\n'
+        '  {version = "<1.25", python = "<3.9"},\n'
+        '  {version = "^1.26", python = ">=3.9", markers = "sys_platform == \'linux\'"},\n]\n'
+    )
+    decls = scan_repo(tmp_path).dependencies.all("numpy")
+    assert [(d.specifier, d.marker) for d in decls] == [
+        ("<1.25", 'python_version < "3.9"'),
+        (">=1.26,<2", 'python_version >= "3.9" and (sys_platform == \'linux\')'),
+    ]
+
+
+@pytest.mark.parametrize("constraint", ["~2.1", "2.1.0", "2.1.*", "==2.1.0"])
+def test_poetry_constraints_reach_wheel_rules(tmp_path, constraint):
+    (tmp_path / "pyproject.toml").write_text(f'[tool.poetry.dependencies]\ntorch = "{constraint}"\n')
+    host = HostProfile(os="linux", arch="x86_64", python_version="3.12.1")
+    assert [g["package"] for g in wheel_gaps(scan_repo(tmp_path), host)] == ["torch"]
+
+
+def test_package_classifier_exact_and_prefix():
+    """Exact names and trie prefixes from the data table; no substring false positives."""
+    assert classify("av") == {"ffmpeg"}
+    assert classify("django-environ-avro") == frozenset()
+    assert classify("opencv-python-headless") == {"wheels:arm64_py312_unstable"}  # no libGL needed
+    assert classify("tritonclient") == frozenset() and classify("faiss-node") == frozenset()
+    assert classify("nvidia-cudnn-cu12") == {"wheels:x86_only"}
+    assert classify("torchao") == {"torch", "framework:torchao"}
+    assert classify("mlx-lm") == {"framework:MLX"}
+    custom = PackageClassifier({"gpu": {"exact": ["cupy"], "prefix": ["cupy-cuda"]}})
+    assert custom.classify("cupy-cuda12x") == {"gpu"}
+    assert custom.classify("cupyx") == frozenset()
+
+
 def test_inspect_host_returns_profile():
     """Host inspector should return HostProfile with required fields."""
     host = inspect_host()
@@ -95,3 +182,37 @@ def test_inspect_host_returns_profile():
     assert host.python_version is not None
     # node_version, rust_version may be None if not installed
     assert host.node_version is None or host.node_version.startswith(("v", "0", "1", "2"))
+
+
+def test_requirements_tokenizer_continuations_and_options():
+    text = "-r base.txt\n--constraint=pins.txt\ntorch==2.2.0 \\\n    --hash=sha256:aa \\\n    --hash=sha256:bb\n-e git+https://x/y.git#egg=My_Pkg\n-i https://idx\nnumpy  # c\n"
+    assert list(tokenize_requirements(text)) == [
+        (1, "include", "base.txt"),
+        (2, "constraint", "pins.txt"),
+        (3, "requirement", "torch==2.2.0"),
+        (6, "editable", "git+https://x/y.git#egg=My_Pkg"),
+        (7, "option", "https://idx"),
+        (8, "requirement", "numpy"),
+    ]
+
+
+def test_requirements_include_graph():
+    """Includes resolve relative to the including file, shared bases parse once, cycles are reported."""
+    with tempfile.TemporaryDirectory() as d:
+        root = Path(d)
+        (root / "reqs").mkdir()
+        (root / "requirements.txt").write_text("-r reqs/base.txt\n-c constraints.txt\nflask\n")
+        (root / "requirements-gpu.txt").write_text("-r reqs/base.txt\nbitsandbytes\n")
+        (root / "reqs" / "base.txt").write_text("-r common.in\ntorch\n")
+        (root / "reqs" / "common.in").write_text("-r base.txt\nnumpy\n")
+        (root / "constraints.txt").write_text("torch==2.1.2\nscipy==1.11\n")
+        calls = []
+        real = parsers.parse_requirements
+        with patch.object(repo_mod, "parse_requirements", lambda p: calls.append(p.name) or real(p)):
+            profile = scan_repo(d)
+        assert sorted(calls) == ["base.txt", "common.in", "constraints.txt", "requirements-gpu.txt", "requirements.txt"]
+        deps = profile.dependencies
+        assert profile.uses_torch and "bitsandbytes" in profile.cuda_mandatory_packages
+        assert deps.get("torch").specifier == "==2.1.2" and deps.get("torch").source == "reqs/base.txt"
+        assert "numpy" in deps and "scipy" not in deps
+        assert profile.requirements_cycles == [["reqs/base.txt", "reqs/common.in", "reqs/base.txt"]]
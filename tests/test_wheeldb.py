@@ -0,0 +1,74 @@
+"""Tests for the offline wheel-availability index."""
+
+import json
+
+import pytest
+
+from repofail.models import Dependency, DependencyIndex, HostProfile, RepoProfile
+from repofail.rules import abi_wheel_mismatch, apple_silicon
+from repofail.scanner import wheeldb
+from repofail.scanner.wheeldb import WheelDB, compile_db, install_db
+
+TABLE = {
+    "version": 7,
+    "packages": {
+        "Fast_Lib": [
+            {"versions": ">=2.0", "wheels": ["linux-x86_64:3.10-3.13", "macos-arm64:3.10-3.13"]},
+            {"versions": "<2.0", "wheels": ["linux-x86_64:3.8+"]},
+        ],
+        "pure": [{"versions": "*", "wheels": ["*:*"]}],
+        "sdist-only": [{"versions": "*", "wheels": []}],
+    },
+}
+
+
+def test_compiled_index_lookup():
+    db = WheelDB(compile_db(TABLE))
+    assert db.version == 7 and db.count == 3
+    assert "fast-lib" in db and "sdist-only" in db and "missing" not in db
+    label, mask = db.availability("fast-lib", "==1.4.2")
+    assert label == "<2.0" and db.has_wheel(mask, "linux-x86_64", (3, 14)) and not db.platform_wheels(mask, "macos-arm64")
+    assert db.availability("fast-lib", "")[0] == ">=2.0"
+    assert db.availability("fast-lib", "<2.0")[0] == "<2.0"
+    assert db.availability("fast-lib", "~=1.9")[0] == "<2.0"
+    assert [label for label, _ in db.allowed("fast-lib", ">=1.0")] == [">=2.0", "<2.0"]
+    assert db.installable("fast-lib", ">=1.0", "linux-x86_64", (3, 14))[0] == "<2.0"
+    assert db.installable("fast-lib", ">=1.0", "macos-arm64")[0] == ">=2.0"
+    assert db.installable("fast-lib", "<2.0", "macos-arm64") is None
+    assert db.has_wheel(db.availability("pure")[1], "windows-arm64", (3, 6))
+    with pytest.raises(ValueError):
+        compile_db({"version": 1, "packages": {"x": [{"versions": "*", "wheels": ["solaris-sparc:3.9"]}]}})
+
+
+def test_bundled_index_is_compiled_from_the_table():
+    """repofail/data/wheels.db must be regenerated (compile_db) whenever wheels.json changes."""
+    assert wheeldb.BUNDLED_PATH.read_bytes() == compile_db(json.loads(wheeldb.DATA_PATH.read_text()))
+
+
+def test_install_and_rules_consult_index(tmp_path, monkeypatch):
+    source = tmp_path / "wheels.json"
+    source.write_text(json.dumps(TABLE))
+    dest = tmp_path / "home" / "wheels.db"
+    monkeypatch.setattr(wheeldb, "DB_PATH", dest)
+    bundled = tmp_path / "bundled.db"
+    bundled.write_bytes(compile_db(TABLE))
+    monkeypatch.setattr(wheeldb, "BUNDLED_PATH", bundled)
+    wheeldb.default_db.cache_clear()
+    try:
+        assert wheeldb.default_db().buf.closed is False  # bundled index is memory-mapped, not compiled
+        assert install_db(source, dest).version == 7 and dest.read_bytes().startswith(wheeldb.MAGIC)
+        assert not isinstance(wheeldb.default_db().buf, bytes)  # the installed file is memory-mapped
+        repo = RepoProfile(path=".", dependencies=DependencyIndex((Dependency("fast-lib", "==2.1"),)))
+        r = abi_wheel_mismatch.check(repo, HostProfile(os="linux", arch="x86_64", python_version="3.14.0"))
+        assert r is not None and r.evidence["wheel_index"][0]["versions"] == ">=2.0"
+        assert "build from source" in r.evidence["expected_failure"] and "undefined symbol" not in r.evidence["likely_error"]
+        assert abi_wheel_mismatch.check(repo, HostProfile(os="linux", arch="x86_64", python_version="3.12.3")) is None
+        # Newest allowed range dropped 3.14, but an older allowed release (<2.0) still has a cp314 wheel
+        unpinned = RepoProfile(path=".", dependencies=DependencyIndex((Dependency("fast-lib", ">=1.0"),)))
+        assert abi_wheel_mismatch.check(unpinned, HostProfile(os="linux", arch="x86_64", python_version="3.14.0")) is None
+        assert abi_wheel_mismatch.check(unpinned, HostProfile(os="windows", arch="x86_64", python_version="3.12.0")) is None
+        old = RepoProfile(path=".", dependencies=DependencyIndex((Dependency("fast-lib", "<2"),)))
+        r = apple_silicon.check(old, HostProfile(os="macos", arch="arm64", python_version="3.12.3"))
+        assert r is not None and "fast-lib" in r.evidence["problematic_packages"]
+    finally:
+        wheeldb.default_db.cache_clear()
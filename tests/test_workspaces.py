@@ -0,0 +1,122 @@
+"""Tests for workspace (Node / Cargo) member expansion."""
+
+import json
+from pathlib import Path
+
+from repofail.models import HostProfile
+from repofail.rules import native_toolchain, node_engine, rust_compat
+from repofail.scanner import scan_repo
+from repofail.scanner.workspaces import expand_members
+
+
+def _pkg(d: Path, **data) -> None:
+    d.mkdir(parents=True, exist_ok=True)
+    (d / "package.json").write_text(json.dumps(data))
+
+
+def test_expand_members_globs_negation_and_pruning(tmp_path):
+    for rel in ("packages/a", "packages/b", "apps/web/ui", "apps/web/test/fixture", "apps/node_modules/x", "tools"):
+        _pkg(tmp_path / rel, name=rel.rsplit("/", 1)[-1])
+    (tmp_path / "packages" / "not-a-package").mkdir()
+    found = expand_members(tmp_path, ["./packages/*", "apps/**", "!**/test/**"], "package.json")
+    assert [p.relative_to(tmp_path).as_posix() for p in found] == ["packages/a", "packages/b", "apps/web/ui"]
+
+
+def test_node_workspace_members_past_config_cap(tmp_path):
+    """Every member is read (beyond the 20-config discovery cap) and attributed per package."""
+    _pkg(tmp_path, name="mono", private=True, workspaces=["packages/*"], dependencies={"left-pad": "1"})
+    (tmp_path / "yarn.lock").write_text("# yarn lockfile v1\n")
+    for i in range(30):
+        _pkg(tmp_path / "packages" / f"p{i:02d}", name=f"@mono/p{i:02d}", dependencies={"@mono/p00": "workspace:*"})
+    _pkg(tmp_path / "packages" / "native", name="@mono/native", engines={"node": ">=22"}, dependencies={"node-gyp-build": "^4"})
+    profile = scan_repo(tmp_path)
+    members = {m.path: m for m in profile.workspace_members}
+    assert len(members) == 31
+    assert members["packages/p05"].depends_on == ("@mono/p00",)
+    assert members["packages/native"].native == ("node-gyp-build",)
+    assert "node-gyp-build" in profile.node_native_modules
+    assert not profile.node_lock_file_missing
+    assert profile.node_engine_spec == ">=22"
+    assert {"path": "packages/p29", "type": "node"} in profile.subprojects
+
+
+def test_pnpm_workspace_engine_attributed_to_member(tmp_path):
+    _pkg(tmp_path, name="mono", engines={"node": ">=18"})
+    (tmp_path / "pnpm-workspace.yaml").write_text("packages:\n  - 'libs/*'\n")
+    (tmp_path / "pnpm-lock.yaml").write_text("lockfileVersion: '9.0'\n")
+    _pkg(tmp_path / "libs" / "old", name="old", engines={"node": "16.x"})
+    profile = scan_repo(tmp_path)
+    assert node_engine.engine_specs(profile) == ((".", ">=18"), ("libs/old", "16.x"))
+    result = node_engine.check(profile, HostProfile(os="linux", arch="x86_64", node_version="20.11.0"))
+    assert result.evidence["workspace_packages"] == ["libs/old"]
+    assert "libs/old" in result.reason
+
+
+CARGO_LOCK = """# This file is automatically @generated by Cargo.
+version = 3
+
+[[package]]
+name = "app"
+version = "0.1.0"
+dependencies = [
+ "core",
+ "reqwest",
+]
+
+[[package]]
+name = "openssl-sys"
+version = "0.9.102"
+source = "registry+https://github.com/rust-lang/crates.io-index"
+dependencies = [
+ "cc",
+ "libc",
+]
+
+[[package]]
+name = "libz-sys"
+version = "1.1.16"
+
+[[package]]
+name = "sysinfo"
+version = "0.30.0"
+"""
+
+
+def test_cargo_workspace_members_and_lock(tmp_path):
+    """Members from [workspace] globs, inherited rust-version, links, and transitive -sys crates from Cargo.lock."""
+    (tmp_path / "Cargo.toml").write_text(
+        '[workspace]\nmembers = ["crates/*"]\nexclude = ["crates/scratch"]\n\n[workspace.package]\nrust-version = "1.79"\n'
+    )
+    (tmp_path / "Cargo.lock").write_text(CARGO_LOCK)
+    for name, extra in (
+        ("app", 'rust-version.workspace = true\n\n[dependencies]\ncore = { path = "../core" }\nreqwest = "0.12"\n'),
+        ("core", 'links = "z"\n\n[target.\'cfg(unix)\'.dependencies]\nlibc = "0.2"\n'),
+        ("scratch", ""),
+    ):
+        (tmp_path / "crates" / name).mkdir(parents=True)
+        (tmp_path / "crates" / name / "Cargo.toml").write_text(f'[package]\nname = "{name}"\nversion = "0.1.0"\n{extra}')
+    profile = scan_repo(tmp_path)
+    members = {m.path: m for m in profile.workspace_members}
+    assert list(members) == ["crates/app", "crates/core"]
+    assert members["crates/app"].version_req == "1.79" and members["crates/app"].depends_on == ("core",)
+    assert members["crates/core"].native == ("core",)
+    assert sorted(profile.rust_system_libs) == ["core", "libz-sys", "openssl-sys"]
+    assert profile.rust_target_platforms == ["cfg(unix)"]
+    host = HostProfile(os="linux", arch="x86_64", rust_version="1.77.2", has_compiler=False)
+    version = rust_compat.check_rust_version(profile, host)
+    assert version.evidence["workspace_crates"] == ["crates/app"]
+    toolchain = native_toolchain.check(profile, host)
+    assert toolchain is not None and "openssl-sys" in toolchain.reason
+    assert native_toolchain.check(profile, HostProfile(os="linux", arch="x86_64", rust_version="1.80.0", has_compiler=True)) is None
+
+
+def test_pure_rust_sys_crates_need_no_c_toolchain(tmp_path):
+    (tmp_path / "Cargo.toml").write_text('[package]\nname = "cli"\nversion = "0.1.0"\n\n[dependencies]\nweb-sys = "0.3"\n')
+    (tmp_path / "Cargo.lock").write_text(
+        "version = 3\n"
+        + "".join(f'\n[[package]]\nname = "{c}"\nversion = "0.1.0"\n' for c in ("cli", "js-sys", "linux-raw-sys", "web-sys", "windows-sys"))
+    )
+    profile = scan_repo(tmp_path)
+    assert profile.rust_system_libs == []
+    host = HostProfile(os="linux", arch="x86_64", rust_version="1.80.0", has_compiler=False)
+    assert native_toolchain.check(profile, host) is None